@@ -13,6 +13,7 @@ from pymilvus import connections, Collection, utility
 import anthropic
 import time
 from token_tracker import get_tracker
+from milvus_search import embedding_search_params, similarity_score
 
 load_dotenv()
 
@@ -191,7 +192,7 @@ class ClaudeRAG:
                 model = self.load_embedding_model()
                 query_embedding = model.encode([query]).tolist()
 
-                search_params = {"metric_type": "L2", "params": {"nprobe": 10}}
+                metric_type, search_params = embedding_search_params(collection, top_k)
                 results = collection.search(
                     data=query_embedding,
                     anns_field="embedding",
@@ -205,7 +206,7 @@ class ClaudeRAG:
                     for hit in hits:
                         # Build document based on collection type
                         doc = {
-                            'score': round(1 / (1 + hit.distance), 4),
+                            'score': similarity_score(metric_type, hit.distance),
                             'collection': collection_name,
                             'match_type': 'semantic'
                         }
@@ -273,7 +274,6 @@ class ClaudeRAG:
 
                         documents.append(doc)
 
-            collection.release()
             return documents
 
         except Exception as e:
@@ -307,7 +307,6 @@ class ClaudeRAG:
                 if num_entities == 0:
                     print(f"[RAG]   ⚠️  {collection_name}: EMPTY (0 documents)")
                     search_summary.append(f"{collection_name}: EMPTY")
-                    collection.release()
                     continue
 
                 # Check embedding dimension compatibility
@@ -321,7 +320,6 @@ class ClaudeRAG:
                 if embedding_dim and embedding_dim != expected_dim:
                     print(f"[RAG]   ⚠️  {collection_name}: SKIPPED (dimension mismatch: {embedding_dim} vs {expected_dim})")
                     search_summary.append(f"{collection_name}: INCOMPATIBLE")
-                    collection.release()
                     continue
 
                 print(f"[RAG]   🔎 {collection_name}: {num_entities} total documents in DB")
@@ -387,7 +385,7 @@ class ClaudeRAG:
 
         return diverse_documents
 
-    def ask_claude(self, question, context_documents, website_content=None):
+    def ask_claude(self, question, context_documents, website_content=None, cache_context=False):
         """
         Ask Claude with context from multiple sources
 
@@ -395,10 +393,17 @@ class ClaudeRAG:
             question: User's question
             context_documents: List of documents from Milvus
             website_content: Optional scraped website content
+            cache_context: Send the context as a prompt-cached prefix so repeat
+                questions over the same documents reuse it
 
         Returns:
             Claude's response
         """
+        if cache_context:
+            # The cached prefix must be byte-identical across questions, so order
+            # documents deterministically and leave out the per-query relevance
+            context_documents = sorted(context_documents, key=lambda doc: str(doc.get('source_id', '')))
+
         # Build context
         context_parts = []
 
@@ -414,8 +419,9 @@ class ClaudeRAG:
         # Add Milvus documents
         for i, doc in enumerate(context_documents):
             source_label = f"{doc.get('collection', 'unknown')} - {doc.get('source_type', 'unknown')}"
+            relevance = "" if cache_context else f" (Relevance: {doc['score']})"
             context_parts.append(
-                f"Document {i+1} [{source_label}] (Relevance: {doc['score']}):\n"
+                f"Document {i+1} [{source_label}]{relevance}:\n"
                 f"Title: {doc['title']}\n"
                 f"Content: {doc['content'][:1000]}"
             )
@@ -426,8 +432,8 @@ class ClaudeRAG:
         collections_present = set(doc.get('collection', '') for doc in context_documents)
         collection_summary = ", ".join(sorted(collections_present)) if collections_present else "unknown"
 
-        # Build prompt
-        prompt = f"""You are an expert analyst specializing in technical documentation and enterprise software. Your task is to thoroughly analyze the provided context from MULTIPLE data sources and deliver precise, actionable insights.
+        # Build prompt: the context prefix is followed by the question and instructions
+        prompt_context = f"""You are an expert analyst specializing in technical documentation and enterprise software. Your task is to thoroughly analyze the provided context from MULTIPLE data sources and deliver precise, actionable insights.
 
 CONTEXT SOURCES: You have access to information from: {collection_summary}
 This includes: JIRA tickets, codebase analysis, GitHub PRs, developer personas, action logs, and custom notes.
@@ -435,7 +441,8 @@ This includes: JIRA tickets, codebase analysis, GitHub PRs, developer personas,
 RETRIEVED CONTEXT FROM DATABASE ({len(context_documents)} documents):
 {context}
 
-USER QUESTION: {question}
+"""
+        prompt_question = f"""USER QUESTION: {question}
 
 ANALYSIS INSTRUCTIONS:
 1. THOROUGHLY ANALYZE ALL CONTEXT:
@@ -497,11 +504,19 @@ ANSWER (detailed, technical, actionable, synthesizing ALL sources):"""
             print("[Claude] Sending request...")
             start_time = time.time()
 
+            if cache_context:
+                content = [
+                    {"type": "text", "text": prompt_context, "cache_control": {"type": "ephemeral"}},
+                    {"type": "text", "text": prompt_question}
+                ]
+            else:
+                content = prompt_context + prompt_question
+
             message = self.client.messages.create(
                 model="claude-sonnet-4-5",
                 max_tokens=4000,  # Increased for detailed analysis
                 messages=[
-                    {"role": "user", "content": prompt}
+                    {"role": "user", "content": content}
                 ]
             )
 
@@ -524,9 +539,13 @@ ANSWER (detailed, technical, actionable, synthesizing ALL sources):"""
             # Extract token usage from API response
             input_tokens = message.usage.input_tokens
             output_tokens = message.usage.output_tokens
+            cache_read_tokens = getattr(message.usage, 'cache_read_input_tokens', 0) or 0
+            cache_creation_tokens = getattr(message.usage, 'cache_creation_input_tokens', 0) or 0
 
             print(f"[Claude] ✓ Received response ({len(answer)} chars)")
             print(f"[Claude] Tokens: {input_tokens} input + {output_tokens} output = {input_tokens + output_tokens} total")
+            if cache_read_tokens or cache_creation_tokens:
+                print(f"[Claude] Prompt cache: {cache_read_tokens} read, {cache_creation_tokens} written")
             if answer_confidence:
                 print(f"[Claude] Answer Confidence: {answer_confidence:.2f}")
 
@@ -535,6 +554,8 @@ ANSWER (detailed, technical, actionable, synthesizing ALL sources):"""
                 'input_tokens': input_tokens,
                 'output_tokens': output_tokens,
                 'total_tokens': input_tokens + output_tokens,
+                'cache_read_input_tokens': cache_read_tokens,
+                'cache_creation_input_tokens': cache_creation_tokens,
                 'response_time_ms': response_time_ms,
                 'answer_confidence': answer_confidence
             }
@@ -84,6 +84,9 @@ class CodebaseAnalyzer:
     def connect_milvus(self):
         """Connect to Milvus"""
         try:
+            # Reused analyzers call this per request; keep an existing connection
+            if connections.has_connection("default"):
+                return True
             connections.connect(alias="default", host=self.milvus_host, port=self.milvus_port)
             print("[Analyzer] ✓ Connected to Milvus")
             return True
@@ -1363,7 +1366,6 @@ Content:
                         'collection': 'codebase_analysis'
                     })
 
-            collection.release()
             return documents
 
         except Exception as e:
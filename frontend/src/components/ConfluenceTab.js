@@ -1,7 +1,6 @@
-import React, { useState } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import {
   VStack,
-  HStack,
   FormControl,
   FormLabel,
   Input,
@@ -18,7 +17,6 @@ import {
   List,
   ListItem,
   ListIcon,
-  Badge,
   Divider,
   useColorModeValue,
 } from '@chakra-ui/react';
@@ -31,10 +29,57 @@ function ConfluenceTab() {
   const [collection, setCollection] = useState('confluence_pages');
   const [message, setMessage] = useState(null);
   const [isLoading, setIsLoading] = useState(false);
-  const [pageInfo, setPageInfo] = useState(null);
+  const [fetched, setFetched] = useState(false);
+  const [progressFile, setProgressFile] = useState(null);
+  const progressIntervalRef = useRef(null);
 
   const descColor = 'rgba(255,255,255,0.7)';
-  const bgColor = 'rgba(255,255,255,0.08)';
+
+  // Poll for progress updates
+  useEffect(() => {
+    if (isLoading && progressFile) {
+      progressIntervalRef.current = setInterval(() => {
+        fetchProgress();
+      }, 2000);
+
+      return () => {
+        if (progressIntervalRef.current) {
+          clearInterval(progressIntervalRef.current);
+        }
+      };
+    }
+  }, [isLoading, progressFile]);
+
+  const fetchProgress = async () => {
+    try {
+      const response = await axios.get('/confluence_progress', {
+        params: { progress_file: progressFile },
+      });
+
+      // Check if completed
+      if (response.data.status === 'completed') {
+        clearInterval(progressIntervalRef.current);
+        setIsLoading(false);
+        setMessage({
+          type: 'success',
+          text: response.data.current_item || 'Successfully fetched Confluence page',
+        });
+        setProgressFile(null);
+        setFetched(true);
+        setPageUrl('');
+      } else if (response.data.status === 'error') {
+        clearInterval(progressIntervalRef.current);
+        setIsLoading(false);
+        setMessage({
+          type: 'error',
+          text: response.data.error_message || 'Error fetching Confluence page',
+        });
+        setProgressFile(null);
+      }
+    } catch (error) {
+      console.error('Error fetching progress:', error);
+    }
+  };
 
   const handleSubmit = async (e) => {
     e.preventDefault();
@@ -45,7 +90,7 @@ function ConfluenceTab() {
 
     setIsLoading(true);
     setMessage(null);
-    setPageInfo(null);
+    setFetched(false);
 
     try {
       const response = await axios.post('/fetch_confluence', {
@@ -53,21 +98,20 @@ function ConfluenceTab() {
         collection: collection,
       });
 
-      setMessage({
-        type: response.data.success ? 'success' : 'error',
-        text: response.data.message,
-      });
-
-      if (response.data.success) {
-        setPageInfo(response.data.page_info);
-        setPageUrl('');
+      if (response.data.success && response.data.progress_file) {
+        setProgressFile(response.data.progress_file);
+      } else {
+        setMessage({
+          type: 'error',
+          text: response.data.message || 'Failed to start fetching',
+        });
+        setIsLoading(false);
       }
     } catch (error) {
       setMessage({
         type: 'error',
         text: error.response?.data?.message || 'Error fetching Confluence page'
       });
-    } finally {
       setIsLoading(false);
     }
   };
@@ -206,41 +250,9 @@ function ConfluenceTab() {
           </Alert>
         )}
 
-        {pageInfo && (
+        {fetched && (
           <>
             <Divider />
-            <Box p={6} bg={bgColor} borderRadius="20px">
-              <Text fontSize="lg" fontWeight="bold" mb={4}>
-                📄 Page Details
-              </Text>
-              <VStack spacing={3} align="stretch">
-                <HStack>
-                  <Text fontWeight="bold" minW="150px">Title:</Text>
-                  <Text>{pageInfo.title}</Text>
-                </HStack>
-                <HStack>
-                  <Text fontWeight="bold" minW="150px">Page ID:</Text>
-                  <Badge colorScheme="blue">{pageInfo.page_id}</Badge>
-                </HStack>
-                <HStack>
-                  <Text fontWeight="bold" minW="150px">Space:</Text>
-                  <Badge colorScheme="blue">{pageInfo.space}</Badge>
-                </HStack>
-                <HStack>
-                  <Text fontWeight="bold" minW="150px">Version:</Text>
-                  <Text>{pageInfo.version}</Text>
-                </HStack>
-                <HStack>
-                  <Text fontWeight="bold" minW="150px">Created by:</Text>
-                  <Text>{pageInfo.created_by}</Text>
-                </HStack>
-                <HStack>
-                  <Text fontWeight="bold" minW="150px">Last modified by:</Text>
-                  <Text>{pageInfo.last_modified_by}</Text>
-                </HStack>
-              </VStack>
-            </Box>
-
             <Alert status="success" borderRadius="20px">
               <AlertIcon />
               <Box flex="1">
@@ -4,14 +4,133 @@ GitHub Persona Analyzer
 Analyzes contributor patterns from GitHub PRs stored in Milvus
 """
 
-import json
-from collections import defaultdict, Counter
+import orjson
+import threading
+import time
+from collections import defaultdict, Counter, OrderedDict
+from dataclasses import dataclass
+from typing import Optional
 from datetime import datetime
+import numpy as np
 from pymilvus import connections, Collection, utility, FieldSchema, CollectionSchema, DataType
 from sentence_transformers import SentenceTransformer
-from textblob import TextBlob
+from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
 import re
 
+# Structured PR activity columns written at ingest (see web_interface.build_pr_activity)
+PR_ACTIVITY_FIELDS = ['reviews', 'discussion_comments', 'code_comments']
+
+PERSONA_COLLECTION = 'github_personas'
+
+_EMPTY_JSON = b'{}'
+
+_WORD_RE = re.compile(r'\b\w+\b')
+
+# Lexicon-based sentiment scorer, loaded once per process
+_SENTIMENT = SentimentIntensityAnalyzer()
+
+# Comment topic keywords (substring match against lowercased comment text)
+_TOPIC_KEYWORDS = {
+    'code_style': ['style', 'format', 'lint', 'convention'],
+    'logic_bugs': ['bug', 'error', 'issue', 'wrong', 'fix'],
+    'performance': ['performance', 'slow', 'optimize', 'efficient', 'speed'],
+    'security': ['security', 'vulnerable', 'auth', 'permission', 'safe'],
+    'documentation': ['doc', 'comment', 'readme', 'documentation']
+}
+_TOPIC_PATTERNS = {
+    topic: re.compile('|'.join(re.escape(word) for word in words))
+    for topic, words in _TOPIC_KEYWORDS.items()
+}
+
+
+class QueryCache:
+    """Thread-safe LRU cache with per-entry TTL for Milvus read queries"""
+
+    def __init__(self, max_size=2000, ttl_seconds=300):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()  # key -> (value, expiry_ts)
+        self._lock = threading.RLock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key):
+        """Return cached value or None if missing/expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[0]
+
+    def set(self, key, value):
+        """Store value, evicting the least recently used entry when full"""
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self.ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key):
+        """Drop a single entry"""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """Drop all entries"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Hit/miss counters for observability"""
+        with self._lock:
+            total = self._hits + self._misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'ttl_seconds': self.ttl_seconds,
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_rate': round(self._hits / total, 2) if total else 0
+            }
+
+
+# Shared across analyzer instances (web_interface creates one per request)
+persona_cache = QueryCache()
+
+
+@dataclass(slots=True)
+class UserAgg:
+    """Per-user activity accumulator; each list is only allocated on first append"""
+    prs_authored: Optional[list] = None
+    prs_reviewed: Optional[list] = None
+    approvals_given: Optional[list] = None
+    changes_requested: Optional[list] = None
+    comments_only: Optional[list] = None
+    prs_merged: Optional[list] = None
+    all_comments: Optional[list] = None
+    review_comments: Optional[list] = None
+    issue_comments: Optional[list] = None
+    review_times: Optional[list] = None
+    merge_times: Optional[list] = None  # numpy array of hours once computed
+
+    def add(self, field_name, item):
+        """Append item to the named activity list, creating it if needed"""
+        items = getattr(self, field_name)
+        if items is None:
+            setattr(self, field_name, [item])
+        else:
+            items.append(item)
+
+    def get(self, field_name):
+        """Return the named activity list (empty if nothing was recorded)"""
+        items = getattr(self, field_name)
+        return items if items is not None else []
+
 
 class GitHubPersonaAnalyzer:
     """Analyze GitHub contributor patterns and build personas"""
@@ -49,34 +168,37 @@ class GitHubPersonaAnalyzer:
         collection = Collection(name=self.collection_name)
         collection.load()
 
-        # Query all PRs
-        results = collection.query(
+        # Read structured activity columns when the collection has them; the
+        # large content blob is only needed for the legacy regex fallback
+        schema_fields = {field.name for field in collection.schema.fields}
+        activity_fields = [name for name in PR_ACTIVITY_FIELDS if name in schema_fields]
+        output_fields = ["source_id", "title", "metadata", "url"]
+        output_fields += activity_fields if len(activity_fields) == len(PR_ACTIVITY_FIELDS) else ["content"]
+
+        # Page through all PRs instead of pulling them in one response
+        iterator = collection.query_iterator(
+            batch_size=500,
             expr="source_type == 'github_pr'",
-            output_fields=["source_id", "title", "content", "metadata", "url"]
+            output_fields=output_fields
         )
+        results = []
+        while True:
+            batch = iterator.next()
+            if not batch:
+                iterator.close()
+                break
+            results.extend(batch)
 
-        collection.release()
         return results
 
     def extract_user_activities(self, prs):
         """Extract all activities per user from PRs"""
-        user_data = defaultdict(lambda: {
-            'prs_authored': [],
-            'prs_reviewed': [],
-            'approvals_given': [],
-            'changes_requested': [],
-            'comments_only': [],
-            'prs_merged': [],
-            'all_comments': [],
-            'review_comments': [],
-            'issue_comments': [],
-            'review_times': [],
-            'merge_times': []
-        })
+        user_data = defaultdict(UserAgg)
+        merge_pairs = defaultdict(list)
 
         for pr in prs:
             try:
-                metadata = json.loads(pr.get('metadata', '{}'))
+                metadata = orjson.loads(pr.get('metadata') or _EMPTY_JSON)
                 content = pr.get('content', '')
 
                 # Extract PR author (use name, not login)
@@ -88,7 +210,7 @@ class GitHubPersonaAnalyzer:
                 merged_by = metadata.get('merged_by', None)  # Already stores name from web_interface
 
                 # Track PR authorship
-                user_data[author]['prs_authored'].append({
+                user_data[author].add('prs_authored', {
                     'pr_number': pr_number,
                     'title': pr.get('title', ''),
                     'url': pr_url,
@@ -97,22 +219,9 @@ class GitHubPersonaAnalyzer:
                     'merged_by': merged_by
                 })
 
-                # Extract reviewers and their actions from content
-                # Parse reviews section
-                reviews_match = re.search(r'--- REVIEWS \((\d+): (\d+) approved, (\d+) changes requested\) ---', content)
-                if reviews_match:
-                    total_reviews = int(reviews_match.group(1))
-                    approvals_count = int(reviews_match.group(2))
-                    changes_req_count = int(reviews_match.group(3))
-
-                # Parse individual reviews
-                review_pattern = r'\d+\. (APPROVED|CHANGES_REQUESTED|COMMENTED) by (\w+): (.+?)(?=\n\d+\.|---|\Z)'
-                for match in re.finditer(review_pattern, content, re.DOTALL):
-                    state = match.group(1)
-                    reviewer = match.group(2)
-                    review_body = match.group(3).strip()
-
-                    user_data[reviewer]['prs_reviewed'].append({
+                # Extract reviewers and their actions
+                for state, reviewer, review_body in self._iter_reviews(pr, content):
+                    user_data[reviewer].add('prs_reviewed', {
                         'pr_number': pr_number,
                         'pr_author': author,
                         'state': state,
@@ -120,19 +229,19 @@ class GitHubPersonaAnalyzer:
                     })
 
                     if state == 'APPROVED':
-                        user_data[reviewer]['approvals_given'].append({
+                        user_data[reviewer].add('approvals_given', {
                             'pr_number': pr_number,
                             'pr_author': author,
                             'url': pr_url
                         })
                     elif state == 'CHANGES_REQUESTED':
-                        user_data[reviewer]['changes_requested'].append({
+                        user_data[reviewer].add('changes_requested', {
                             'pr_number': pr_number,
                             'pr_author': author,
                             'url': pr_url
                         })
                     elif state == 'COMMENTED':
-                        user_data[reviewer]['comments_only'].append({
+                        user_data[reviewer].add('comments_only', {
                             'pr_number': pr_number,
                             'pr_author': author,
                             'url': pr_url
@@ -140,52 +249,40 @@ class GitHubPersonaAnalyzer:
 
                     # Store review comment
                     if review_body and review_body != '(no comment)':
-                        user_data[reviewer]['all_comments'].append({
+                        user_data[reviewer].add('all_comments', {
                             'type': 'review',
                             'pr_number': pr_number,
                             'text': review_body,
                             'state': state
                         })
 
-                # Parse discussion comments
-                comment_pattern = r'\d+\. (\w+): (.+?)(?=\n\d+\.|---|\Z)'
-                discussion_section = re.search(r'--- DISCUSSION COMMENTS.*?---', content, re.DOTALL)
-                if discussion_section:
-                    for match in re.finditer(comment_pattern, discussion_section.group(0), re.DOTALL):
-                        commenter = match.group(1)
-                        comment_text = match.group(2).strip()
-
-                        user_data[commenter]['issue_comments'].append({
-                            'pr_number': pr_number,
-                            'text': comment_text
-                        })
-                        user_data[commenter]['all_comments'].append({
-                            'type': 'discussion',
-                            'pr_number': pr_number,
-                            'text': comment_text
-                        })
-
-                # Parse code review comments
-                code_comment_pattern = r'\d+\. (\w+) on .+?: (.+?)(?=\n\d+\.|---|\Z)'
-                code_section = re.search(r'--- CODE REVIEW COMMENTS.*?---', content, re.DOTALL)
-                if code_section:
-                    for match in re.finditer(code_comment_pattern, code_section.group(0), re.DOTALL):
-                        commenter = match.group(1)
-                        comment_text = match.group(2).strip()
+                # Discussion comments
+                for commenter, comment_text in self._iter_discussion_comments(pr, content):
+                    user_data[commenter].add('issue_comments', {
+                        'pr_number': pr_number,
+                        'text': comment_text
+                    })
+                    user_data[commenter].add('all_comments', {
+                        'type': 'discussion',
+                        'pr_number': pr_number,
+                        'text': comment_text
+                    })
 
-                        user_data[commenter]['review_comments'].append({
-                            'pr_number': pr_number,
-                            'text': comment_text
-                        })
-                        user_data[commenter]['all_comments'].append({
-                            'type': 'code_review',
-                            'pr_number': pr_number,
-                            'text': comment_text
-                        })
+                # Code review comments
+                for commenter, comment_text in self._iter_code_comments(pr, content):
+                    user_data[commenter].add('review_comments', {
+                        'pr_number': pr_number,
+                        'text': comment_text
+                    })
+                    user_data[commenter].add('all_comments', {
+                        'type': 'code_review',
+                        'pr_number': pr_number,
+                        'text': comment_text
+                    })
 
                 # Track who merged the PR
                 if merged_by:
-                    user_data[merged_by]['prs_merged'].append({
+                    user_data[merged_by].add('prs_merged', {
                         'pr_number': pr_number,
                         'pr_author': author,
                         'url': pr_url,
@@ -193,21 +290,73 @@ class GitHubPersonaAnalyzer:
                         'self_merge': merged_by == author
                     })
 
-                    # Calculate merge time if available
+                    # Collect raw timestamps; merge times are computed in bulk below
                     if created_at and merged_at:
-                        try:
-                            created = datetime.fromisoformat(created_at.replace('Z', '+00:00'))
-                            merged = datetime.fromisoformat(merged_at.replace('Z', '+00:00'))
-                            hours_to_merge = (merged - created).total_seconds() / 3600
-                            user_data[merged_by]['merge_times'].append(hours_to_merge)
-                        except:
-                            pass
+                        merge_pairs[merged_by].append((created_at, merged_at))
 
             except Exception as e:
                 print(f"Error processing PR: {e}")
                 continue
 
-        return dict(user_data)
+        for username, pairs in merge_pairs.items():
+            user_data[username].merge_times = self._merge_hours(pairs)
+
+        return user_data
+
+    def _merge_hours(self, pairs):
+        """Convert (created_at, merged_at) ISO string pairs to hours-to-merge array"""
+        try:
+            # GitHub timestamps are UTC ('Z' suffix); numpy parses the naive form
+            arr = np.array([(c.rstrip('Z'), m.rstrip('Z')) for c, m in pairs], dtype='datetime64[s]')
+            return (arr[:, 1] - arr[:, 0]).astype('int64') / 3600.0
+        except ValueError:
+            # Offset-style timestamps: fall back to per-pair parsing
+            hours = []
+            for created_at, merged_at in pairs:
+                try:
+                    created = datetime.fromisoformat(created_at.replace('Z', '+00:00'))
+                    merged = datetime.fromisoformat(merged_at.replace('Z', '+00:00'))
+                    hours.append((merged - created).total_seconds() / 3600)
+                except ValueError:
+                    continue
+            return np.array(hours, dtype='float64')
+
+    def _iter_reviews(self, pr, content):
+        """Yield (state, reviewer, body) from structured reviews, or parse legacy content"""
+        if pr.get('reviews') is not None:
+            for review in pr['reviews']:
+                yield review.get('state'), review.get('reviewer', 'unknown'), (review.get('body') or '').strip()
+            return
+
+        review_pattern = r'\d+\. (APPROVED|CHANGES_REQUESTED|COMMENTED) by (\w+): (.+?)(?=\n\d+\.|---|\Z)'
+        for match in re.finditer(review_pattern, content, re.DOTALL):
+            yield match.group(1), match.group(2), match.group(3).strip()
+
+    def _iter_discussion_comments(self, pr, content):
+        """Yield (author, text) from structured discussion comments, or parse legacy content"""
+        if pr.get('discussion_comments') is not None:
+            for comment in pr['discussion_comments']:
+                yield comment.get('author', 'unknown'), (comment.get('body') or '').strip()
+            return
+
+        comment_pattern = r'\d+\. (\w+): (.+?)(?=\n\d+\.|---|\Z)'
+        discussion_section = re.search(r'--- DISCUSSION COMMENTS.*?---', content, re.DOTALL)
+        if discussion_section:
+            for match in re.finditer(comment_pattern, discussion_section.group(0), re.DOTALL):
+                yield match.group(1), match.group(2).strip()
+
+    def _iter_code_comments(self, pr, content):
+        """Yield (author, text) from structured code review comments, or parse legacy content"""
+        if pr.get('code_comments') is not None:
+            for comment in pr['code_comments']:
+                yield comment.get('author', 'unknown'), (comment.get('body') or '').strip()
+            return
+
+        code_comment_pattern = r'\d+\. (\w+) on .+?: (.+?)(?=\n\d+\.|---|\Z)'
+        code_section = re.search(r'--- CODE REVIEW COMMENTS.*?---', content, re.DOTALL)
+        if code_section:
+            for match in re.finditer(code_comment_pattern, code_section.group(0), re.DOTALL):
+                yield match.group(1), match.group(2).strip()
 
     def analyze_comment_patterns(self, comments):
         """Analyze commenting patterns and extract insights"""
@@ -220,19 +369,17 @@ class GitHubPersonaAnalyzer:
                 'topics': {}
             }
 
-        # Combine all comment text
-        all_text = ' '.join([c['text'] for c in comments if c.get('text')])
+        # Lowercase each comment exactly once; every scan below reuses it
+        texts = [c['text'] for c in comments if c.get('text')]
+        lowered = [text.lower() for text in texts]
+        all_text = ' '.join(texts)
 
         # Calculate average comment length
-        avg_length = sum(len(c['text']) for c in comments if c.get('text')) / len(comments)
+        avg_length = sum(len(text) for text in texts) / len(comments)
 
-        # Extract common phrases (2-3 words)
-        words = re.findall(r'\b\w+\b', all_text.lower())
-        phrases = []
-        for i in range(len(words) - 1):
-            phrases.append(f"{words[i]} {words[i+1]}")
-
-        phrase_counter = Counter(phrases)
+        # Extract common phrases (2-word bigrams)
+        words = _WORD_RE.findall(' '.join(lowered))
+        phrase_counter = Counter(f"{a} {b}" for a, b in zip(words, words[1:]))
         common_phrases = [
             {'phrase': phrase, 'count': count}
             for phrase, count in phrase_counter.most_common(10)
@@ -240,8 +387,7 @@ class GitHubPersonaAnalyzer:
 
         # Sentiment analysis
         try:
-            blob = TextBlob(all_text)
-            sentiment_score = blob.sentiment.polarity  # -1 to 1
+            sentiment_score = _SENTIMENT.polarity_scores(all_text)['compound']  # -1 to 1
 
             if sentiment_score > 0.2:
                 tone = 'positive'
@@ -253,13 +399,10 @@ class GitHubPersonaAnalyzer:
             sentiment_score = 0
             tone = 'neutral'
 
-        # Topic detection (simple keyword matching)
+        # Topic detection (keyword substring match, one compiled pattern per topic)
         topics = {
-            'code_style': sum(1 for c in comments if any(word in c['text'].lower() for word in ['style', 'format', 'lint', 'convention'])),
-            'logic_bugs': sum(1 for c in comments if any(word in c['text'].lower() for word in ['bug', 'error', 'issue', 'wrong', 'fix'])),
-            'performance': sum(1 for c in comments if any(word in c['text'].lower() for word in ['performance', 'slow', 'optimize', 'efficient', 'speed'])),
-            'security': sum(1 for c in comments if any(word in c['text'].lower() for word in ['security', 'vulnerable', 'auth', 'permission', 'safe'])),
-            'documentation': sum(1 for c in comments if any(word in c['text'].lower() for word in ['doc', 'comment', 'readme', 'documentation']))
+            topic: sum(1 for text in lowered if pattern.search(text))
+            for topic, pattern in _TOPIC_PATTERNS.items()
         }
 
         return {
@@ -270,28 +413,39 @@ class GitHubPersonaAnalyzer:
             'topics': topics
         }
 
-    def build_persona(self, username, user_activities):
-        """Build comprehensive persona for a user"""
-        activities = user_activities.get(username, {})
+    def analyze_all_comments(self, user_activities):
+        """Analyze comment patterns for every user in a single pass"""
+        return {
+            username: self.analyze_comment_patterns(activities.get('all_comments'))
+            for username, activities in user_activities.items()
+        }
+
+    def build_persona(self, username, user_activities, comment_patterns=None):
+        """Build comprehensive persona for a user
+
+        comment_patterns: precomputed result of analyze_comment_patterns
+        (see analyze_all_comments); computed on demand when omitted.
+        """
+        activities = user_activities.get(username) or UserAgg()
 
         # Calculate statistics
-        prs_authored_count = len(activities['prs_authored'])
-        prs_reviewed_count = len(activities['prs_reviewed'])
-        approvals_count = len(activities['approvals_given'])
-        changes_req_count = len(activities['changes_requested'])
-        comments_only_count = len(activities['comments_only'])
-        prs_merged_count = len(activities['prs_merged'])
+        prs_authored_count = len(activities.get('prs_authored'))
+        prs_reviewed_count = len(activities.get('prs_reviewed'))
+        approvals_count = len(activities.get('approvals_given'))
+        changes_req_count = len(activities.get('changes_requested'))
+        comments_only_count = len(activities.get('comments_only'))
+        prs_merged_count = len(activities.get('prs_merged'))
 
         # Calculate merge statistics
-        self_merges = [m for m in activities['prs_merged'] if m.get('self_merge', False)]
-        other_merges = [m for m in activities['prs_merged'] if not m.get('self_merge', False)]
+        self_merges = [m for m in activities.get('prs_merged') if m.get('self_merge', False)]
+        other_merges = [m for m in activities.get('prs_merged') if not m.get('self_merge', False)]
 
         merge_rate = prs_merged_count / prs_reviewed_count if prs_reviewed_count > 0 else 0
         self_merge_rate = len(self_merges) / prs_authored_count if prs_authored_count > 0 else 0
         approval_rate = approvals_count / prs_reviewed_count if prs_reviewed_count > 0 else 0
 
         # Calculate average times
-        avg_merge_time = sum(activities['merge_times']) / len(activities['merge_times']) if activities['merge_times'] else 0
+        avg_merge_time = float(np.mean(activities.get('merge_times'))) if len(activities.get('merge_times')) else 0
 
         # Determine role based on activity
         if prs_merged_count > 10 and merge_rate > 0.3:
@@ -304,12 +458,13 @@ class GitHubPersonaAnalyzer:
             role = 'participant'
 
         # Analyze comment patterns
-        comment_patterns = self.analyze_comment_patterns(activities['all_comments'])
+        if comment_patterns is None:
+            comment_patterns = self.analyze_comment_patterns(activities.get('all_comments'))
 
         # Determine review style
         if prs_reviewed_count == 0:
             review_style = 'none'
-        elif len(activities['all_comments']) / prs_reviewed_count > 3:
+        elif len(activities.get('all_comments')) / prs_reviewed_count > 3:
             review_style = 'thorough'
         elif approval_rate > 0.8:
             review_style = 'quick_approver'
@@ -332,8 +487,8 @@ class GitHubPersonaAnalyzer:
             'self_merge_rate': round(self_merge_rate, 2),
             'approval_rate': round(approval_rate, 2),
             'avg_time_to_merge_hours': round(avg_merge_time, 1),
-            'total_comments': len(activities['all_comments']),
-            'avg_comments_per_review': round(len(activities['all_comments']) / prs_reviewed_count, 1) if prs_reviewed_count > 0 else 0
+            'total_comments': len(activities.get('all_comments')),
+            'avg_comments_per_review': round(len(activities.get('all_comments')) / prs_reviewed_count, 1) if prs_reviewed_count > 0 else 0
         }
 
         # Build patterns
@@ -348,7 +503,7 @@ class GitHubPersonaAnalyzer:
 
         # Build relationships (who they work with)
         frequently_reviews = Counter()
-        for review in activities['prs_reviewed']:
+        for review in activities.get('prs_reviewed'):
             frequently_reviews[review['pr_author']] += 1
 
         frequently_reviewed_by = Counter()
@@ -385,7 +540,7 @@ class GitHubPersonaAnalyzer:
         if not self.connect():
             return None
 
-        collection_name = 'github_personas'
+        collection_name = PERSONA_COLLECTION
 
         if utility.has_collection(collection_name):
             return Collection(name=collection_name)
@@ -407,54 +562,78 @@ class GitHubPersonaAnalyzer:
         schema = CollectionSchema(fields=fields, description="GitHub contributor personas")
         collection = Collection(name=collection_name, schema=schema)
 
-        # Create index
+        # Small corpus of normalized embeddings: HNSW + inner product (== cosine)
         index_params = {
-            "index_type": "IVF_FLAT",
-            "metric_type": "L2",
-            "params": {"nlist": 128}
+            "index_type": "HNSW",
+            "metric_type": "IP",
+            "params": {"M": 16, "efConstruction": 200}
         }
         collection.create_index(field_name="embedding", index_params=index_params)
 
         return collection
 
     def store_persona(self, persona):
-        """Store persona in Milvus"""
+        """Store persona in Milvus (not flushed; see store_personas)"""
+        return self.store_personas([persona])
+
+    def store_personas(self, personas, flush=False):
+        """Store a batch of personas in Milvus with a single insert
+
+        flush: seal the segment so the rows are immediately queryable.
+        """
+        if not personas:
+            return True
+
         collection = self.ensure_persona_collection()
         if collection is None:
             return False
 
         model = self.load_embedding_model()
 
-        # Generate embedding from persona description
-        embedding = model.encode([persona['persona_description']])[0].tolist()
+        # Generate embeddings from persona descriptions in one batch
+        embeddings = model.encode(
+            [persona['persona_description'] for persona in personas],
+            normalize_embeddings=True
+        ).tolist()
 
         # Prepare data
+        last_updated = datetime.now().isoformat()
         data = [
-            [persona['username']],
-            [persona['display_name']],
-            [persona['role']],
-            [json.dumps(persona['statistics'])],
-            [json.dumps(persona['patterns'])],
-            [json.dumps(persona['relationships'])],
-            [persona['persona_description']],
-            [datetime.now().isoformat()],
-            [embedding]
+            [persona['username'] for persona in personas],
+            [persona['display_name'] for persona in personas],
+            [persona['role'] for persona in personas],
+            [orjson.dumps(persona['statistics']).decode() for persona in personas],
+            [orjson.dumps(persona['patterns']).decode() for persona in personas],
+            [orjson.dumps(persona['relationships']).decode() for persona in personas],
+            [persona['persona_description'] for persona in personas],
+            [last_updated] * len(personas),
+            embeddings
         ]
 
-        # Delete existing persona for this user
+        # Delete existing personas for these users
+        usernames = [persona['username'] for persona in personas]
         try:
-            collection.delete(f"username == '{persona['username']}'")
-        except:
-            pass
+            collection.delete(f"username in {orjson.dumps(usernames).decode()}")
+        except Exception as e:
+            print(f"[Persona Analyzer] Could not delete existing personas: {e}")
 
-        # Insert new persona
+        # Insert new personas
         collection.insert(data)
-        collection.flush()
+        if flush:
+            collection.flush()
+
+        for username in usernames:
+            persona_cache.invalidate((PERSONA_COLLECTION, username))
+        persona_cache.invalidate((PERSONA_COLLECTION, '*'))
 
         return True
 
-    def build_all_personas(self):
-        """Build personas for all users in PR collection"""
+    def build_all_personas(self, flush=True):
+        """Build personas for all users in PR collection
+
+        flush: flush once after the batched insert so personas are queryable
+        right away; batch pipelines can pass False and defer it.
+        """
         print("[Persona Analyzer] Fetching all PRs...")
         prs = self.get_all_prs()
 
@@ -466,24 +645,32 @@ class GitHubPersonaAnalyzer:
 
         print(f"[Persona Analyzer] Found {len(user_activities)} unique contributors")
 
-        personas = []
+        all_comment_patterns = self.analyze_all_comments(user_activities)
+
+        built = []
         for username in user_activities.keys():
             if username == 'unknown':
                 continue
 
             print(f"[Persona Analyzer] Building persona for {username}...")
-            persona = self.build_persona(username, user_activities)
+            built.append(self.build_persona(username, user_activities, all_comment_patterns[username]))
 
-            # Store in Milvus
-            if self.store_persona(persona):
-                personas.append({
-                    'username': username,
+        # Store in Milvus with a single insert and at most one flush
+        personas = []
+        if self.store_personas(built, flush=flush):
+            personas = [
+                {
+                    'username': persona['username'],
                     'role': persona['role'],
                     'statistics': persona['statistics']
-                })
-                print(f"[Persona Analyzer] ✓ Stored persona for {username}")
-            else:
-                print(f"[Persona Analyzer] ✗ Failed to store persona for {username}")
+                }
+                for persona in built
+            ]
+            print(f"[Persona Analyzer] ✓ Stored {len(personas)} personas")
+        else:
+            print(f"[Persona Analyzer] ✗ Failed to store {len(built)} personas")
+
+        persona_cache.clear()
 
         return {
             'success': True,
@@ -493,10 +680,15 @@ class GitHubPersonaAnalyzer:
 
     def get_persona(self, username):
         """Get persona data for specific user"""
+        cache_key = (PERSONA_COLLECTION, username)
+        cached = persona_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         if not self.connect():
             return None
 
-        collection_name = 'github_personas'
+        collection_name = PERSONA_COLLECTION
         if not utility.has_collection(collection_name):
             return None
 
@@ -509,29 +701,34 @@ class GitHubPersonaAnalyzer:
                           "relationships", "persona_description", "last_updated"]
         )
 
-        collection.release()
-
         if results:
             result = results[0]
-            return {
+            persona = {
                 'username': result['username'],
                 'display_name': result['display_name'],
                 'role': result['role'],
-                'statistics': json.loads(result['statistics']),
-                'patterns': json.loads(result['patterns']),
-                'relationships': json.loads(result['relationships']),
+                'statistics': orjson.loads(result['statistics']),
+                'patterns': orjson.loads(result['patterns']),
+                'relationships': orjson.loads(result['relationships']),
                 'persona_description': result['persona_description'],
                 'last_updated': result['last_updated']
             }
+            persona_cache.set(cache_key, persona)
+            return persona
 
         return None
 
     def get_all_personas(self):
         """Get all personas with summary stats"""
+        cache_key = (PERSONA_COLLECTION, '*')
+        cached = persona_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         if not self.connect():
             return []
 
-        collection_name = 'github_personas'
+        collection_name = PERSONA_COLLECTION
         if not utility.has_collection(collection_name):
             return []
 
@@ -544,11 +741,9 @@ class GitHubPersonaAnalyzer:
             limit=1000
         )
 
-        collection.release()
-
         personas = []
         for result in results:
-            stats = json.loads(result['statistics'])
+            stats = orjson.loads(result['statistics'])
             personas.append({
                 'username': result['username'],
                 'display_name': result['display_name'],
@@ -557,4 +752,5 @@ class GitHubPersonaAnalyzer:
                 'last_updated': result['last_updated']
             })
 
+        persona_cache.set(cache_key, personas)
         return personas
@@ -8,12 +8,25 @@ import torch
 from PIL import Image
 from transformers import CLIPProcessor, CLIPModel
 import numpy as np
-from typing import Union, List
+from typing import Union, List, Dict, Tuple
 import os
+from concurrent.futures import ThreadPoolExecutor
+
+
+def _load_rgb(path: str):
+    """Open an image as RGB, or return None if the file is missing"""
+    if not os.path.exists(path):
+        print(f"Warning: Image not found: {path}")
+        return None
+    return Image.open(path).convert("RGB")
+
 
 class ImageVectorizer:
     """Extract semantic vectors from images using CLIP"""
 
+    # Max number of distinct prompt lists kept in the text feature cache
+    TEXT_CACHE_SIZE = 256
+
     def __init__(self, model_name: str = "openai/clip-vit-base-patch32"):
         """
         Initialize CLIP model for image vectorization
@@ -24,10 +37,48 @@ class ImageVectorizer:
         print(f"Loading CLIP model: {model_name}")
         self.device = "cuda" if torch.cuda.is_available() else "cpu"
         self.model = CLIPModel.from_pretrained(model_name).to(self.device)
+        # Half precision on GPU halves memory traffic and uses tensor cores
+        if self.device == "cuda":
+            self.model = self.model.half()
+            self.autocast_dtype = torch.float16
+        else:
+            self.autocast_dtype = torch.float32
         self.processor = CLIPProcessor.from_pretrained(model_name)
         self.model.eval()
+        self._text_cache: Dict[Tuple[str, ...], torch.Tensor] = {}
+        self._compile_vision_model()
         print(f"✓ CLIP model loaded on {self.device}")
 
+    def _compile_vision_model(self):
+        """Compile the image tower for the fixed input shape (CUDA only)"""
+        if self.device != "cuda" or not hasattr(torch, "compile"):
+            return
+
+        eager_vision_model = self.model.vision_model
+        try:
+            self.model.vision_model = torch.compile(eager_vision_model, mode="reduce-overhead", fullgraph=False)
+
+            # Pre-warm so the first real request does not pay the compile cost
+            size = self.model.config.vision_config.image_size
+            dummy = torch.zeros(1, 3, size, size, device=self.device, dtype=self.autocast_dtype)
+            with torch.inference_mode(), self._autocast():
+                self.model.get_image_features(pixel_values=dummy)
+        except Exception as e:
+            print(f"⚠ torch.compile unavailable, using eager CLIP: {e}")
+            self.model.vision_model = eager_vision_model
+
+    def _autocast(self):
+        """Autocast context for the forward pass (no-op on CPU)"""
+        return torch.autocast(self.device, dtype=self.autocast_dtype, enabled=self.device == "cuda")
+
+    def _prepare_pixels(self, inputs) -> torch.Tensor:
+        """Move processor pixel values to the model device in the inference dtype"""
+        pixel_values = inputs["pixel_values"]
+        if self.device == "cuda":
+            # Pinned host memory allows an asynchronous host-to-device copy
+            pixel_values = pixel_values.pin_memory()
+        return pixel_values.to(self.device, dtype=self.autocast_dtype, non_blocking=True)
+
     def extract_vector(self, image_path: str) -> np.ndarray:
         """
         Extract embedding vector from a single image
@@ -43,13 +94,15 @@ class ImageVectorizer:
 
         # Load and preprocess image
         image = Image.open(image_path).convert("RGB")
-        inputs = self.processor(images=image, return_tensors="pt").to(self.device)
+        inputs = self.processor(images=image, return_tensors="pt")
+        pixel_values = self._prepare_pixels(inputs)
 
         # Extract features
-        with torch.no_grad():
-            image_features = self.model.get_image_features(**inputs)
+        with torch.inference_mode(), self._autocast():
+            image_features = self.model.get_image_features(pixel_values=pixel_values)
 
         # Normalize and convert to numpy
+        image_features = image_features.float()
         image_features = image_features / image_features.norm(dim=-1, keepdim=True)
         vector = image_features.cpu().numpy().squeeze()
 
@@ -65,24 +118,23 @@ class ImageVectorizer:
         Returns:
             numpy array of shape (N, 512) - normalized embedding vectors
         """
-        images = []
-        for path in image_paths:
-            if not os.path.exists(path):
-                print(f"Warning: Image not found: {path}")
-                continue
-            images.append(Image.open(path).convert("RGB"))
+        # PIL decoding releases the GIL, so threads overlap the per-image decode cost
+        with ThreadPoolExecutor(max_workers=min(len(image_paths), os.cpu_count() or 1) or 1) as executor:
+            images = [image for image in executor.map(_load_rgb, image_paths) if image is not None]
 
         if not images:
             raise ValueError("No valid images found")
 
         # Process batch
-        inputs = self.processor(images=images, return_tensors="pt").to(self.device)
+        inputs = self.processor(images=images, return_tensors="pt")
+        pixel_values = self._prepare_pixels(inputs)
 
         # Extract features
-        with torch.no_grad():
-            image_features = self.model.get_image_features(**inputs)
+        with torch.inference_mode(), self._autocast():
+            image_features = self.model.get_image_features(pixel_values=pixel_values)
 
         # Normalize and convert to numpy
+        image_features = image_features.float()
         image_features = image_features / image_features.norm(dim=-1, keepdim=True)
         vectors = image_features.cpu().numpy()
 
@@ -92,6 +144,21 @@ class ImageVectorizer:
         """Return the dimensionality of embeddings (512 for CLIP ViT-B/32)"""
         return self.model.config.projection_dim
 
+    def _get_text_features(self, texts: List[str]) -> torch.Tensor:
+        """Return normalized text features for a prompt list, cached by the prompt tuple"""
+        key = tuple(texts)
+        text_features = self._text_cache.get(key)
+        if text_features is None:
+            text_inputs = self.processor(text=texts, return_tensors="pt", padding=True).to(self.device)
+            with torch.inference_mode(), self._autocast():
+                text_features = self.model.get_text_features(**text_inputs).float()
+                text_features = text_features / text_features.norm(dim=-1, keepdim=True)
+
+            if len(self._text_cache) >= self.TEXT_CACHE_SIZE:
+                self._text_cache.pop(next(iter(self._text_cache)))
+            self._text_cache[key] = text_features
+        return text_features
+
     def image_to_text_similarity(self, image_path: str, texts: List[str]) -> np.ndarray:
         """
         Compute similarity between an image and multiple text descriptions
@@ -103,18 +170,17 @@ class ImageVectorizer:
         Returns:
             numpy array of similarity scores (0-1)
         """
-        image = Image.open(image_path).convert("RGB")
+        text_features = self._get_text_features(texts)
 
-        inputs = self.processor(
-            text=texts,
-            images=image,
-            return_tensors="pt",
-            padding=True
-        ).to(self.device)
-
-        with torch.no_grad():
-            outputs = self.model(**inputs)
-            logits_per_image = outputs.logits_per_image
+        image = Image.open(image_path).convert("RGB")
+        inputs = self.processor(images=image, return_tensors="pt")
+        pixel_values = self._prepare_pixels(inputs)
+
+        # Only the image tower runs per call; text features come from the cache
+        with torch.inference_mode(), self._autocast():
+            image_features = self.model.get_image_features(pixel_values=pixel_values).float()
+            image_features = image_features / image_features.norm(dim=-1, keepdim=True)
+            logits_per_image = (image_features @ text_features.T) * self.model.logit_scale.exp().float()
             probs = logits_per_image.softmax(dim=1)
 
         return probs.cpu().numpy().squeeze()
@@ -4,16 +4,41 @@ Jira Client - Retrieve user details and tickets
 """
 
 import os
+import sys
 import json
+import logging
+import time
 import requests
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
 from requests.auth import HTTPBasicAuth
-from datetime import datetime
+from urllib3.util.retry import Retry
 from dotenv import load_dotenv
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Load environment variables
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+
 class JiraClient:
+    # Fields read by display_issues; the search returns only these by default
+    # (/search/jql takes fields as a JSON array; expand stays a comma-separated string)
+    DISPLAY_FIELDS = [
+        'summary', 'status', 'priority', 'issuetype', 'project', 'assignee', 'reporter',
+        'created', 'updated', 'labels', 'components', 'attachment', 'comment', 'watches'
+    ]
+    DISPLAY_EXPAND = 'changelog'
+
+    # Everything Jira can return, for callers that pass full_details=True
+    FULL_FIELDS = ['*all']
+    FULL_EXPAND = 'changelog,renderedFields,names,schema,transitions,operations'
+
     def __init__(self):
         self.jira_url = os.getenv("JIRA_URL")
         self.jira_email = os.getenv("JIRA_EMAIL")
@@ -28,115 +53,139 @@ class JiraClient:
             "Content-Type": "application/json"
         }
 
+        # One pooled keep-alive session for all requests, with retry/backoff
+        self.session = requests.Session()
+        self.session.auth = self.auth
+        self.session.headers.update(self.headers)
+        # The JQL search is a POST, so it is listed explicitly to be retried too
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=32,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.5,
+                status_forcelist=[429, 500, 502, 503, 504],
+                allowed_methods=frozenset(['GET', 'POST']),
+                raise_on_status=False
+            )
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def close(self):
+        """Close the underlying HTTP session"""
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
     def get_current_user(self):
         """Get current user details"""
         url = f"{self.jira_url}/rest/api/3/myself"
 
         try:
-            response = requests.get(url, auth=self.auth, headers=self.headers)
+            response = self.session.get(url)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as e:
-            print(f"Error fetching user details: {e}")
+            logger.error("Error fetching user details: %s", e)
             return None
 
-    def get_user_issues(self, max_results=50):
-        """Get issues assigned to or reported by current user with ALL details"""
+    def get_user_issues(self, max_results=50, include_watchers=False, full_details=False):
+        """Get issues assigned to or reported by current user"""
         # Search for issues assigned to current user
         jql = f'assignee = currentUser() OR reporter = currentUser() ORDER BY updated DESC'
+        result = self._search_issues(jql, max_results, include_watchers, full_details)
+        if result is None:
+            logger.error("Error fetching issues")
+        return result
 
-        url = f"{self.jira_url}/rest/api/3/search/jql"
-        data = {
+    def get_worked_on_issues(self, max_results=50, include_watchers=False, full_details=False):
+        """Get issues where user has logged work or added comments"""
+        jql = f'worklogAuthor = currentUser() OR commentedBy = currentUser() ORDER BY updated DESC'
+        result = self._search_issues(jql, max_results, include_watchers, full_details)
+        if result is None:
+            logger.error("Error fetching worked issues")
+        return result
+
+    def _search_payload(self, jql, max_results, full_details=False):
+        """Build the JQL search body, requesting only the displayed fields unless full_details"""
+        return {
             'jql': jql,
             'maxResults': max_results,
-            'fields': '*all',  # Get all available fields
-            'expand': 'changelog,renderedFields,names,schema,transitions,operations'
+            'fields': self.FULL_FIELDS if full_details else self.DISPLAY_FIELDS,
+            'expand': self.FULL_EXPAND if full_details else self.DISPLAY_EXPAND
         }
 
-        try:
-            response = requests.post(url, json=data, auth=self.auth, headers=self.headers)
-            response.raise_for_status()
-            result = response.json()
-
-            # Fetch additional details for each issue
-            for issue in result.get('issues', []):
-                key = issue.get('key')
-
-                # Fetch comments
-                try:
-                    comments_url = f"{self.jira_url}/rest/api/3/issue/{key}/comment"
-                    comments_response = requests.get(comments_url, auth=self.auth, headers=self.headers)
-                    if comments_response.status_code == 200:
-                        issue['all_comments'] = comments_response.json()
-                except:
-                    pass
-
-                # Fetch watchers
-                try:
-                    watchers_url = f"{self.jira_url}/rest/api/3/issue/{key}/watchers"
-                    watchers_response = requests.get(watchers_url, auth=self.auth, headers=self.headers)
-                    if watchers_response.status_code == 200:
-                        issue['all_watchers'] = watchers_response.json()
-                except:
-                    pass
-
-            return result
-        except requests.exceptions.RequestException as e:
-            print(f"Error fetching issues: {e}")
-            try:
-                print(f"Response: {response.text[:300]}")
-            except:
-                pass
-            return None
-
-    def get_worked_on_issues(self, max_results=50):
-        """Get issues where user has logged work or added comments with ALL details"""
-        jql = f'worklogAuthor = currentUser() OR commentedBy = currentUser() ORDER BY updated DESC'
+    def _search_issues(self, jql, max_results, include_watchers=False, full_details=False):
+        """Run a JQL search; comments and watch counts come embedded in the response
 
+        include_watchers: also fetch the full watcher list for watched issues
+        (one extra request each). Only the count is needed for display.
+        full_details: request every field and expansion instead of DISPLAY_FIELDS.
+        """
         url = f"{self.jira_url}/rest/api/3/search/jql"
-        data = {
-            'jql': jql,
-            'maxResults': max_results,
-            'fields': '*all',  # Get all available fields
-            'expand': 'changelog,renderedFields,names,schema,transitions,operations'
-        }
+        data = self._search_payload(jql, max_results, full_details)
 
         try:
-            response = requests.post(url, json=data, auth=self.auth, headers=self.headers)
+            response = self.session.post(url, json=data)
             response.raise_for_status()
             result = response.json()
-
-            # Fetch additional details for each issue
-            for issue in result.get('issues', []):
-                key = issue.get('key')
-
-                # Fetch comments
-                try:
-                    comments_url = f"{self.jira_url}/rest/api/3/issue/{key}/comment"
-                    comments_response = requests.get(comments_url, auth=self.auth, headers=self.headers)
-                    if comments_response.status_code == 200:
-                        issue['all_comments'] = comments_response.json()
-                except:
-                    pass
-
-                # Fetch watchers
-                try:
-                    watchers_url = f"{self.jira_url}/rest/api/3/issue/{key}/watchers"
-                    watchers_response = requests.get(watchers_url, auth=self.auth, headers=self.headers)
-                    if watchers_response.status_code == 200:
-                        issue['all_watchers'] = watchers_response.json()
-                except:
-                    pass
-
-            return result
         except requests.exceptions.RequestException as e:
-            print(f"Error fetching worked issues: {e}")
-            try:
-                print(f"Response: {response.text[:300]}")
-            except:
-                pass
+            logger.error("Search failed: %s", e)
+            if e.response is not None:
+                logger.error("Response: %s", e.response.text[:300])
             return None
 
+        # Residual per-issue requests run concurrently over the shared session
+        issues = result.get('issues', [])
+        if issues:
+            with ThreadPoolExecutor(max_workers=min(10, len(issues))) as executor:
+                extras = executor.map(lambda issue: self._fetch_issue_extras(issue, include_watchers), issues)
+                for issue, issue_extras in zip(issues, extras):
+                    issue.update(issue_extras)
+
+        return result
+
+    def _fetch_issue_extras(self, issue, include_watchers=False):
+        """Return 'all_comments' (and optionally 'all_watchers') for one search hit"""
+        fields = issue.get('fields', {})
+        key = issue.get('key')
+        extras = {}
+
+        # Embedded comment page; only refetch when the search truncated it
+        embedded = fields.get('comment') or {}
+        if embedded.get('total', 0) > len(embedded.get('comments', [])):
+            extras['all_comments'] = self._get_json(f"{self.jira_url}/rest/api/3/issue/{key}/comment") or embedded
+        else:
+            extras['all_comments'] = embedded
+
+        # Full watcher list only when asked for and somebody is watching
+        if include_watchers and (fields.get('watches') or {}).get('watchCount', 0) > 0:
+            watchers = self._get_json(f"{self.jira_url}/rest/api/3/issue/{key}/watchers")
+            if watchers is not None:
+                extras['all_watchers'] = watchers
+
+        return extras
+
+    def _get_json(self, url):
+        """GET a JSON resource, returning None on any non-200 response"""
+        try:
+            response = self.session.get(url)
+            if response.status_code == 429:
+                # Rate limited after adapter retries: honour Retry-After once more
+                time.sleep(float(response.headers.get('Retry-After', 1)))
+                response = self.session.get(url)
+            if response.status_code == 200:
+                return response.json()
+            logger.warning("GET %s returned %s", url, response.status_code)
+        except (requests.exceptions.RequestException, ValueError) as e:
+            logger.warning("GET %s failed: %s", url, e)
+        return None
+
     def display_user_info(self, user_data):
         """Display user information"""
         if not user_data:
@@ -155,6 +204,39 @@ class JiraClient:
         print(f"Locale: {user_data.get('locale', 'N/A')}")
         print("="*70)
 
+    @staticmethod
+    def _project_rows(issues):
+        """Project the issue list into per-column lists for display"""
+        fields = [issue.get('fields', {}) for issue in issues]
+        statuses = [f.get('status') or {} for f in fields]
+        assignees = [f.get('assignee') for f in fields]
+        reporters = [f.get('reporter') for f in fields]
+
+        return {
+            'keys': [issue.get('key', 'N/A') for issue in issues],
+            'summaries': [f.get('summary', 'N/A') for f in fields],
+            'statuses': [st.get('name', 'N/A') for st in statuses],
+            'status_categories': [(st.get('statusCategory') or {}).get('name', 'N/A') for st in statuses],
+            'priorities': [(f.get('priority') or {}).get('name', 'N/A') for f in fields],
+            'issue_types': [(f.get('issuetype') or {}).get('name', 'N/A') for f in fields],
+            'projects': [(f.get('project') or {}).get('key', 'N/A') for f in fields],
+            'assignees': [a.get('displayName', 'Unassigned') if a else 'Unassigned' for a in assignees],
+            'reporters': [r.get('displayName', 'Unknown') if r else 'Unknown' for r in reporters],
+            # Jira timestamps are ISO-8601, so the date is the first 10 characters
+            'created': [(f.get('created') or '')[:10] or 'N/A' for f in fields],
+            'updated': [(f.get('updated') or '')[:10] or 'N/A' for f in fields],
+            'labels': [f.get('labels', []) for f in fields],
+            'components': [[c.get('name') for c in f.get('components', [])] for f in fields],
+            'comments': [len(issue.get('all_comments', {}).get('comments', [])) for issue in issues],
+            'watchers': [
+                len(issue['all_watchers'].get('watchers', [])) if 'all_watchers' in issue
+                else (f.get('watches') or {}).get('watchCount', 0)
+                for issue, f in zip(issues, fields)
+            ],
+            'histories': [len(issue.get('changelog', {}).get('histories', [])) for issue in issues],
+            'attachments': [len(f.get('attachment', [])) for f in fields],
+        }
+
     def display_issues(self, issues_data, title="ISSUES"):
         """Display issues in a formatted table with detailed information"""
         if not issues_data or 'issues' not in issues_data:
@@ -163,105 +245,90 @@ class JiraClient:
 
         issues = issues_data['issues']
         total = issues_data.get('total', len(issues))
-
-        print(f"\n{'='*70}")
-        print(f"{title} (Showing {len(issues)} of {total})")
-        print("="*70)
-
-        for i, issue in enumerate(issues, 1):
-            key = issue.get('key', 'N/A')
-            fields = issue.get('fields', {})
-            changelog = issue.get('changelog', {})
-
-            summary = fields.get('summary', 'N/A')
-            status = fields.get('status', {}).get('name', 'N/A')
-            status_category = fields.get('status', {}).get('statusCategory', {}).get('name', 'N/A')
-            priority = fields.get('priority', {}).get('name', 'N/A')
-            issue_type = fields.get('issuetype', {}).get('name', 'N/A')
-            project = fields.get('project', {}).get('key', 'N/A')
-
-            assignee = fields.get('assignee')
-            assignee_name = assignee.get('displayName', 'Unassigned') if assignee else 'Unassigned'
-
-            reporter = fields.get('reporter')
-            reporter_name = reporter.get('displayName', 'Unknown') if reporter else 'Unknown'
-
-            created = fields.get('created', '')
-            updated = fields.get('updated', '')
-
-            # Count additional details
-            comments_count = len(issue.get('all_comments', {}).get('comments', []))
-            watchers_count = len(issue.get('all_watchers', {}).get('watchers', []))
-            history_count = len(changelog.get('histories', []))
-            attachments_count = len(fields.get('attachment', []))
-            labels = fields.get('labels', [])
-            components = [c.get('name') for c in fields.get('components', [])]
-
-            # Parse and format dates
-            try:
-                created_date = datetime.fromisoformat(created.replace('Z', '+00:00')).strftime('%Y-%m-%d')
-                updated_date = datetime.fromisoformat(updated.replace('Z', '+00:00')).strftime('%Y-%m-%d')
-            except:
-                created_date = 'N/A'
-                updated_date = 'N/A'
-
-            print(f"\n{i}. [{key}] {summary}")
-            print(f"   Project: {project} | Type: {issue_type} | Priority: {priority}")
-            print(f"   Status: {status} ({status_category}) | Assignee: {assignee_name}")
-            print(f"   Reporter: {reporter_name}")
-            print(f"   Created: {created_date} | Updated: {updated_date}")
+        cols = self._project_rows(issues)
+
+        # Build the whole report and write it once instead of printing line by line
+        out = [f"\n{'='*70}\n{title} (Showing {len(issues)} of {total})\n{'='*70}\n"]
+
+        rows = zip(
+            cols['keys'], cols['summaries'], cols['statuses'], cols['status_categories'],
+            cols['priorities'], cols['issue_types'], cols['projects'], cols['assignees'],
+            cols['reporters'], cols['created'], cols['updated'], cols['labels'], cols['components'],
+            cols['comments'], cols['watchers'], cols['histories'], cols['attachments'],
+        )
+        for i, (key, summary, status, status_category, priority, issue_type, project,
+                assignee_name, reporter_name, created_date, updated_date, labels, components,
+                comments_count, watchers_count, history_count, attachments_count) in enumerate(rows, 1):
+            out.append(f"\n{i}. [{key}] {summary}\n")
+            out.append(f"   Project: {project} | Type: {issue_type} | Priority: {priority}\n")
+            out.append(f"   Status: {status} ({status_category}) | Assignee: {assignee_name}\n")
+            out.append(f"   Reporter: {reporter_name}\n")
+            out.append(f"   Created: {created_date} | Updated: {updated_date}\n")
 
             # Display additional metadata
             if labels:
-                print(f"   Labels: {', '.join(labels[:5])}")
+                out.append(f"   Labels: {', '.join(labels[:5])}\n")
             if components:
-                print(f"   Components: {', '.join(components)}")
+                out.append(f"   Components: {', '.join(components)}\n")
 
-            print(f"   Activity: {comments_count} comments | {history_count} history items | {attachments_count} attachments | {watchers_count} watchers")
-            print(f"   URL: {self.jira_url}/browse/{key}")
+            out.append(f"   Activity: {comments_count} comments | {history_count} history items | {attachments_count} attachments | {watchers_count} watchers\n")
+            out.append(f"   URL: {self.jira_url}/browse/{key}\n")
 
-        print("="*70)
+        out.append("="*70 + "\n")
+        sys.stdout.write(''.join(out))
+        sys.stdout.flush()
 
     def save_to_json(self, data, filename):
         """Save data to JSON file"""
         try:
-            with open(filename, 'w') as f:
-                json.dump(data, f, indent=2)
-            print(f"\n✓ Data saved to {filename}")
+            if orjson is not None:
+                with open(filename, 'wb') as f:
+                    f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+            else:
+                with open(filename, 'w') as f:
+                    json.dump(data, f, indent=2)
+            logger.info("\n✓ Data saved to %s", filename)
         except Exception as e:
-            print(f"\n✗ Error saving to {filename}: {e}")
+            logger.error("\n✗ Error saving to %s: %s", filename, e)
 
 
 def main():
     """Main execution"""
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
     print("="*70)
     print("JIRA USER & TICKETS RETRIEVAL")
     print("="*70)
 
     try:
         # Initialize client
-        client = JiraClient()
-
-        # Get current user
-        print("\n[1/3] Fetching current user details...")
-        user_data = client.get_current_user()
-        if user_data:
-            client.display_user_info(user_data)
-            client.save_to_json(user_data, "jira_user.json")
-
-        # Get assigned/reported issues
-        print("\n[2/3] Fetching assigned/reported issues...")
-        issues = client.get_user_issues(max_results=50)
-        if issues:
-            client.display_issues(issues, "YOUR ISSUES (Assigned/Reported)")
-            client.save_to_json(issues, "jira_issues.json")
-
-        # Get worked on issues
-        print("\n[3/3] Fetching issues you've worked on...")
-        worked_issues = client.get_worked_on_issues(max_results=50)
-        if worked_issues:
-            client.display_issues(worked_issues, "ISSUES YOU'VE WORKED ON")
-            client.save_to_json(worked_issues, "jira_worked_issues.json")
+        with JiraClient() as client:
+            # The three lookups are independent, so run them concurrently over the shared session
+            print("\nFetching user details, assigned/reported issues and worked-on issues...")
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                user_future = executor.submit(client.get_current_user)
+                issues_future = executor.submit(client.get_user_issues, 50)
+                worked_future = executor.submit(client.get_worked_on_issues, 50)
+                user_data = user_future.result()
+                issues = issues_future.result()
+                worked_issues = worked_future.result()
+
+            # Get current user
+            print("\n[1/3] Current user details")
+            if user_data:
+                client.display_user_info(user_data)
+                client.save_to_json(user_data, "jira_user.json")
+
+            # Get assigned/reported issues
+            print("\n[2/3] Assigned/reported issues")
+            if issues:
+                client.display_issues(issues, "YOUR ISSUES (Assigned/Reported)")
+                client.save_to_json(issues, "jira_issues.json")
+
+            # Get worked on issues
+            print("\n[3/3] Issues you've worked on")
+            if worked_issues:
+                client.display_issues(worked_issues, "ISSUES YOU'VE WORKED ON")
+                client.save_to_json(worked_issues, "jira_worked_issues.json")
 
         print("\n" + "="*70)
         print("✓ RETRIEVAL COMPLETED")
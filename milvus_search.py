@@ -0,0 +1,47 @@
+"""
+Milvus Search Helpers
+Search parameters and scores matched to each collection's vector index
+"""
+
+# (collection name, vector field) -> (metric_type, index_type); read from the
+# server once, since an index does not change while its collection exists
+_INDEX_INFO = {}
+
+
+def index_info(collection, field_name="embedding"):
+    """Return (metric_type, index_type) of a collection's vector index
+
+    Collections created before the HNSW/IP default still use IVF_FLAT/L2,
+    which is also assumed when the field has no index yet.
+    """
+    key = (collection.name, field_name)
+    info = _INDEX_INFO.get(key)
+    if info is None:
+        for index in collection.indexes:
+            if index.field_name == field_name:
+                info = (index.params.get("metric_type", "L2"), index.params.get("index_type", "IVF_FLAT"))
+                _INDEX_INFO[key] = info
+                break
+        else:
+            return "L2", "IVF_FLAT"
+    return info
+
+
+def embedding_search_params(collection, top_k, field_name="embedding"):
+    """Return (metric_type, search_params) matching the collection's vector index"""
+    metric_type, index_type = index_info(collection, field_name)
+    if index_type == "HNSW":
+        params = {"ef": max(64, top_k)}
+    else:
+        params = {"nprobe": 10}
+    return metric_type, {"metric_type": metric_type, "params": params}
+
+
+def similarity_score(metric_type, distance):
+    """Turn a search distance into a higher-is-better score
+
+    IP over normalized vectors is cosine; L2 keeps the legacy rescaling.
+    """
+    if metric_type in ("IP", "COSINE"):
+        return round(float(distance), 4)
+    return round(1 / (1 + distance), 4)
@@ -4,13 +4,104 @@ Ollama RAG (Retrieval Augmented Generation) Integration
 Offline AI reasoning with Milvus vector search
 """
 
+import io
+import logging
+import re
 import requests
 import json
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from sentence_transformers import SentenceTransformer
 from pymilvus import connections, Collection, utility
+from milvus_search import embedding_search_params, similarity_score
+
+logger = logging.getLogger(__name__)
+
+# One retrieved document in the RAG prompt context
+CONTEXT_DOC_FORMAT = "Document %d [%s - %s] (Relevance: %s):\nTitle: %s\nContent: %s"
+
+# name -> loaded Collection, kept memory-resident for the life of the process
+_loaded_collections = {}
+_loaded_collections_lock = threading.Lock()
+
+# Embedding model shared by every OllamaRAG instance, loaded on first use
+_embedding_model = None
+_embedding_model_lock = threading.Lock()
+
+
+def get_embedding_model():
+    """Return the process-wide sentence transformer, loading it once"""
+    global _embedding_model
+    with _embedding_model_lock:
+        if _embedding_model is None:
+            logger.info("Loading embedding model...")
+            _embedding_model = SentenceTransformer('all-MiniLM-L6-v2')
+        return _embedding_model
+
+
+@lru_cache(maxsize=128)
+def embed_query(query):
+    """Encode a query once; repeated questions are served from the LRU cache
+
+    Returns a list of floats, the form pymilvus 2.3 packs into search
+    requests fastest. The cached list is shared by every hit, so callers
+    must not modify it.
+    """
+    model = get_embedding_model()
+    return model.encode([query], normalize_embeddings=True, convert_to_numpy=True)[0].tolist()
 
 
 class OllamaRAG:
+    # Seconds to cache utility.list_collections() between queries
+    COLLECTION_LIST_TTL = 60
+
+    # Max characters of retrieved context sent to Ollama per question
+    CONTEXT_CHAR_BUDGET = 16000
+
+    # Seconds to reuse the last check_ollama_status() result
+    STATUS_CACHE_TTL = 10
+
+    # ollama_host -> (checked_at, result), shared by every instance
+    _status_cache = {}
+
+    # Answer prompt, filled with the retrieved context and the question
+    _PROMPT = """You are an expert analyst. Thoroughly analyze the provided context and deliver precise insights.
+
+RETRIEVED CONTEXT:
+{context}
+
+USER QUESTION: {question}
+
+ANALYSIS INSTRUCTIONS:
+1. Read and understand ALL documents carefully
+2. Look for patterns and connections across documents
+3. Extract technical details, configurations, requirements, limitations
+4. Synthesize information from multiple sources
+5. Be direct - no preambles like "Based on the context"
+6. Provide comprehensive, technical, actionable answers
+7. Reference specific features, versions, or compatibility info
+8. If information is partial, state what's known and what's missing
+9. If information is insufficient, suggest checking official documentation
+
+10. CONFIDENCE ASSESSMENT:
+   After your answer, provide your confidence level in the answer's accuracy on a new line:
+   ANSWER_CONFIDENCE: [score from 0.0 to 1.0]
+
+   Guidelines:
+   - 0.9-1.0: Very certain, well-documented
+   - 0.7-0.9: Confident, good information
+   - 0.5-0.7: Moderate confidence
+   - 0.3-0.5: Low confidence
+   - 0.0-0.3: Very uncertain
+
+ANSWER (detailed and technical):"""
+
+    # Trailing confidence marker the prompt asks the model to emit
+    _CONF_RE = re.compile(r'^ANSWER_CONFIDENCE:\s*([0-9.]+)\s*$', re.M)
+
     def __init__(self, ollama_host="http://localhost:11434", model_name="llama3.2"):
         """
         Initialize Ollama RAG system
@@ -21,27 +112,64 @@ class OllamaRAG:
         """
         self.ollama_host = ollama_host
         self.model_name = model_name
-        self.embedding_model = None
         self.milvus_host = "localhost"
         self.milvus_port = "19530"
+        self._milvus_connected = False
+        self._collection_names = None
+        self._collection_names_expiry = 0.0
+        self.ollama_session = requests.Session()
 
     def load_embedding_model(self):
-        """Load sentence transformer for embeddings"""
-        if self.embedding_model is None:
-            print("Loading embedding model...")
-            self.embedding_model = SentenceTransformer('all-MiniLM-L6-v2')
-        return self.embedding_model
+        """Return the sentence transformer shared by all instances"""
+        return get_embedding_model()
+
+    def embed_query(self, query):
+        """Encode a query through the module-level cache (shared across instances)"""
+        return embed_query(query)
 
     def connect_milvus(self):
-        """Connect to Milvus"""
+        """Connect to Milvus (once per instance)"""
+        if self._milvus_connected:
+            return True
         try:
             connections.connect(alias="default", host=self.milvus_host, port=self.milvus_port)
+            self._milvus_connected = True
             return True
         except Exception as e:
-            print(f"Failed to connect to Milvus: {e}")
+            logger.error("Failed to connect to Milvus: %s", e)
             return False
 
-    def search_milvus(self, query, collection_name="jira_tickets", top_k=5):
+    def _ensure_loaded(self, collection_name):
+        """Return a loaded Collection, loading it only on first use in this process"""
+        collection = _loaded_collections.get(collection_name)
+        if collection is None:
+            with _loaded_collections_lock:
+                collection = _loaded_collections.get(collection_name)
+                if collection is None:
+                    collection = Collection(name=collection_name)
+                    collection.load()
+                    _loaded_collections[collection_name] = collection
+        return collection
+
+    def list_collections(self):
+        """List Milvus collections, cached for COLLECTION_LIST_TTL seconds"""
+        now = time.monotonic()
+        if self._collection_names is None or now >= self._collection_names_expiry:
+            self._collection_names = utility.list_collections()
+            self._collection_names_expiry = now + self.COLLECTION_LIST_TTL
+        return self._collection_names
+
+    def close(self):
+        """Close the Ollama session; loaded collections stay resident for other instances"""
+        self.ollama_session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def search_milvus(self, query, collection_name="jira_tickets", top_k=5, query_embedding=None):
         """
         Search Milvus for relevant documents
 
@@ -49,6 +177,7 @@ class OllamaRAG:
             query: User's search query
             collection_name: Milvus collection to search
             top_k: Number of results to return
+            query_embedding: Precomputed query vector (skips encoding)
 
         Returns:
             List of relevant documents
@@ -57,129 +186,146 @@ class OllamaRAG:
             return []
 
         if not utility.has_collection(collection_name):
-            print(f"Collection {collection_name} does not exist")
+            logger.warning("Collection %s does not exist", collection_name)
             return []
 
         try:
-            # Load model and generate embedding
-            model = self.load_embedding_model()
-            query_embedding = model.encode([query]).tolist()
+            if query_embedding is None:
+                query_embedding = self.embed_query(query)
+        except Exception as e:
+            logger.error("Error encoding query: %s", e)
+            return []
+
+        return self._search_collection(collection_name, query_embedding, top_k)
 
-            # Load collection and search
-            collection = Collection(name=collection_name)
-            collection.load()
+    def _search_collection(self, collection_name, query_embedding, top_k=5):
+        """Search one collection with a precomputed query embedding"""
+        try:
+            collection = self._ensure_loaded(collection_name)
 
-            search_params = {"metric_type": "L2", "params": {"nprobe": 10}}
+            metric_type, search_params = embedding_search_params(collection, top_k)
             results = collection.search(
-                data=query_embedding,
+                data=[query_embedding],
                 anns_field="embedding",
                 param=search_params,
                 limit=top_k,
                 output_fields=["source_type", "source_id", "title", "content", "metadata", "url"]
             )
 
-            # Format results
+            # Format results; each hit's row is read once as a plain dict
             documents = []
             for hits in results:
                 for hit in hits:
+                    row = hit.entity.to_dict().get('entity') or {}
                     documents.append({
-                        'title': hit.entity.get('title', ''),
-                        'content': hit.entity.get('content', ''),
-                        'source_id': hit.entity.get('source_id', ''),
-                        'source_type': hit.entity.get('source_type', ''),
-                        'url': hit.entity.get('url', ''),
-                        'score': round(1 / (1 + hit.distance), 4),
+                        'title': row.get('title', ''),
+                        'content': row.get('content', ''),
+                        'source_id': row.get('source_id', ''),
+                        'source_type': row.get('source_type', ''),
+                        'url': row.get('url', ''),
+                        'score': similarity_score(metric_type, hit.distance),
                         'collection': collection_name
                     })
 
-            collection.release()
             return documents
 
         except Exception as e:
-            print(f"Error searching Milvus: {e}")
+            logger.error("Error searching Milvus: %s", e)
             return []
 
-    def search_all_collections(self, query, top_k_per_collection=3):
+    def _search_collection_with_summary(self, collection_name, query_embedding, top_k):
+        """Search one collection for search_all_collections; returns (docs, summary line)"""
+        try:
+            # Check if collection has data
+            collection = self._ensure_loaded(collection_name)
+            num_entities = collection.num_entities
+
+            if num_entities == 0:
+                logger.info("[RAG]   ⚠️  %s: EMPTY (0 documents)", collection_name)
+                return [], f"{collection_name}: EMPTY"
+
+            logger.info("[RAG]   🔎 %s: %d total documents in DB", collection_name, num_entities)
+
+            # Search this collection
+            docs = self._search_collection(collection_name, query_embedding, top_k)
+
+            if docs:
+                logger.info("[RAG]   ✓  %s: Retrieved %d relevant docs", collection_name, len(docs))
+                return docs, f"{collection_name}: {len(docs)} docs"
+
+            logger.info("[RAG]   ⚠️  %s: 0 relevant docs found", collection_name)
+            return docs, f"{collection_name}: 0 relevant"
+
+        except Exception as e:
+            logger.error("[RAG]   ❌ %s: Error - %s", collection_name, e)
+            return [], f"{collection_name}: ERROR"
+
+    def search_all_collections(self, query, top_k_per_collection=3, query_embedding=None):
         """
         Search across ALL collections for comprehensive context
 
         Args:
             query: User's search query
             top_k_per_collection: Number of results per collection
+            query_embedding: Precomputed query vector (skips encoding)
 
         Returns:
             List of relevant documents from all sources
         """
         if not self.connect_milvus():
-            print("[RAG] ❌ Failed to connect to Milvus")
+            logger.error("[RAG] ❌ Failed to connect to Milvus")
             return []
 
         # Get all available collections
-        all_collections = utility.list_collections()
-        print(f"\n[RAG] 🔍 Searching {len(all_collections)} collections: {all_collections}")
-        print(f"[RAG] Retrieving top {top_k_per_collection} documents per collection\n")
+        all_collections = self.list_collections()
+        logger.info("\n[RAG] 🔍 Searching %d collections: %s", len(all_collections), all_collections)
+        logger.info("[RAG] Retrieving top %d documents per collection\n", top_k_per_collection)
+
+        # Encode the query once and reuse it for every collection
+        try:
+            if query_embedding is None:
+                query_embedding = self.embed_query(query)
+        except Exception as e:
+            logger.error("[RAG] ❌ Failed to encode query: %s", e)
+            return []
 
         all_documents = []
         search_summary = []
 
-        for collection_name in all_collections:
-            try:
-                # Check if collection has data
-                collection = Collection(name=collection_name)
-                collection.load()
-                num_entities = collection.num_entities
-
-                if num_entities == 0:
-                    print(f"[RAG]   ⚠️  {collection_name}: EMPTY (0 documents)")
-                    search_summary.append(f"{collection_name}: EMPTY")
-                    collection.release()
-                    continue
-
-                print(f"[RAG]   🔎 {collection_name}: {num_entities} total documents in DB")
-
-                # Search this collection
-                docs = self.search_milvus(query, collection_name, top_k_per_collection)
-                all_documents.extend(docs)
-
-                if docs:
-                    print(f"[RAG]   ✓  {collection_name}: Retrieved {len(docs)} relevant docs")
-                    search_summary.append(f"{collection_name}: {len(docs)} docs")
-                else:
-                    print(f"[RAG]   ⚠️  {collection_name}: 0 relevant docs found")
-                    search_summary.append(f"{collection_name}: 0 relevant")
-
-            except Exception as e:
-                print(f"[RAG]   ❌ {collection_name}: Error - {e}")
-                search_summary.append(f"{collection_name}: ERROR")
-                continue
-
-        # Ensure diversity: Interleave documents from different collections
-        # Group documents by collection
-        from collections import defaultdict
+        # Collections are independent, so search them concurrently
+        if all_collections:
+            with ThreadPoolExecutor(max_workers=min(16, len(all_collections))) as executor:
+                results = executor.map(
+                    lambda name: self._search_collection_with_summary(name, query_embedding, top_k_per_collection),
+                    all_collections
+                )
+                for docs, summary in results:
+                    all_documents.extend(docs)
+                    search_summary.append(summary)
+
+        # Ensure diversity: interleave documents round-robin across collections,
+        # i.e. order by (rank within its collection, collection name)
         docs_by_collection = defaultdict(list)
         for doc in all_documents:
             docs_by_collection[doc['collection']].append(doc)
 
-        # Sort each collection's docs by relevance
-        for coll in docs_by_collection:
-            docs_by_collection[coll].sort(key=lambda x: x['score'], reverse=True)
+        ranked = []
+        for coll_name, docs in docs_by_collection.items():
+            docs.sort(key=lambda x: x['score'], reverse=True)
+            ranked.extend((rank, coll_name, doc) for rank, doc in enumerate(docs))
 
-        # Interleave documents to ensure diversity
-        diverse_documents = []
-        max_docs = max(len(docs) for docs in docs_by_collection.values()) if docs_by_collection else 0
+        ranked.sort(key=lambda item: (item[0], item[1]))
+        diverse_documents = [doc for _, _, doc in ranked]
 
-        for i in range(max_docs):
-            for coll_name in sorted(docs_by_collection.keys()):
-                if i < len(docs_by_collection[coll_name]):
-                    diverse_documents.append(docs_by_collection[coll_name][i])
-
-        print(f"\n[RAG] {'='*70}")
-        print(f"[RAG] SEARCH SUMMARY:")
-        for summary in search_summary:
-            print(f"[RAG]   - {summary}")
-        print(f"[RAG] TOTAL RETRIEVED: {len(diverse_documents)} documents across all collections")
-        print(f"[RAG] DIVERSE ORDERING: Interleaved from all sources for balanced context")
-        print(f"[RAG] {'='*70}\n")
+        if logger.isEnabledFor(logging.INFO):
+            rule = '=' * 70
+            logger.info("\n[RAG] %s", rule)
+            logger.info("[RAG] SEARCH SUMMARY:")
+            for summary in search_summary:
+                logger.info("[RAG]   - %s", summary)
+            logger.info("[RAG] TOTAL RETRIEVED: %d documents across all collections", len(diverse_documents))
+            logger.info("[RAG] DIVERSE ORDERING: Interleaved from all sources for balanced context")
+            logger.info("[RAG] %s\n", rule)
 
         return diverse_documents
 
@@ -192,34 +338,37 @@ class OllamaRAG:
             stream: Whether to stream the response
 
         Returns:
-            Response from Ollama
+            Response text from Ollama, or a generator of text chunks if stream=True
         """
+        if stream:
+            return self._stream_ollama(prompt)
+
+        # Always stream from Ollama; chunks are joined once at the end
+        try:
+            return ''.join(self._stream_ollama(prompt)) or 'No response from Ollama'
+        except requests.exceptions.ConnectionError:
+            return "Error: Cannot connect to Ollama. Make sure Ollama is running (ollama serve)"
+        except Exception as e:
+            return f"Error: {str(e)}"
+
+    def _stream_ollama(self, prompt):
+        """Yield response chunks from Ollama's NDJSON stream over the keep-alive session"""
         url = f"{self.ollama_host}/api/generate"
 
         payload = {
             "model": self.model_name,
             "prompt": prompt,
-            "stream": stream
+            "stream": True
         }
 
-        try:
-            response = requests.post(url, json=payload)
+        with self.ollama_session.post(url, json=payload, stream=True) as response:
             response.raise_for_status()
-
-            if stream:
-                # Return generator for streaming
-                for line in response.iter_lines():
-                    if line:
-                        data = json.loads(line)
-                        yield data.get('response', '')
-            else:
-                data = response.json()
-                return data.get('response', 'No response from Ollama')
-
-        except requests.exceptions.ConnectionError:
-            return "Error: Cannot connect to Ollama. Make sure Ollama is running (ollama serve)"
-        except Exception as e:
-            return f"Error: {str(e)}"
+            for line in response.iter_lines(decode_unicode=True):
+                if line:
+                    data = json.loads(line)
+                    yield data.get('response', '')
+                    if data.get('done'):
+                        break
 
     def calculate_confidence(self, sources, num_documents):
         """
@@ -281,7 +430,27 @@ class OllamaRAG:
             }
         }
 
-    def query_with_context(self, question, collection_name="jira_tickets", top_k=3):
+    def batch_query_with_context(self, questions, collection_name="jira_tickets", top_k=3):
+        """
+        Answer several questions, encoding all of them in one batched forward pass
+
+        Args:
+            questions: List of user questions
+            collection_name: Milvus collection to search (use "all" for all collections)
+            top_k: Number of documents to retrieve per question
+
+        Returns:
+            List of result dicts (see query_with_context), in question order
+        """
+        model = self.load_embedding_model()
+        embeddings = model.encode(questions, batch_size=32, convert_to_numpy=True, normalize_embeddings=True)
+
+        return [
+            self.query_with_context(question, collection_name, top_k, query_embedding=embedding.tolist())
+            for question, embedding in zip(questions, embeddings)
+        ]
+
+    def query_with_context(self, question, collection_name="jira_tickets", top_k=3, query_embedding=None):
         """
         Answer question using RAG (Retrieval Augmented Generation)
 
@@ -289,23 +458,24 @@ class OllamaRAG:
             question: User's question
             collection_name: Milvus collection to search (use "all" for all collections)
             top_k: Number of documents to retrieve
+            query_embedding: Precomputed question vector (see batch_query_with_context)
 
         Returns:
             dict with answer and sources
         """
-        print(f"\n[RAG] Question: {question}")
+        logger.info("\n[RAG] Question: %s", question)
 
         # Increase retrieval for better analysis
         enhanced_top_k = max(top_k, 7)  # Minimum 7 documents per collection
-        print(f"[RAG] Enhanced retrieval: {enhanced_top_k} documents per source")
+        logger.info("[RAG] Enhanced retrieval: %d documents per source", enhanced_top_k)
 
         # Step 1: Retrieve relevant documents
         if collection_name == "all" or collection_name == "all_collections":
-            print(f"[RAG] Searching ALL collections...")
-            documents = self.search_all_collections(question, top_k_per_collection=enhanced_top_k)
+            logger.info("[RAG] Searching ALL collections...")
+            documents = self.search_all_collections(question, top_k_per_collection=enhanced_top_k, query_embedding=query_embedding)
         else:
-            print(f"[RAG] Searching {collection_name}...")
-            documents = self.search_milvus(question, collection_name, enhanced_top_k)
+            logger.info("[RAG] Searching %s...", collection_name)
+            documents = self.search_milvus(question, collection_name, enhanced_top_k, query_embedding=query_embedding)
 
         if not documents:
             return {
@@ -313,66 +483,44 @@ class OllamaRAG:
                 'sources': []
             }
 
-        print(f"[RAG] Found {len(documents)} relevant documents")
+        logger.info("[RAG] Found %d relevant documents", len(documents))
 
-        # Step 2: Build context from retrieved documents
-        context_parts = []
+        # Step 2: Build context from retrieved documents, stopping at the budget
+        buf = io.StringIO()
         for i, doc in enumerate(documents):
-            source_label = f"{doc.get('collection', 'unknown')} - {doc.get('source_type', 'unknown')}"
-            context_parts.append(
-                f"Document {i+1} [{source_label}] (Relevance: {doc['score']}):\n"
-                f"Title: {doc['title']}\n"
-                f"Content: {doc['content'][:1000]}"
+            chunk = CONTEXT_DOC_FORMAT % (
+                i + 1,
+                doc.get('collection', 'unknown'),
+                doc.get('source_type', 'unknown'),
+                doc['score'],
+                doc['title'],
+                doc['content'][:1000]
             )
-        context = "\n\n".join(context_parts)
+            separator = "\n\n" if i else ""
+            if buf.tell() + len(separator) + len(chunk) > self.CONTEXT_CHAR_BUDGET:
+                logger.info("[RAG] Context budget reached, using %d of %d documents", i, len(documents))
+                break
+            buf.write(separator)
+            buf.write(chunk)
+        context = buf.getvalue()
 
         # Step 3: Build prompt for Ollama
-        prompt = f"""You are an expert analyst. Thoroughly analyze the provided context and deliver precise insights.
+        prompt = self._PROMPT.format(context=context, question=question)
 
-RETRIEVED CONTEXT:
-{context}
-
-USER QUESTION: {question}
-
-ANALYSIS INSTRUCTIONS:
-1. Read and understand ALL documents carefully
-2. Look for patterns and connections across documents
-3. Extract technical details, configurations, requirements, limitations
-4. Synthesize information from multiple sources
-5. Be direct - no preambles like "Based on the context"
-6. Provide comprehensive, technical, actionable answers
-7. Reference specific features, versions, or compatibility info
-8. If information is partial, state what's known and what's missing
-9. If information is insufficient, suggest checking official documentation
-
-10. CONFIDENCE ASSESSMENT:
-   After your answer, provide your confidence level in the answer's accuracy on a new line:
-   ANSWER_CONFIDENCE: [score from 0.0 to 1.0]
-
-   Guidelines:
-   - 0.9-1.0: Very certain, well-documented
-   - 0.7-0.9: Confident, good information
-   - 0.5-0.7: Moderate confidence
-   - 0.3-0.5: Low confidence
-   - 0.0-0.3: Very uncertain
-
-ANSWER (detailed and technical):"""
-
-        print("[RAG] Sending to Ollama for reasoning...")
+        logger.info("[RAG] Sending to Ollama for reasoning...")
 
         # Step 4: Get answer from Ollama
         answer = self.ask_ollama(prompt, stream=False)
 
         # Extract answer confidence if provided
         answer_confidence_score = None
-        if "ANSWER_CONFIDENCE:" in answer:
+        match = self._CONF_RE.search(answer)
+        if match:
             try:
-                confidence_line = [line for line in answer.split('\n') if 'ANSWER_CONFIDENCE:' in line][0]
-                confidence_str = confidence_line.split('ANSWER_CONFIDENCE:')[1].strip()
-                answer_confidence_score = float(confidence_str)
-                answer = answer.replace(confidence_line, '').strip()
-                print(f"[RAG] Answer Confidence: {answer_confidence_score:.2f}")
-            except:
+                answer_confidence_score = float(match.group(1))
+                answer = self._CONF_RE.sub('', answer).strip()
+                logger.info("[RAG] Answer Confidence: %.2f", answer_confidence_score)
+            except ValueError:
                 pass
 
         # Calculate source confidence (retrieval quality)
@@ -412,19 +560,29 @@ ANSWER (detailed and technical):"""
         }
 
     def check_ollama_status(self):
-        """Check if Ollama is running and available"""
+        """Check if Ollama is running and available (cached for STATUS_CACHE_TTL seconds)"""
+        now = time.monotonic()
+        checked_at, status = self._status_cache.get(self.ollama_host, (float('-inf'), None))
+        if now - checked_at < self.STATUS_CACHE_TTL:
+            return status
+
         try:
-            response = requests.get(f"{self.ollama_host}/api/tags", timeout=5)
+            response = self.ollama_session.get(f"{self.ollama_host}/api/tags", timeout=5)
             if response.status_code == 200:
                 models = response.json().get('models', [])
-                return True, [m['name'] for m in models]
-            return False, []
-        except:
-            return False, []
+                status = (True, [m['name'] for m in models])
+            else:
+                status = (False, [])
+        except (requests.exceptions.RequestException, ValueError):
+            status = (False, [])
+
+        self._status_cache[self.ollama_host] = (now, status)
+        return status
 
 
 def main():
     """Example usage"""
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
     print("="*70)
     print("OLLAMA RAG SYSTEM - Offline AI with Milvus")
     print("="*70)
@@ -454,10 +612,10 @@ def main():
         "What security training tasks were completed?"
     ]
 
-    for question in questions:
-        print("\n" + "="*70)
-        result = rag.query_with_context(question, collection_name="jira_tickets", top_k=3)
+    results = rag.batch_query_with_context(questions, collection_name="jira_tickets", top_k=3)
 
+    for question, result in zip(questions, results):
+        print("\n" + "="*70)
         print(f"\nQuestion: {question}")
         print(f"\nAnswer ({result['model']}):")
         print(result['answer'])
@@ -0,0 +1,13 @@
+"""
+PDF Text Extraction Worker
+Runs in the web interface's spawned worker processes, so it imports only PyPDF2
+"""
+
+import PyPDF2
+
+
+def extract_pdf_pages(filepath, start=0, stop=None):
+    """Extract text from pages [start, stop) of a PDF"""
+    with open(filepath, 'rb') as file:
+        reader = PyPDF2.PdfReader(file)
+        return "".join([page.extract_text() + "\n" for page in reader.pages[start:stop]])
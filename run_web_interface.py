@@ -0,0 +1,12 @@
+#!/usr/bin/env python3
+"""
+Optus Data Management Web Interface Launcher
+Starts the Flask server from a script with no heavy imports of its own
+"""
+
+# Spawned PDF workers re-run the main script before unpickling their task, so
+# keeping it this small means they load PyPDF2 rather than torch, pymilvus and
+# the web interface's background threads
+if __name__ == '__main__':
+    from web_interface import main
+    main()
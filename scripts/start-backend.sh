@@ -28,4 +28,4 @@ fi
 echo ""
 echo "Starting backend on http://localhost:5000"
 echo "========================================"
-python3 web_interface.py
+python3 run_web_interface.py
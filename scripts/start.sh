@@ -18,7 +18,7 @@ echo "2. Starting Flask backend..."
 cd "$(dirname "$0")/.."
 source venv/bin/activate 2>/dev/null || python3 -m venv venv && source venv/bin/activate
 pip install -q -r requirements.txt
-python3 web_interface.py &
+python3 run_web_interface.py &
 BACKEND_PID=$!
 echo "   ✓ Backend started (PID: $BACKEND_PID)"
 echo ""
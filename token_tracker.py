@@ -4,41 +4,282 @@ Tracks all API calls with detailed metrics for auditing and cost analysis
 """
 
 import sqlite3
-from datetime import datetime
+from datetime import datetime, timedelta
 import json
 import os
+import queue
+import threading
+import time
+import atexit
+from contextlib import contextmanager
+from pathlib import Path
+
+_INSERT_USAGE_SQL = '''
+    INSERT INTO token_usage
+    (timestamp, model, question, collection, input_tokens, output_tokens,
+     total_tokens, cost_usd, documents_retrieved, response_time_ms, session_id, success, timestamp_ns)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+# (input, output) USD per token, i.e. the per-MTok list price / 1e6
+_PRICING_PER_TOKEN = {
+    'claude-sonnet-4-5': (3.0e-6, 15.0e-6),
+    'claude-opus-4': (15.0e-6, 75.0e-6),
+    'claude-haiku-4': (0.25e-6, 1.25e-6),
+}
+_DEFAULT_PRICING = _PRICING_PER_TOKEN['claude-sonnet-4-5']
+
+
+def _rate_case_sql(index):
+    """SQL CASE mapping the model column to its per-token rate (0=input, 1=output)"""
+    whens = ' '.join(f"WHEN '{model}' THEN {rates[index]!r}" for model, rates in _PRICING_PER_TOKEN.items())
+    return f"CASE model {whens} ELSE {_DEFAULT_PRICING[index]!r} END"
+
+
+# Cost of a rollup row at current prices, computed inside SQLite
+_COMPUTED_COST_SQL = f"input_tokens * ({_rate_case_sql(0)}) + output_tokens * ({_rate_case_sql(1)})"
+
+# Adds one write batch's per-(day, model, collection) totals into the rollup
+_UPSERT_DAILY_SQL = '''
+    INSERT INTO token_usage_daily
+    (date, model, collection, requests, input_tokens, output_tokens, total_tokens,
+     cost_usd, documents_retrieved, response_time_ms, successful_requests, failed_requests)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(date, model, collection) DO UPDATE SET
+        requests = requests + excluded.requests,
+        input_tokens = input_tokens + excluded.input_tokens,
+        output_tokens = output_tokens + excluded.output_tokens,
+        total_tokens = total_tokens + excluded.total_tokens,
+        cost_usd = cost_usd + excluded.cost_usd,
+        documents_retrieved = documents_retrieved + excluded.documents_retrieved,
+        response_time_ms = response_time_ms + excluded.response_time_ms,
+        successful_requests = successful_requests + excluded.successful_requests,
+        failed_requests = failed_requests + excluded.failed_requests
+'''
+
+
+# Report queries are fixed strings with a bound lower limit, so sqlite3's
+# statement cache reuses the compiled statements across calls. Raw rows are
+# bounded on the integer timestamp_ns column, the rollup on its date; bounds
+# of 0 and '' match every row for period='all'.
+_SUMMARY_SQL = '''
+    SELECT
+        COALESCE(SUM(requests), 0) as total_requests,
+        SUM(input_tokens) as total_input_tokens,
+        SUM(output_tokens) as total_output_tokens,
+        SUM(total_tokens) as total_tokens,
+        SUM(cost_usd) as total_cost,
+        SUM(documents_retrieved) as total_documents,
+        SUM(response_time_ms) * 1.0 / SUM(requests) as avg_response_time,
+        SUM(successful_requests) as successful_requests,
+        SUM(failed_requests) as failed_requests
+    FROM token_usage_daily
+    WHERE date >= ?
+'''
+
+_RECENT_SQL = '''
+    SELECT *
+    FROM token_usage
+    WHERE timestamp_ns >= ?
+    ORDER BY timestamp_ns DESC
+    LIMIT ?
+'''
+
+_MODEL_BREAKDOWN_SQL = f'''
+    SELECT
+        model,
+        SUM(requests) as requests,
+        SUM(total_tokens) as tokens,
+        SUM(input_tokens) as input_tokens,
+        SUM(output_tokens) as output_tokens,
+        SUM(cost_usd) as cost,
+        SUM({_COMPUTED_COST_SQL}) as computed_cost,
+        SUM(response_time_ms) * 1.0 / SUM(requests) as avg_response_time
+    FROM token_usage_daily
+    WHERE date >= ?
+    GROUP BY model
+'''
+
+_COLLECTION_BREAKDOWN_SQL = f'''
+    SELECT
+        collection,
+        SUM(requests) as requests,
+        SUM(total_tokens) as tokens,
+        SUM(input_tokens) as input_tokens,
+        SUM(output_tokens) as output_tokens,
+        SUM(cost_usd) as cost,
+        SUM({_COMPUTED_COST_SQL}) as computed_cost,
+        SUM(response_time_ms) * 1.0 / SUM(requests) as avg_response_time
+    FROM token_usage_daily
+    WHERE date >= ?
+    GROUP BY collection
+'''
+
+_DAILY_COSTS_SQL = '''
+    SELECT
+        date,
+        SUM(requests) as requests,
+        SUM(total_tokens) as tokens,
+        SUM(cost_usd) as cost
+    FROM token_usage_daily
+    WHERE date >= ?
+    GROUP BY date
+    ORDER BY date DESC
+'''
+
+_EXPORT_SQL = '''
+    SELECT * FROM token_usage
+    WHERE timestamp_ns >= ?
+    ORDER BY timestamp_ns DESC
+'''
+
+# Lookback per reporting period; 'today' starts at local midnight
+_PERIOD_DAYS = {'week': 7, 'month': 30}
+
 
 class TokenTracker:
+    # Write-behind batching: commit after this many rows or this many seconds
+    WRITE_BATCH_SIZE = 100
+    WRITE_BATCH_INTERVAL = 0.2
+    # Max seconds flush() waits for the writer before reading what is on disk
+    FLUSH_TIMEOUT = 10
+
+    # Rows fetched per round trip when streaming a CSV export
+    EXPORT_BATCH_SIZE = 1000
+
+    # Read-only connections pooled for the reporting methods
+    READER_POOL_SIZE = 4
+
     def __init__(self, db_path="token_usage.db"):
         self.db_path = db_path
+        self._lock = threading.RLock()
         self.init_database()
 
+        # track_usage only enqueues; a background thread batches rows into SQLite
+        self._queue = queue.Queue()
+        self._writer = threading.Thread(target=self._writer_loop, name="TokenTrackerWriter", daemon=True)
+        self._writer.start()
+        atexit.register(self.flush)
+
+    def _connect(self, check_same_thread=True):
+        """Open a connection in WAL mode with the tracker's pragmas applied"""
+        conn = sqlite3.connect(self.db_path, check_same_thread=check_same_thread)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-64000")
+        return conn
+
+    def _connect_reader(self):
+        """Open a read-only, memory-mapped connection for reporting queries"""
+        uri = Path(self.db_path).resolve().as_uri() + "?mode=ro"
+        conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA query_only=1")
+        conn.execute("PRAGMA mmap_size=268435456")
+        conn.execute("PRAGMA cache_size=-64000")
+        return conn
+
+    @contextmanager
+    def _reader(self):
+        """Check a read-only connection out of the pool for the duration of a report"""
+        conn = self._reader_pool.get()
+        try:
+            yield conn
+        finally:
+            self._reader_pool.put(conn)
+
     def init_database(self):
         """Initialize SQLite database for token tracking"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS token_usage (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                timestamp TEXT NOT NULL,
-                model TEXT NOT NULL,
-                question TEXT NOT NULL,
-                collection TEXT NOT NULL,
-                input_tokens INTEGER NOT NULL,
-                output_tokens INTEGER NOT NULL,
-                total_tokens INTEGER NOT NULL,
-                cost_usd REAL NOT NULL,
-                documents_retrieved INTEGER NOT NULL,
-                response_time_ms INTEGER NOT NULL,
-                user_id TEXT DEFAULT 'default',
-                session_id TEXT,
-                success BOOLEAN DEFAULT 1
-            )
-        ''')
+        # One long-lived read-write connection for schema setup and cleanup, under self._lock
+        self._conn = self._connect(check_same_thread=False)
+
+        with self._lock, self._conn:
+            self._conn.execute('''
+                CREATE TABLE IF NOT EXISTS token_usage (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    timestamp TEXT NOT NULL,
+                    model TEXT NOT NULL,
+                    question TEXT NOT NULL,
+                    collection TEXT NOT NULL,
+                    input_tokens INTEGER NOT NULL,
+                    output_tokens INTEGER NOT NULL,
+                    total_tokens INTEGER NOT NULL,
+                    cost_usd REAL NOT NULL,
+                    documents_retrieved INTEGER NOT NULL,
+                    response_time_ms INTEGER NOT NULL,
+                    user_id TEXT DEFAULT 'default',
+                    session_id TEXT,
+                    success BOOLEAN DEFAULT 1,
+                    timestamp_ns INTEGER
+                )
+            ''')
+
+            # Databases created before timestamp_ns: add it and backfill from the local ISO timestamp
+            columns = {row['name'] for row in self._conn.execute("PRAGMA table_info(token_usage)")}
+            if 'timestamp_ns' not in columns:
+                self._conn.execute("ALTER TABLE token_usage ADD COLUMN timestamp_ns INTEGER")
+                self._conn.execute(
+                    "UPDATE token_usage SET timestamp_ns = "
+                    "CAST(strftime('%s', timestamp, 'utc') AS INTEGER) * 1000000000"
+                )
+
+            # Pre-aggregated per-day totals; the aggregate reports read this instead of raw rows
+            has_rollup = self._conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'token_usage_daily'"
+            ).fetchone()
+            self._conn.execute('''
+                CREATE TABLE IF NOT EXISTS token_usage_daily (
+                    date TEXT NOT NULL,
+                    model TEXT NOT NULL,
+                    collection TEXT NOT NULL,
+                    requests INTEGER NOT NULL,
+                    input_tokens INTEGER NOT NULL,
+                    output_tokens INTEGER NOT NULL,
+                    total_tokens INTEGER NOT NULL,
+                    cost_usd REAL NOT NULL,
+                    documents_retrieved INTEGER NOT NULL,
+                    response_time_ms INTEGER NOT NULL,
+                    successful_requests INTEGER NOT NULL,
+                    failed_requests INTEGER NOT NULL,
+                    PRIMARY KEY (date, model, collection)
+                )
+            ''')
+            if not has_rollup:
+                # Backfill from rows tracked before the rollup existed
+                self._conn.execute('''
+                    INSERT INTO token_usage_daily
+                    SELECT
+                        substr(timestamp, 1, 10), model, collection,
+                        COUNT(*), SUM(input_tokens), SUM(output_tokens), SUM(total_tokens),
+                        SUM(cost_usd), SUM(documents_retrieved), SUM(response_time_ms),
+                        SUM(CASE WHEN success = 1 THEN 1 ELSE 0 END),
+                        SUM(CASE WHEN success = 0 THEN 1 ELSE 0 END)
+                    FROM token_usage
+                    GROUP BY substr(timestamp, 1, 10), model, collection
+                ''')
+
+            # Raw-row reads range over timestamp_ns; aggregates come from the rollup,
+            # so the earlier indexes on the text timestamp are no longer used
+            self._conn.execute("DROP INDEX IF EXISTS idx_tu_ts")
+            self._conn.execute("DROP INDEX IF EXISTS idx_tu_ts_model")
+            self._conn.execute("DROP INDEX IF EXISTS idx_tu_ts_collection")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_tu_ts_ns ON token_usage(timestamp_ns)")
+
+        # Gather planner statistics once; afterwards let SQLite refresh them when stale
+        with self._lock:
+            has_stats = self._conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'"
+            ).fetchone()
+            self._conn.execute("PRAGMA optimize" if has_stats else "ANALYZE")
+            self._conn.commit()
+
+        # Reporting runs on read-only connections; under WAL they never block the writer
+        self._reader_pool = queue.Queue()
+        for _ in range(self.READER_POOL_SIZE):
+            self._reader_pool.put(self._connect_reader())
 
-        conn.commit()
-        conn.close()
         print(f"[TokenTracker] Database initialized: {self.db_path}")
 
     def track_usage(self, model, question, collection, input_tokens, output_tokens,
@@ -60,16 +301,9 @@ class TokenTracker:
         total_tokens = input_tokens + output_tokens
         cost = self.calculate_cost(model, input_tokens, output_tokens)
 
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        cursor.execute('''
-            INSERT INTO token_usage
-            (timestamp, model, question, collection, input_tokens, output_tokens,
-             total_tokens, cost_usd, documents_retrieved, response_time_ms, session_id, success)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            datetime.now().isoformat(),
+        # Only a cheap integer clock read here; the writer thread formats the timestamp
+        self._queue.put((
+            time.time_ns(),
             model,
             question[:500],  # Truncate long questions
             collection,
@@ -83,9 +317,6 @@ class TokenTracker:
             success
         ))
 
-        conn.commit()
-        conn.close()
-
         print(f"[TokenTracker] Tracked: {total_tokens} tokens, ${cost:.4f}")
         return {
             'total_tokens': total_tokens,
@@ -94,6 +325,77 @@ class TokenTracker:
             'cost': cost
         }
 
+    def _writer_loop(self):
+        """Drain the queue, inserting rows in batches with one commit per batch"""
+        # The writer has its own connection; under WAL it never blocks the readers.
+        # It is (re)opened per batch until it succeeds so a failure never kills the thread.
+        conn = None
+        while True:
+            rows = [self._queue.get()]
+            deadline = time.monotonic() + self.WRITE_BATCH_INTERVAL
+            while len(rows) < self.WRITE_BATCH_SIZE:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    rows.append(self._queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+
+            try:
+                if conn is None:
+                    conn = self._connect()
+                rows = [self._stamp(row) for row in rows]
+                with conn:
+                    conn.executemany(_INSERT_USAGE_SQL, rows)
+                    conn.executemany(_UPSERT_DAILY_SQL, self._daily_totals(rows))
+            except Exception as e:
+                print(f"[TokenTracker] Error writing {len(rows)} records: {e}")
+            finally:
+                for _ in rows:
+                    self._queue.task_done()
+
+    @staticmethod
+    def _stamp(row):
+        """Turn a queued row (timestamp_ns first) into insert order with the local ISO timestamp"""
+        timestamp_ns = row[0]
+        timestamp = datetime.fromtimestamp(timestamp_ns / 1e9).isoformat()
+        return (timestamp,) + row[1:] + (timestamp_ns,)
+
+    @staticmethod
+    def _daily_totals(rows):
+        """Sum stamped usage rows per (day, model, collection) for the rollup upsert"""
+        totals = {}
+        for (timestamp, model, _question, collection, input_tokens, output_tokens, total_tokens,
+             cost, documents_retrieved, response_time_ms, _session_id, success, _timestamp_ns) in rows:
+            key = (timestamp[:10], model, collection)
+            agg = totals.get(key)
+            if agg is None:
+                agg = totals[key] = [0] * 9
+            agg[0] += 1
+            agg[1] += input_tokens
+            agg[2] += output_tokens
+            agg[3] += total_tokens
+            agg[4] += cost
+            agg[5] += documents_retrieved
+            agg[6] += response_time_ms
+            agg[7 if success else 8] += 1
+        return [key + tuple(agg) for key, agg in totals.items()]
+
+    def flush(self, timeout=None):
+        """Block until every tracked record has been written to the database
+
+        Waits at most timeout seconds (FLUSH_TIMEOUT by default); returns
+        False if records were still pending when it gave up.
+        """
+        if timeout is None:
+            timeout = self.FLUSH_TIMEOUT
+        with self._queue.all_tasks_done:
+            flushed = self._queue.all_tasks_done.wait_for(lambda: not self._queue.unfinished_tasks, timeout)
+        if not flushed:
+            print(f"[TokenTracker] Flush timed out with {self._queue.unfinished_tasks} records pending")
+        return flushed
+
     def calculate_cost(self, model, input_tokens, output_tokens):
         """
         Calculate cost based on Claude pricing
@@ -103,19 +405,21 @@ class TokenTracker:
         - Claude Opus: $15 per MTok input, $75 per MTok output
         - Claude Haiku: $0.25 per MTok input, $1.25 per MTok output
         """
-        pricing = {
-            'claude-sonnet-4-5': {'input': 3.0, 'output': 15.0},
-            'claude-opus-4': {'input': 15.0, 'output': 75.0},
-            'claude-haiku-4': {'input': 0.25, 'output': 1.25},
-        }
-
         # Default to Sonnet pricing if model not found
-        rates = pricing.get(model, pricing['claude-sonnet-4-5'])
-
-        input_cost = (input_tokens / 1_000_000) * rates['input']
-        output_cost = (output_tokens / 1_000_000) * rates['output']
+        input_rate, output_rate = _PRICING_PER_TOKEN.get(model, _DEFAULT_PRICING)
+        return input_tokens * input_rate + output_tokens * output_rate
 
-        return input_cost + output_cost
+    @staticmethod
+    def _period_bounds(period):
+        """Return (timestamp_ns_bound, date_bound) lower limits for a reporting period"""
+        now = datetime.now()
+        if period == 'today':
+            start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        elif period in _PERIOD_DAYS:
+            start = now - timedelta(days=_PERIOD_DAYS[period])
+        else:
+            return 0, ''
+        return int(start.timestamp() * 1e9), start.date().isoformat()
 
     def get_usage_stats(self, period='all', limit=100):
         """
@@ -128,73 +432,29 @@ class TokenTracker:
         Returns:
             dict with statistics and recent queries
         """
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
+        self.flush()
 
-        # Build time filter
-        time_filter = ""
-        if period == 'today':
-            time_filter = "WHERE date(timestamp) = date('now')"
-        elif period == 'week':
-            time_filter = "WHERE timestamp >= datetime('now', '-7 days')"
-        elif period == 'month':
-            time_filter = "WHERE timestamp >= datetime('now', '-30 days')"
-
-        # Get summary stats
-        cursor.execute(f'''
-            SELECT
-                COUNT(*) as total_requests,
-                SUM(input_tokens) as total_input_tokens,
-                SUM(output_tokens) as total_output_tokens,
-                SUM(total_tokens) as total_tokens,
-                SUM(cost_usd) as total_cost,
-                SUM(documents_retrieved) as total_documents,
-                AVG(response_time_ms) as avg_response_time,
-                SUM(CASE WHEN success = 1 THEN 1 ELSE 0 END) as successful_requests,
-                SUM(CASE WHEN success = 0 THEN 1 ELSE 0 END) as failed_requests
-            FROM token_usage
-            {time_filter}
-        ''')
-        stats = dict(cursor.fetchone())
-
-        # Get recent queries
-        cursor.execute(f'''
-            SELECT *
-            FROM token_usage
-            {time_filter}
-            ORDER BY timestamp DESC
-            LIMIT ?
-        ''', (limit,))
-        recent_queries = [dict(row) for row in cursor.fetchall()]
-
-        # Get breakdown by model
-        cursor.execute(f'''
-            SELECT
-                model,
-                COUNT(*) as requests,
-                SUM(total_tokens) as tokens,
-                SUM(cost_usd) as cost
-            FROM token_usage
-            {time_filter}
-            GROUP BY model
-        ''')
-        model_breakdown = [dict(row) for row in cursor.fetchall()]
-
-        # Get breakdown by collection
-        cursor.execute(f'''
-            SELECT
-                collection,
-                COUNT(*) as requests,
-                SUM(total_tokens) as tokens,
-                SUM(cost_usd) as cost
-            FROM token_usage
-            {time_filter}
-            GROUP BY collection
-        ''')
-        collection_breakdown = [dict(row) for row in cursor.fetchall()]
-
-        conn.close()
+        # Raw rows are bounded by timestamp_ns, the daily aggregates by date
+        ts_bound, date_bound = self._period_bounds(period)
+
+        with self._reader() as conn:
+            cursor = conn.cursor()
+
+            # Get summary stats
+            cursor.execute(_SUMMARY_SQL, (date_bound,))
+            stats = dict(cursor.fetchone())
+
+            # Get recent queries
+            cursor.execute(_RECENT_SQL, (ts_bound, limit))
+            recent_queries = [dict(row) for row in cursor.fetchall()]
+
+            # Get breakdown by model
+            cursor.execute(_MODEL_BREAKDOWN_SQL, (date_bound,))
+            model_breakdown = [dict(row) for row in cursor.fetchall()]
+
+            # Get breakdown by collection
+            cursor.execute(_COLLECTION_BREAKDOWN_SQL, (date_bound,))
+            collection_breakdown = [dict(row) for row in cursor.fetchall()]
 
         return {
             'period': period,
@@ -206,31 +466,15 @@ class TokenTracker:
 
     def get_cost_breakdown(self, period='month'):
         """Get detailed cost breakdown"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-
-        # Daily costs for the period
-        time_filter = ""
-        if period == 'week':
-            time_filter = "WHERE timestamp >= datetime('now', '-7 days')"
-        elif period == 'month':
-            time_filter = "WHERE timestamp >= datetime('now', '-30 days')"
-
-        cursor.execute(f'''
-            SELECT
-                date(timestamp) as date,
-                COUNT(*) as requests,
-                SUM(total_tokens) as tokens,
-                SUM(cost_usd) as cost
-            FROM token_usage
-            {time_filter}
-            GROUP BY date(timestamp)
-            ORDER BY date DESC
-        ''')
-
-        daily_costs = [dict(row) for row in cursor.fetchall()]
-        conn.close()
+        self.flush()
+
+        # Daily costs for the period (only week and month narrow the range)
+        _, date_bound = self._period_bounds(period if period in _PERIOD_DAYS else 'all')
+
+        with self._reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute(_DAILY_COSTS_SQL, (date_bound,))
+            daily_costs = [dict(row) for row in cursor.fetchall()]
 
         return daily_costs
 
@@ -238,50 +482,45 @@ class TokenTracker:
         """Export usage data to CSV for external analysis"""
         import csv
 
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-
-        time_filter = ""
-        if period == 'today':
-            time_filter = "WHERE date(timestamp) = date('now')"
-        elif period == 'week':
-            time_filter = "WHERE timestamp >= datetime('now', '-7 days')"
-        elif period == 'month':
-            time_filter = "WHERE timestamp >= datetime('now', '-30 days')"
-
-        cursor.execute(f'''
-            SELECT * FROM token_usage
-            {time_filter}
-            ORDER BY timestamp DESC
-        ''')
-
-        rows = cursor.fetchall()
-
-        if rows:
-            with open(output_path, 'w', newline='') as csvfile:
-                writer = csv.DictWriter(csvfile, fieldnames=rows[0].keys())
-                writer.writeheader()
-                for row in rows:
-                    writer.writerow(dict(row))
-
-        conn.close()
-        print(f"[TokenTracker] Exported {len(rows)} records to {output_path}")
+        self.flush()
+        ts_bound, _ = self._period_bounds(period)
+        exported = 0
+
+        with self._reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute(_EXPORT_SQL, (ts_bound,))
+
+            # Stream in batches so memory stays flat regardless of table size
+            batch = cursor.fetchmany(self.EXPORT_BATCH_SIZE)
+            if batch:
+                with open(output_path, 'w', newline='') as csvfile:
+                    writer = csv.writer(csvfile)
+                    writer.writerow(column[0] for column in cursor.description)
+                    while batch:
+                        writer.writerows(batch)
+                        exported += len(batch)
+                        batch = cursor.fetchmany(self.EXPORT_BATCH_SIZE)
+
+        print(f"[TokenTracker] Exported {exported} records to {output_path}")
         return output_path
 
     def clear_old_data(self, days=90):
-        """Clear data older than specified days"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        cursor.execute('''
-            DELETE FROM token_usage
-            WHERE timestamp < datetime('now', '-' || ? || ' days')
-        ''', (days,))
-
-        deleted = cursor.rowcount
-        conn.commit()
-        conn.close()
+        """Clear data from before the day that was `days` days ago
+
+        Raw rows and the daily rollup are cut at the same local midnight, so
+        the rollup never keeps totals for raw rows that were deleted.
+        """
+        self.flush()
+        cutoff = (datetime.now() - timedelta(days=days)).replace(hour=0, minute=0, second=0, microsecond=0)
+
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "DELETE FROM token_usage WHERE timestamp_ns < ?", (int(cutoff.timestamp() * 1e9),)
+            )
+            deleted = cursor.rowcount
+            self._conn.execute(
+                "DELETE FROM token_usage_daily WHERE date < ?", (cutoff.date().isoformat(),)
+            )
 
         print(f"[TokenTracker] Deleted {deleted} records older than {days} days")
         return deleted
@@ -4,11 +4,19 @@ Web Crawler - Recursively crawl any website and store in Milvus
 """
 
 import os
+import re
+import json
+import sqlite3
 import time
-import hashlib
+import threading
 from urllib.parse import urljoin, urlparse
 from collections import deque
+from datetime import datetime
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 import requests
+import xxhash
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
 from dotenv import load_dotenv
 from sentence_transformers import SentenceTransformer
@@ -16,45 +24,94 @@ from pymilvus import connections, Collection, FieldSchema, CollectionSchema, Dat
 
 load_dotenv()
 
+# File types that are never crawled as pages
+_SKIP_EXTENSIONS = frozenset({
+    '.pdf', '.jpg', '.jpeg', '.png', '.gif', '.svg', '.ico',
+    '.zip', '.tar', '.gz', '.mp4', '.mp3', '.avi', '.mov',
+    '.css', '.js', '.json', '.xml', '.rss'
+})
+
+# Common non-content paths
+_SKIP_PATH_RE = re.compile(r'/(api|auth|login|logout|admin|private)/', re.IGNORECASE)
+
+# Any run of whitespace, collapsed to one space in extracted text
+_WS_RE = re.compile(r'\s+')
+
+# Site navigation repeats the same links on every page, so parses are memoized
+_parse_url = lru_cache(maxsize=65536)(urlparse)
+
 
 class WebCrawler:
-    def __init__(self, max_pages=100, max_depth=5, delay=1.0):
+    # Crawled pages buffered per Milvus insert/flush and per embedding batch
+    STORE_BATCH_SIZE = 64
+
+    # Characters of title + content sent to the encoder; MiniLM truncates at 256
+    # word pieces, so anything past this is tokenized only to be thrown away
+    EMBED_TEXT_CHARS = 2000
+
+    def __init__(self, max_pages=100, max_depth=5, delay=1.0, max_workers=8, state_db=None):
         """
         Initialize web crawler
 
         Args:
             max_pages: Maximum number of pages to crawl
             max_depth: Maximum depth from start URL
-            delay: Delay between requests in seconds (respect rate limits)
+            delay: Minimum delay between requests to the same host in seconds (respect rate limits)
+            max_workers: Number of pages fetched concurrently
+            state_db: Optional SQLite file recording stored URLs per collection, so
+                      repeated or resumed crawls skip pages already in Milvus
         """
         self.max_pages = max_pages
         self.max_depth = max_depth
         self.delay = delay
+        self.max_workers = max_workers
+        self.state_db = state_db
+        self._state_conn = None
+        self._stored_urls = set()
         self.visited_urls = set()
         self.to_visit = deque()
+        self._queued = set()  # URLs currently in to_visit, for O(1) membership checks
         self.pages_crawled = 0
 
         # Milvus connection
         self.milvus_host = "localhost"
         self.milvus_port = "19530"
         self.embedding_model = None
+        self._milvus_connected = False
 
         # User agent for requests
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
         }
 
+        # Keep-alive session shared by the fetch workers
+        self._session = requests.Session()
+        self._session.headers.update(self.headers)
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32)
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+
+        # Per-host politeness: earliest time the next request to each host may start
+        self._throttle_lock = threading.Lock()
+        self._next_request_at = {}
+
     def load_embedding_model(self):
         """Load sentence transformer for embeddings"""
         if self.embedding_model is None:
             print("Loading embedding model...")
             self.embedding_model = SentenceTransformer('all-MiniLM-L6-v2')
+            # Half precision on GPU; batched page encoding is the crawler's main compute cost
+            if self.embedding_model.device.type == 'cuda':
+                self.embedding_model.half()
         return self.embedding_model
 
     def connect_milvus(self):
-        """Connect to Milvus"""
+        """Connect to Milvus (once per instance)"""
+        if self._milvus_connected:
+            return True
         try:
             connections.connect(alias="default", host=self.milvus_host, port=self.milvus_port)
+            self._milvus_connected = True
             return True
         except Exception as e:
             print(f"Failed to connect to Milvus: {e}")
@@ -62,7 +119,7 @@ class WebCrawler:
 
     def normalize_url(self, url):
         """Normalize URL by removing fragments and trailing slashes"""
-        parsed = urlparse(url)
+        parsed = _parse_url(url)
         # Remove fragment
         normalized = parsed._replace(fragment='').geturl()
         # Remove trailing slash for consistency
@@ -70,35 +127,31 @@ class WebCrawler:
             normalized = normalized[:-1]
         return normalized
 
-    def is_valid_url(self, url, base_domain):
+    def is_valid_url(self, url, base_domain, parsed=None):
         """
         Check if URL should be crawled
 
         Args:
             url: URL to check
             base_domain: Base domain to restrict crawling to
+            parsed: urlparse() result for url, if the caller already has it
 
         Returns:
             bool: True if URL should be crawled
         """
-        parsed = urlparse(url)
+        if parsed is None:
+            parsed = _parse_url(url)
 
         # Must be same domain
         if parsed.netloc != base_domain:
             return False
 
         # Skip certain file types
-        skip_extensions = [
-            '.pdf', '.jpg', '.jpeg', '.png', '.gif', '.svg', '.ico',
-            '.zip', '.tar', '.gz', '.mp4', '.mp3', '.avi', '.mov',
-            '.css', '.js', '.json', '.xml', '.rss'
-        ]
-        if any(parsed.path.lower().endswith(ext) for ext in skip_extensions):
+        if os.path.splitext(parsed.path)[1].lower() in _SKIP_EXTENSIONS:
             return False
 
         # Skip common non-content paths
-        skip_paths = ['/api/', '/auth/', '/login/', '/logout/', '/admin/', '/private/']
-        if any(skip in parsed.path.lower() for skip in skip_paths):
+        if _SKIP_PATH_RE.search(parsed.path):
             return False
 
         return True
@@ -134,13 +187,8 @@ class WebCrawler:
         if not main_content:
             main_content = soup.body if soup.body else soup
 
-        # Extract text
-        text = main_content.get_text(separator=' ', strip=True)
-
-        # Clean up whitespace
-        lines = (line.strip() for line in text.splitlines())
-        chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-        text = ' '.join(chunk for chunk in chunks if chunk)
+        # Extract text and collapse whitespace in a single pass
+        text = _WS_RE.sub(' ', main_content.get_text(separator=' ', strip=True)).strip()
 
         # Get meta description if available
         meta_desc = soup.find('meta', attrs={'name': 'description'})
@@ -162,7 +210,7 @@ class WebCrawler:
             base_url: Base URL for resolving relative links
 
         Returns:
-            list of absolute URLs
+            list of (absolute URL, parsed URL) tuples
         """
         links = []
         for link in soup.find_all('a', href=True):
@@ -170,9 +218,18 @@ class WebCrawler:
             # Convert relative URLs to absolute
             absolute_url = urljoin(base_url, href)
             normalized_url = self.normalize_url(absolute_url)
-            links.append(normalized_url)
+            links.append((normalized_url, _parse_url(normalized_url)))
         return links
 
+    def _throttle(self, host):
+        """Wait for this host's next request slot so requests start at least `delay` apart"""
+        with self._throttle_lock:
+            now = time.monotonic()
+            slot = max(now, self._next_request_at.get(host, now))
+            self._next_request_at[host] = slot + self.delay
+        if slot > now:
+            time.sleep(slot - now)
+
     def fetch_page(self, url):
         """
         Fetch a page and return BeautifulSoup object
@@ -184,8 +241,9 @@ class WebCrawler:
             BeautifulSoup object or None if failed
         """
         try:
+            self._throttle(urlparse(url).netloc)
             print(f"[Crawler] Fetching: {url}")
-            response = requests.get(url, headers=self.headers, timeout=10, allow_redirects=True)
+            response = self._session.get(url, timeout=10, allow_redirects=True)
             response.raise_for_status()
 
             # Check if it's HTML
@@ -194,7 +252,8 @@ class WebCrawler:
                 print(f"[Crawler] Skipping non-HTML content: {content_type}")
                 return None
 
-            soup = BeautifulSoup(response.content, 'html.parser')
+            # lxml's C parser is much faster than the pure-Python html.parser
+            soup = BeautifulSoup(response.content, 'lxml')
             return soup
 
         except requests.exceptions.RequestException as e:
@@ -212,65 +271,78 @@ class WebCrawler:
         Returns:
             bool: Success status
         """
+        return self.store_pages([page_data], collection_name)
+
+    def _ensure_collection(self, collection_name):
+        """Create the crawl collection and its index if it doesn't exist"""
+        if not utility.has_collection(collection_name):
+            print(f"[Milvus] Creating collection: {collection_name}")
+            fields = [
+                FieldSchema(name="id", dtype=DataType.INT64, is_primary=True, auto_id=True),
+                FieldSchema(name="source_type", dtype=DataType.VARCHAR, max_length=50),
+                FieldSchema(name="source_id", dtype=DataType.VARCHAR, max_length=500),
+                FieldSchema(name="title", dtype=DataType.VARCHAR, max_length=1000),
+                FieldSchema(name="content", dtype=DataType.VARCHAR, max_length=60000),
+                FieldSchema(name="metadata", dtype=DataType.VARCHAR, max_length=2000),
+                FieldSchema(name="url", dtype=DataType.VARCHAR, max_length=2000),
+                FieldSchema(name="created_at", dtype=DataType.VARCHAR, max_length=100),
+                FieldSchema(name="embedding", dtype=DataType.FLOAT_VECTOR, dim=384)
+            ]
+            schema = CollectionSchema(fields, description="Web crawl data")
+            collection = Collection(name=collection_name, schema=schema)
+
+            # Create index
+            index_params = {
+                "metric_type": "L2",
+                "index_type": "IVF_FLAT",
+                "params": {"nlist": 128}
+            }
+            collection.create_index(field_name="embedding", index_params=index_params)
+            print(f"[Milvus] Created collection and index")
+
+        return Collection(name=collection_name)
+
+    def store_pages(self, pages, collection_name='website_crawl'):
+        """
+        Store a batch of pages in Milvus with one encode, one insert and one flush
+
+        Args:
+            pages: list of dicts with page information
+            collection_name: Milvus collection name
+
+        Returns:
+            bool: Success status
+        """
+        if not pages:
+            return True
+
         if not self.connect_milvus():
             return False
 
         try:
-            # Create collection if it doesn't exist
-            if not utility.has_collection(collection_name):
-                print(f"[Milvus] Creating collection: {collection_name}")
-                fields = [
-                    FieldSchema(name="id", dtype=DataType.INT64, is_primary=True, auto_id=True),
-                    FieldSchema(name="source_type", dtype=DataType.VARCHAR, max_length=50),
-                    FieldSchema(name="source_id", dtype=DataType.VARCHAR, max_length=500),
-                    FieldSchema(name="title", dtype=DataType.VARCHAR, max_length=1000),
-                    FieldSchema(name="content", dtype=DataType.VARCHAR, max_length=60000),
-                    FieldSchema(name="metadata", dtype=DataType.VARCHAR, max_length=2000),
-                    FieldSchema(name="url", dtype=DataType.VARCHAR, max_length=2000),
-                    FieldSchema(name="created_at", dtype=DataType.VARCHAR, max_length=100),
-                    FieldSchema(name="embedding", dtype=DataType.FLOAT_VECTOR, dim=384)
-                ]
-                schema = CollectionSchema(fields, description="Web crawl data")
-                collection = Collection(name=collection_name, schema=schema)
-
-                # Create index
-                index_params = {
-                    "metric_type": "L2",
-                    "index_type": "IVF_FLAT",
-                    "params": {"nlist": 128}
-                }
-                collection.create_index(field_name="embedding", index_params=index_params)
-                print(f"[Milvus] Created collection and index")
-
-            collection = Collection(name=collection_name)
-
-            # Generate embedding
+            collection = self._ensure_collection(collection_name)
+
+            # Generate embeddings for the whole batch in one forward pass
             model = self.load_embedding_model()
-            text_to_embed = f"{page_data['title']} {page_data['content'][:5000]}"
-            embedding = model.encode([text_to_embed])[0].tolist()
-
-            # Prepare data
-            url_hash = hashlib.md5(page_data['url'].encode()).hexdigest()
-
-            import json
-            from datetime import datetime
-
-            metadata = json.dumps({
-                'description': page_data.get('description', ''),
-                'domain': urlparse(page_data['url']).netloc,
-                'path': urlparse(page_data['url']).path
-            })
-
-            data = [
-                ['webpage'],
-                [url_hash],
-                [page_data['title']],
-                [page_data['content']],
-                [metadata],
-                [page_data['url']],
-                [datetime.now().isoformat()],
-                [embedding]
-            ]
+            limit = self.EMBED_TEXT_CHARS
+            texts = [f"{page['title']} {page['content'][:limit]}"[:limit] for page in pages]
+            embeddings = model.encode(texts, batch_size=self.STORE_BATCH_SIZE, show_progress_bar=False)
+
+            # Prepare column-major data
+            rows = []
+            for page in pages:
+                # Non-cryptographic id; xxh3_128 keeps the 32-hex-char form of the old md5
+                url_hash = xxhash.xxh3_128_hexdigest(page['url'])
+                parsed = urlparse(page['url'])
+                metadata = json.dumps({
+                    'description': page.get('description', ''),
+                    'domain': parsed.netloc,
+                    'path': parsed.path
+                })
+                rows.append(('webpage', url_hash, page['title'], page['content'], metadata, page['url'], datetime.now().isoformat()))
+
+            data = [list(column) for column in zip(*rows)]
+            data.append(embeddings.tolist())
 
             # Insert
             collection.insert(data)
@@ -279,9 +351,78 @@ class WebCrawler:
             return True
 
         except Exception as e:
-            print(f"[Milvus] Error storing page: {e}")
+            print(f"[Milvus] Error storing {len(pages)} page(s): {e}")
             return False
 
+    def _process_url(self, url, depth):
+        """
+        Fetch and parse one page (runs on a worker thread)
+
+        Returns:
+            (page_data, links) - page_data is None if the fetch failed
+        """
+        soup = self.fetch_page(url)
+        if not soup:
+            return None, []
+
+        # Extract content
+        page_data = self.extract_content(soup, url)
+        print(f"[Crawler] Extracted: {page_data['title'][:80]} ({len(page_data['content'])} chars)")
+
+        # Extract links (only if not at max depth)
+        links = self.extract_links(soup, url) if depth < self.max_depth else []
+        return page_data, links
+
+    def _load_state(self, collection_name):
+        """Load URLs already stored in this collection by earlier crawls"""
+        if not self.state_db:
+            return
+
+        if self._state_conn is None:
+            self._state_conn = sqlite3.connect(self.state_db)
+            with self._state_conn:
+                self._state_conn.execute(
+                    "CREATE TABLE IF NOT EXISTS crawl_state ("
+                    "collection TEXT NOT NULL, url TEXT NOT NULL, PRIMARY KEY (collection, url))"
+                )
+
+        cursor = self._state_conn.execute("SELECT url FROM crawl_state WHERE collection = ?", (collection_name,))
+        while True:
+            batch = cursor.fetchmany(10000)
+            if not batch:
+                break
+            self._stored_urls.update(row[0] for row in batch)
+
+        if self._stored_urls:
+            print(f"[Crawler] {len(self._stored_urls)} pages already stored in '{collection_name}' will be skipped")
+
+    def _save_state(self, urls, collection_name):
+        """Record URLs that were just stored in Milvus"""
+        if self._state_conn is None:
+            return
+        with self._state_conn:
+            self._state_conn.executemany(
+                "INSERT OR IGNORE INTO crawl_state (collection, url) VALUES (?, ?)",
+                [(collection_name, url) for url in urls]
+            )
+        self._stored_urls.update(urls)
+
+    def _store_pending(self, pending, collection_name):
+        """Store and clear buffered pages; returns (stored, failed) counts"""
+        if not pending:
+            return 0, 0
+
+        count = len(pending)
+        ok = self.store_pages(pending, collection_name)
+        if ok:
+            self._save_state([page['url'] for page in pending], collection_name)
+        pending.clear()
+        if ok:
+            print(f"[Milvus] ✓ Stored {count} pages in collection '{collection_name}'")
+            return count, 0
+        print(f"[Milvus] ✗ Failed to store {count} pages")
+        return 0, count
+
     def crawl(self, start_url, collection_name='website_crawl'):
         """
         Crawl website starting from given URL
@@ -302,65 +443,83 @@ class WebCrawler:
         start_url = self.normalize_url(start_url)
         base_domain = urlparse(start_url).netloc
 
+        # Pages stored by earlier runs are still crawled for links but not re-stored
+        self._load_state(collection_name)
+
         # Initialize queue with start URL at depth 0
         self.to_visit.append((start_url, 0))
+        self._queued.add(start_url)
 
         pages_stored = 0
         pages_failed = 0
+        pages_skipped = 0
         start_time = time.time()
 
-        while self.to_visit and self.pages_crawled < self.max_pages:
-            # Get next URL and its depth
-            current_url, depth = self.to_visit.popleft()
-
-            # Skip if already visited
-            if current_url in self.visited_urls:
-                continue
-
-            # Skip if too deep
-            if depth > self.max_depth:
-                continue
-
-            # Mark as visited
-            self.visited_urls.add(current_url)
-            self.pages_crawled += 1
-
-            print(f"\n[{self.pages_crawled}/{self.max_pages}] Depth {depth}: {current_url}")
-
-            # Fetch page
-            soup = self.fetch_page(current_url)
-
-            if soup:
-                # Extract content
-                page_data = self.extract_content(soup, current_url)
-
-                print(f"[Crawler] Extracted: {page_data['title'][:80]} ({len(page_data['content'])} chars)")
-
-                # Store in Milvus
-                if self.store_page(page_data, collection_name):
-                    pages_stored += 1
-                    print(f"[Milvus] ✓ Stored in collection '{collection_name}'")
-                else:
-                    pages_failed += 1
-                    print(f"[Milvus] ✗ Failed to store")
-
-                # Extract and queue links (only if not at max depth)
-                if depth < self.max_depth:
-                    links = self.extract_links(soup, current_url)
+        # Workers fetch and parse; the frontier and Milvus writes stay on this thread
+        in_flight = {}
+        pending = []
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while True:
+                while (self.to_visit and len(in_flight) < self.max_workers
+                       and self.pages_crawled < self.max_pages):
+                    # Get next URL and its depth
+                    current_url, depth = self.to_visit.popleft()
+                    self._queued.discard(current_url)
+
+                    # Skip if already visited
+                    if current_url in self.visited_urls:
+                        continue
+
+                    # Skip if too deep
+                    if depth > self.max_depth:
+                        continue
+
+                    # Mark as visited
+                    self.visited_urls.add(current_url)
+                    self.pages_crawled += 1
+
+                    print(f"\n[{self.pages_crawled}/{self.max_pages}] Depth {depth}: {current_url}")
+                    in_flight[executor.submit(self._process_url, current_url, depth)] = depth
+
+                if not in_flight:
+                    break
+
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    depth = in_flight.pop(future)
+                    page_data, links = future.result()
+
+                    if page_data is None:
+                        pages_failed += 1
+                        continue
+
+                    # Buffer for Milvus; store a full batch at a time
+                    if page_data['url'] in self._stored_urls:
+                        pages_skipped += 1
+                    else:
+                        pending.append(page_data)
+                    if len(pending) >= self.STORE_BATCH_SIZE:
+                        stored, failed = self._store_pending(pending, collection_name)
+                        pages_stored += stored
+                        pages_failed += failed
+
+                    # Queue links (only extracted if not at max depth)
                     new_links = 0
-                    for link in links:
+                    for link, parsed in links:
                         if (link not in self.visited_urls and
-                            self.is_valid_url(link, base_domain) and
-                            (link, depth + 1) not in self.to_visit):
+                            link not in self._queued and
+                            self.is_valid_url(link, base_domain, parsed)):
                             self.to_visit.append((link, depth + 1))
+                            self._queued.add(link)
                             new_links += 1
 
-                    print(f"[Crawler] Found {new_links} new links to crawl")
-            else:
-                pages_failed += 1
+                    if depth < self.max_depth:
+                        print(f"[Crawler] Found {new_links} new links to crawl")
 
-            # Rate limiting
-            time.sleep(self.delay)
+        # Store whatever is left in the buffer
+        stored, failed = self._store_pending(pending, collection_name)
+        pages_stored += stored
+        pages_failed += failed
 
         elapsed_time = time.time() - start_time
 
@@ -370,6 +529,8 @@ class WebCrawler:
         print(f"Pages crawled: {self.pages_crawled}")
         print(f"Pages stored: {pages_stored}")
         print(f"Pages failed: {pages_failed}")
+        if self.state_db:
+            print(f"Pages already stored (skipped): {pages_skipped}")
         print(f"Time elapsed: {elapsed_time:.1f}s")
         print(f"Collection: {collection_name}")
         print(f"{'='*70}\n")
@@ -379,6 +540,7 @@ class WebCrawler:
             'pages_crawled': self.pages_crawled,
             'pages_stored': pages_stored,
             'pages_failed': pages_failed,
+            'pages_skipped': pages_skipped,
             'elapsed_time': elapsed_time,
             'collection': collection_name,
             'start_url': start_url
@@ -5,23 +5,42 @@ Upload files, fetch Jira tickets, and GitHub PRs
 """
 
 import os
+import io
 import json
+import base64
+import atexit
+import logging
+import multiprocessing
+import queue
+import threading
+import time
+import traceback
 import requests
+import orjson
+import numpy as np
 import pandas as pd
 from flask import Flask, render_template, request, jsonify, flash, redirect, url_for, send_file
+from flask.json.provider import JSONProvider
 from flask_cors import CORS
 from werkzeug.utils import secure_filename
 from dotenv import load_dotenv
+from collections import OrderedDict
 from datetime import datetime
 from sentence_transformers import SentenceTransformer
 from pymilvus import connections, Collection, FieldSchema, CollectionSchema, DataType, utility
+from requests.adapters import HTTPAdapter
 from requests.auth import HTTPBasicAuth
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait
+from concurrent.futures import TimeoutError as FuturesTimeoutError
 import PyPDF2
+from PIL import Image
 import hashlib
 from ollama_rag import OllamaRAG
+from pdf_extractor import extract_pdf_pages
+from milvus_search import embedding_search_params, similarity_score
 from claude_rag import ClaudeRAG
 from web_crawler import WebCrawler
-from github_analyzer import GitHubPersonaAnalyzer
+from github_analyzer import GitHubPersonaAnalyzer, PR_ACTIVITY_FIELDS, persona_cache
 from persona_report import PersonaReportGenerator
 from bs4 import BeautifulSoup
 import re
@@ -33,7 +52,19 @@ from codebase_analyzer_smart import SmartCodebaseAnalyzer
 # Load environment variables
 load_dotenv()
 
+
+class OrjsonProvider(JSONProvider):
+    """Flask JSON provider backed by orjson (jsonify and request.json)"""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 CORS(app)  # Enable CORS for React frontend
 app.secret_key = 'milvus-secret-key-2026'
 app.config['UPLOAD_FOLDER'] = 'uploads'
@@ -51,6 +82,175 @@ milvus_connected = False
 MILVUS_HOST = "localhost"
 MILVUS_PORT = "19530"
 
+# Collection handles returned by the ensure_* helpers, keyed by name
+_COLLECTION_CACHE = {}
+
+# Inserts are sealed by a background flusher every FLUSH_INTERVAL seconds, or
+# sooner once FLUSH_ROWS rows are waiting, instead of one flush() per insert
+FLUSH_INTERVAL = 2.0
+FLUSH_ROWS = 1000
+_pending_flush = {}
+_flush_lock = threading.Lock()
+_flush_wakeup = threading.Event()
+
+# Collections already loaded into query node memory by this process
+_LOADED_COLLECTIONS = set()
+
+# (repository, pr_number) pairs known to be stored successfully
+_pr_seen_cache = set()
+
+# LRU of document embeddings keyed by a hash of the encoded text, so
+# re-fetched tickets and PRs with unchanged content skip the encoder
+EMBEDDING_CACHE_SIZE = 50000
+_embedding_cache = OrderedDict()
+_embedding_cache_lock = threading.Lock()
+
+# LRU of CLIP image vectors keyed by the SHA-256 of the image bytes, so
+# re-uploaded screenshots skip the CLIP forward pass
+CLIP_CACHE_SIZE = 10000
+_clip_cache = OrderedDict()
+_clip_cache_lock = threading.Lock()
+
+# Query embeddings requested concurrently by Flask threads are encoded together:
+# the encoder thread waits up to ENCODE_BATCH_WINDOW after the first request
+ENCODE_BATCH_WINDOW = 0.02
+ENCODE_MAX_BATCH = 64
+_encode_queue = queue.Queue()
+
+# Rows per block when counting CSV rows ahead of the chunked upload
+CSV_COUNT_CHUNK_SIZE = 100000
+
+# Concurrent Milvus stores per CSV upload
+CSV_STORE_WORKERS = 8
+
+# Parsed progress files keyed by path, reparsed only when the file changes
+_progress_state = {}
+_progress_lock = threading.RLock()
+
+# Shared CodebaseAnalyzer for the search / stats endpoints, created on first use
+_analyzer = None
+_analyzer_lock = threading.Lock()
+
+# /codebase_stats responses, reused for STATS_CACHE_TTL seconds
+STATS_CACHE_TTL = 30
+_stats_cache = {}
+
+# Codebase search / AI answers reused for near-duplicate questions: an entry is
+# served when its query embedding has cosine >= SEMANTIC_CACHE_THRESHOLD
+SEMANTIC_CACHE_SIZE = 1000
+SEMANTIC_CACHE_TTL = 300
+SEMANTIC_CACHE_THRESHOLD = 0.97
+_semantic_cache = OrderedDict()
+_semantic_cache_lock = threading.RLock()
+
+# Worker processes for PDF text extraction, created on first upload
+PDF_WORKERS = min(4, os.cpu_count() or 1)
+PDF_TIMEOUT = 60
+PDF_PAGES_PER_TASK = 25
+_pdf_pool = None
+_pdf_pool_lock = threading.Lock()
+
+# Serialized form of empty action log parameters / metadata
+_EMPTY_META = "{}"
+
+# Action log rows waiting for the writer thread, inserted in batches
+_action_log_queue = queue.Queue(maxsize=1024)
+ACTION_LOG_BATCH_SIZE = 256
+
+# [API]/[Jira] progress lines; the handler is attached here rather than in __main__
+# so they still reach the console under `flask run` or a WSGI server
+logger = logging.getLogger(__name__)
+if not logger.handlers:
+    _log_handler = logging.StreamHandler()
+    _log_handler.setFormatter(logging.Formatter('%(message)s'))
+    logger.addHandler(_log_handler)
+    logger.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
+    logger.propagate = False
+
+# JIRA ticket ID (PROJECT-NUMBER), on its own or inside a /browse/ URL
+_JIRA_RE = re.compile(r'([A-Z]+-\d+)')
+_JIRA_KEY_RE = re.compile(r'^[A-Z]+-\d+$')
+_JIRA_BROWSE_RE = re.compile(r'/browse/([A-Z]+-\d+)')
+_CONFLUENCE_PAGE_RE = re.compile(r'/pages/(\d+)')
+
+# Fields of each PR sub-resource that PR documents are built from; URLs, avatars
+# and nested repository objects are dropped as each response is parsed
+PR_SECTION_FIELDS = {
+    'files': ('filename', 'status', 'additions', 'deletions', 'changes', 'patch'),
+    'issue_comments': ('user', 'created_at', 'body'),
+    'review_comments': ('user', 'created_at', 'path', 'line', 'body'),
+    'reviews': ('user', 'state', 'submitted_at', 'body'),
+    'commits': ('sha', 'commit'),
+    'timeline': ('event', 'actor', 'created_at'),
+}
+PR_SECTION_LIMITS = {'timeline': 20}
+
+# Fetched PRs embedded and inserted per store_documents_bulk call
+PR_STORE_BATCH_SIZE = 64
+JIRA_STORE_BATCH_SIZE = 64
+
+# Characters of title + content sent to the text encoder (see store_documents_bulk)
+EMBED_TEXT_CHARS = 2000
+
+
+def _http_session(pool_size=32):
+    """requests.Session whose connection pool is sized for concurrent fan-out"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+# Keep-alive connections to api.github.com shared by all PR fetches
+github_session = _http_session()
+
+
+def json_text(obj, limit):
+    """Serialize obj to JSON text truncated to at most limit UTF-8 bytes"""
+    return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)[:limit].decode('utf-8', 'ignore')
+
+
+def read_progress(progress_file):
+    """Return a progress file's contents, reusing the parsed copy while the file is unchanged
+
+    Raises FileNotFoundError when the progress file does not exist.
+    """
+    stat = os.stat(progress_file)
+    version = (stat.st_mtime_ns, stat.st_size)
+    with _progress_lock:
+        cached = _progress_state.get(progress_file)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+    with open(progress_file, 'rb') as f:
+        raw = f.read()
+    try:
+        data = orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        # Caught the tracker mid-write; serve the previous snapshot if there is one
+        if cached is not None:
+            return cached[1]
+        raise
+
+    with _progress_lock:
+        _progress_state[progress_file] = (version, data)
+    return data
+
+
+def csv_chunk_json(chunk_df):
+    """Serialize a CSV chunk to JSON; all-numeric chunks use a compact columns/data layout"""
+    if len(chunk_df.columns) and all(getattr(dtype, 'kind', 'O') in 'iuf' for dtype in chunk_df.dtypes):
+        # orjson only serializes C-contiguous arrays
+        data = np.ascontiguousarray(chunk_df.to_numpy())
+        payload = {'columns': [str(c) for c in chunk_df.columns], 'data': data}
+        return orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+    return orjson.dumps(
+        chunk_df.to_dict(orient='records'),
+        option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+        default=str
+    ).decode()
+
 
 def allowed_file(filename):
     """Check if file extension is allowed"""
@@ -64,14 +264,8 @@ def extract_ticket_id(query):
     - URL: https://your-instance.atlassian.net/browse/PROJ-12345
     - In sentence: "give me details about PROJ-12345"
     """
-    # Pattern for JIRA ticket ID (PROJECT-NUMBER)
-    pattern = r'([A-Z]+-\d+)'
-
-    match = re.search(pattern, query)
-    if match:
-        return match.group(1)
-
-    return None
+    match = _JIRA_RE.search(query)
+    return match.group(1) if match else None
 
 
 def load_model():
@@ -80,6 +274,9 @@ def load_model():
     if embedding_model is None:
         print("Loading text embedding model...")
         embedding_model = SentenceTransformer('all-MiniLM-L6-v2')
+        # Half precision on GPU, matching the crawler's ingest model
+        if embedding_model.device.type == 'cuda':
+            embedding_model.half()
         print("✓ Text model loaded")
 
     if image_vectorizer is None:
@@ -108,19 +305,68 @@ def connect_milvus():
     return True
 
 
+def _reset_pdf_pool(pool):
+    """Discard the PDF pool after a timeout, killing workers stuck on a hung parse"""
+    global _pdf_pool
+    with _pdf_pool_lock:
+        if _pdf_pool is pool:
+            _pdf_pool = None
+    processes = list((getattr(pool, '_processes', None) or {}).values())
+    pool.shutdown(wait=False, cancel_futures=True)
+    for process in processes:
+        process.terminate()
+
+
 def extract_text_from_pdf(filepath):
-    """Extract text from PDF file"""
+    """Extract text from PDF file
+
+    Parsing is pure Python and holds the GIL, so it runs in worker processes
+    to keep the Flask worker responsive during large uploads. Long documents
+    are split into page ranges that the workers extract in parallel.
+    """
+    global _pdf_pool
     try:
+        with _pdf_pool_lock:
+            if _pdf_pool is None:
+                # spawn, not fork: this process already runs gRPC channels, torch
+                # and background threads, which a forked child can deadlock on.
+                # Workers re-run the main script, so start the server through
+                # run_web_interface.py to keep them light
+                _pdf_pool = ProcessPoolExecutor(max_workers=PDF_WORKERS, mp_context=multiprocessing.get_context('spawn'))
+            pool = _pdf_pool
+
         with open(filepath, 'rb') as file:
-            reader = PyPDF2.PdfReader(file)
-            text = ""
-            for page in reader.pages:
-                text += page.extract_text() + "\n"
-            return text
+            page_count = len(PyPDF2.PdfReader(file).pages)
+
+        deadline = time.monotonic() + PDF_TIMEOUT
+        futures = [
+            pool.submit(extract_pdf_pages, filepath, start, start + PDF_PAGES_PER_TASK)
+            for start in range(0, page_count, PDF_PAGES_PER_TASK)
+        ]
+        try:
+            return "".join([future.result(timeout=max(0, deadline - time.monotonic())) for future in futures])
+        except FuturesTimeoutError:
+            for future in futures:
+                future.cancel()
+            _reset_pdf_pool(pool)
+            raise
+    except FuturesTimeoutError:
+        return f"Error extracting PDF: timed out after {PDF_TIMEOUT} seconds"
     except Exception as e:
         return f"Error extracting PDF: {str(e)}"
 
 
+def file_md5(filepath):
+    """MD5 hex digest of a file, read incrementally"""
+    with open(filepath, 'rb') as f:
+        if hasattr(hashlib, 'file_digest'):
+            return hashlib.file_digest(f, 'md5').hexdigest()
+        digest = hashlib.md5()
+        while chunk := f.read(1 << 20):
+            digest.update(chunk)
+        return digest.hexdigest()
+
+
 def read_file_content(filepath, filename):
     """Read content from uploaded file"""
     ext = filename.rsplit('.', 1)[1].lower()
@@ -145,11 +391,16 @@ def ensure_action_logs_collection():
     """Ensure action_logs collection exists"""
     collection_name = "action_logs"
 
+    if collection_name in _COLLECTION_CACHE:
+        return _COLLECTION_CACHE[collection_name]
+
     if not connect_milvus():
         return None
 
     if utility.has_collection(collection_name):
-        return Collection(name=collection_name)
+        collection = Collection(name=collection_name)
+        _COLLECTION_CACHE[collection_name] = collection
+        return collection
 
     # Create action logs collection (Optus requires at least one vector field)
     fields = [
@@ -170,7 +421,7 @@ def ensure_action_logs_collection():
     schema = CollectionSchema(fields, description="Action logs for tracking all operations")
     collection = Collection(name=collection_name, schema=schema)
 
-    # Create index on vector field
+    # Milvus 2.3 only loads indexed collections; FLAT has no build cost
     index_params = {
         "index_type": "FLAT",
         "metric_type": "L2",
@@ -179,51 +430,129 @@ def ensure_action_logs_collection():
     collection.create_index(field_name="embedding", index_params=index_params)
 
     print(f"[Action Logs] Created collection: {collection_name}")
+    _COLLECTION_CACHE[collection_name] = collection
     return collection
 
 
 def log_action(action_type, endpoint, parameters, status, duration_ms, result_summary="", error_message="", source="api", metadata=None):
-    """Log an action to the action_logs collection"""
+    """Queue an action for the action_logs collection (written by a background thread)"""
+    try:
+        row = (
+            datetime.now().isoformat(),
+            action_type,
+            endpoint,
+            json_text(parameters, 2000) if parameters else _EMPTY_META,
+            status,
+            int(duration_ms),
+            result_summary[:1000],
+            error_message[:1000],
+            source,
+            json_text(metadata, 2000) if metadata else _EMPTY_META
+        )
+        _action_log_queue.put_nowait(row)
+
+        print(f"[Action Logs] Logged: {action_type} - {status} ({duration_ms}ms)")
+
+    except queue.Full:
+        print(f"[Action Logs] Queue full, dropped: {action_type} - {status}")
+    except Exception as e:
+        print(f"[Action Logs] Error logging action: {e}")
+
+
+def _write_action_logs(rows):
+    """Insert queued action log rows with a single insert call"""
     try:
         collection = ensure_action_logs_collection()
         if collection is None:
             print("[Action Logs] Failed to get collection")
             return
 
-        timestamp = datetime.now().isoformat()
+        # Column-major data plus the dummy vector required by Optus
+        data = [list(column) for column in zip(*rows)]
+        data.append([[0.0, 0.0]] * len(rows))
 
-        # Prepare data (including dummy vector for Optus requirement)
-        data = [
-            [timestamp],
-            [action_type],
-            [endpoint],
-            [json.dumps(parameters)[:2000]],
-            [status],
-            [int(duration_ms)],
-            [result_summary[:1000]],
-            [error_message[:1000]],
-            [source],
-            [json.dumps(metadata or {})[:2000]],
-            [[0.0, 0.0]]  # Dummy vector (required by Optus)
-        ]
-
-        # Insert
         collection.insert(data)
-        collection.flush()
+        schedule_flush(collection, len(rows))
+    except Exception as e:
+        print(f"[Action Logs] Error writing {len(rows)} actions: {e}")
 
-        print(f"[Action Logs] Logged: {action_type} - {status} ({duration_ms}ms)")
 
-    except Exception as e:
-        print(f"[Action Logs] Error logging action: {e}")
+def _drain_action_logs(rows):
+    """Top up rows with whatever is already queued, up to ACTION_LOG_BATCH_SIZE"""
+    while len(rows) < ACTION_LOG_BATCH_SIZE:
+        try:
+            rows.append(_action_log_queue.get_nowait())
+        except queue.Empty:
+            break
+    return rows
+
+
+def _action_log_writer():
+    """Background thread that batches queued action logs into Milvus"""
+    while True:
+        _write_action_logs(_drain_action_logs([_action_log_queue.get()]))
+
+
+def schedule_flush(collection, rows=1):
+    """Mark a collection as having unflushed inserts for the background flusher"""
+    with _flush_lock:
+        _, pending = _pending_flush.get(collection.name, (collection, 0))
+        _pending_flush[collection.name] = (collection, pending + rows)
+        if pending + rows >= FLUSH_ROWS:
+            _flush_wakeup.set()
+
+
+def flush_collections():
+    """Flush every collection with unflushed inserts"""
+    with _flush_lock:
+        pending = list(_pending_flush.values())
+        _pending_flush.clear()
+        _flush_wakeup.clear()
+
+    for collection, _ in pending:
+        try:
+            collection.flush()
+        except Exception as e:
+            print(f"[Milvus] Error flushing {collection.name}: {e}")
+
+
+def _flush_loop():
+    """Background thread that seals pending inserts on a timer or row threshold"""
+    while True:
+        _flush_wakeup.wait(FLUSH_INTERVAL)
+        flush_collections()
+
+
+def _shutdown_writers():
+    """Write any queued action logs and flush pending inserts at exit"""
+    rows = _drain_action_logs([])
+    while rows:
+        _write_action_logs(rows)
+        rows = _drain_action_logs([])
+    flush_collections()
 
 
-def ensure_collection(collection_name, dim=384):
-    """Ensure collection exists, create if not"""
+threading.Thread(target=_action_log_writer, name="action-log-writer", daemon=True).start()
+threading.Thread(target=_flush_loop, name="milvus-flusher", daemon=True).start()
+atexit.register(_shutdown_writers)
+
+
+def ensure_collection(collection_name, dim=384, json_fields=None):
+    """Ensure collection exists, create if not
+
+    json_fields: optional names of structured JSON columns (e.g. PR reviews)
+    appended after the embedding when the collection is first created.
+    """
+    if collection_name in _COLLECTION_CACHE:
+        return _COLLECTION_CACHE[collection_name]
+
     if not connect_milvus():
         return None
 
     if utility.has_collection(collection_name):
-        return Collection(name=collection_name)
+        collection = Collection(name=collection_name)
+        _COLLECTION_CACHE[collection_name] = collection
+        return collection
 
     # Create collection
     fields = [
@@ -237,30 +566,45 @@ def ensure_collection(collection_name, dim=384):
         FieldSchema(name="created_at", dtype=DataType.VARCHAR, max_length=50),
         FieldSchema(name="embedding", dtype=DataType.FLOAT_VECTOR, dim=dim)
     ]
+    for field_name in json_fields or []:
+        fields.append(FieldSchema(name=field_name, dtype=DataType.JSON))
 
     schema = CollectionSchema(fields=fields, description=f"{collection_name} collection")
     collection = Collection(name=collection_name, schema=schema)
 
-    # Create index
+    # Create index (embeddings are L2-normalized, so inner product is cosine);
+    # searchers read the metric back via embedding_search_params
     index_params = {
-        "index_type": "IVF_FLAT",
-        "metric_type": "L2",
-        "params": {"nlist": 128}
+        "index_type": "HNSW",
+        "metric_type": "IP",
+        "params": {"M": 16, "efConstruction": 200}
     }
     collection.create_index(field_name="embedding", index_params=index_params)
 
+    # Scalar index so source_type filters (e.g. github_pr) avoid a full scan
+    try:
+        collection.create_index(field_name="source_type", index_params={"index_type": "Trie"})
+    except Exception as e:
+        print(f"[Milvus] Could not create source_type index on {collection_name}: {e}")
+
+    _COLLECTION_CACHE[collection_name] = collection
     return collection
 
 
 def ensure_pr_tracker_collection():
     """Ensure PR tracker collection exists"""
+    collection_name = 'github_pr_tracker'
+
+    if collection_name in _COLLECTION_CACHE:
+        return _COLLECTION_CACHE[collection_name]
+
     if not connect_milvus():
         return None
 
-    collection_name = 'github_pr_tracker'
-
     if utility.has_collection(collection_name):
-        return Collection(name=collection_name)
+        collection = Collection(name=collection_name)
+        _COLLECTION_CACHE[collection_name] = collection
+        return collection
 
     # Create simple tracking collection without embeddings
     fields = [
@@ -277,6 +621,7 @@ def ensure_pr_tracker_collection():
     schema = CollectionSchema(fields=fields, description="GitHub PR fetch tracking")
     collection = Collection(name=collection_name, schema=schema)
 
+    _COLLECTION_CACHE[collection_name] = collection
     return collection
 
 
@@ -298,7 +643,9 @@ def track_pr_fetch(repository, pr_number, pr_title, status, error_message="", co
         ]
 
         collection.insert(data)
-        collection.flush()
+        schedule_flush(collection)
+        if status == "success":
+            _pr_seen_cache.add((repository, pr_number))
         return True
     except Exception as e:
         print(f"[PR Tracker] Error tracking PR: {e}")
@@ -315,12 +662,11 @@ def get_tracked_prs(repository=None):
         if not utility.has_collection(collection_name):
             return []
 
-        collection = Collection(name=collection_name)
-        collection.load()
+        collection = get_loaded_collection(collection_name)
 
         # Query PRs
         if repository:
-            expr = f"repository == '{repository}'"
+            expr = f"repository == {milvus_string(repository)}"
         else:
             expr = "repository != ''"
 
@@ -330,61 +676,302 @@ def get_tracked_prs(repository=None):
             limit=10000
         )
 
-        collection.release()
         return results
     except Exception as e:
         print(f"[PR Tracker] Error getting tracked PRs: {e}")
         return []
 
 
+def load_collection_once(collection):
+    """Load a collection the first time it is queried and keep it loaded"""
+    if collection.name not in _LOADED_COLLECTIONS:
+        collection.load()
+        _LOADED_COLLECTIONS.add(collection.name)
+    return collection
+
+
+def get_loaded_collection(collection_name):
+    """Return a cached handle for an existing collection, loaded on first use"""
+    collection = _COLLECTION_CACHE.get(collection_name)
+    if collection is None:
+        collection = Collection(name=collection_name)
+        _COLLECTION_CACHE[collection_name] = collection
+    return load_collection_once(collection)
+
+
+def preload_collections():
+    """Load every existing collection once so the first queries are not cold"""
+    if not connect_milvus():
+        return
+    for collection_name in utility.list_collections():
+        try:
+            get_loaded_collection(collection_name)
+        except Exception as e:
+            print(f"[Milvus] Could not load {collection_name}: {e}")
+
+
+def milvus_string(value):
+    """Quote a value as a Milvus boolean-expression string literal"""
+    return '"' + str(value).replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+
 def is_pr_already_fetched(repository, pr_number):
     """Check if a PR has already been successfully fetched"""
+    if (repository, pr_number) in _pr_seen_cache:
+        return True
+
     try:
-        tracked_prs = get_tracked_prs(repository)
-        for pr in tracked_prs:
-            if pr['pr_number'] == pr_number and pr['status'] == 'success':
-                return True
+        collection = ensure_pr_tracker_collection()
+        if collection is None:
+            return False
+
+        load_collection_once(collection)
+        results = collection.query(
+            expr=f"repository == {milvus_string(repository)} and pr_number == {int(pr_number)} and status == \"success\"",
+            output_fields=["pr_number"],
+            limit=1
+        )
+        if results:
+            _pr_seen_cache.add((repository, pr_number))
+            return True
         return False
-    except:
+    except Exception as e:
+        print(f"[PR Tracker] Error checking PR #{pr_number}: {e}")
         return False
 
 
-def store_document(collection_name, source_type, source_id, title, content, metadata, url=""):
-    """Store document in Milvus"""
+def existing_source_ids(collection_name, source_ids):
+    """Return the subset of source_ids already stored in a collection, with one query"""
+    if not source_ids:
+        return set()
+    try:
+        if not connect_milvus() or not utility.has_collection(collection_name):
+            return set()
+
+        collection = get_loaded_collection(collection_name)
+        results = collection.query(
+            expr=f"source_id in [{', '.join(milvus_string(source_id) for source_id in source_ids)}]",
+            output_fields=["source_id"],
+            limit=len(source_ids)
+        )
+        return {row['source_id'] for row in results}
+    except Exception as e:
+        print(f"[Milvus] Error checking existing documents in {collection_name}: {e}")
+        return set()
+
+
+def store_document(collection_name, source_type, source_id, title, content, metadata, url="", structured=None):
+    """Store document in Milvus
+
+    structured: optional dict of JSON column values (see PR_ACTIVITY_FIELDS).
+    Columns missing from an older collection's schema are silently skipped.
+    """
+    success, message = store_documents_bulk(collection_name, [{
+        'source_type': source_type,
+        'source_id': source_id,
+        'title': title,
+        'content': content,
+        'metadata': metadata,
+        'url': url,
+        'structured': structured
+    }])
+    if not success:
+        return False, message
+    return True, "Document stored successfully"
+
+
+def encode_documents(model, texts):
+    """Encode texts in one batch, reusing cached embeddings for repeated content"""
+    keys = [hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest() for text in texts]
+    vectors = [None] * len(texts)
+    missing = []
+
+    with _embedding_cache_lock:
+        for i, key in enumerate(keys):
+            vector = _embedding_cache.get(key)
+            if vector is None:
+                missing.append(i)
+            else:
+                _embedding_cache.move_to_end(key)
+                vectors[i] = vector
+
+    if missing:
+        encoded = model.encode([texts[i] for i in missing], batch_size=64, show_progress_bar=False, normalize_embeddings=True)
+        with _embedding_cache_lock:
+            for i, vector in zip(missing, encoded):
+                vector = vector.copy()
+                vectors[i] = vector
+                _embedding_cache[keys[i]] = vector
+            while len(_embedding_cache) > EMBEDDING_CACHE_SIZE:
+                _embedding_cache.popitem(last=False)
+
+    return np.stack(vectors)
+
+
+def extract_image_vector(filepath, image_bytes=None):
+    """Return the CLIP vector for an image, reusing the cached vector for identical bytes"""
+    if image_bytes is None:
+        with open(filepath, 'rb') as f:
+            image_bytes = f.read()
+    key = hashlib.sha256(image_bytes).digest()
+
+    with _clip_cache_lock:
+        vector = _clip_cache.get(key)
+        if vector is not None:
+            _clip_cache.move_to_end(key)
+            return vector
+
+    vector = image_vectorizer.extract_vector(filepath)
+    with _clip_cache_lock:
+        _clip_cache[key] = vector
+        while len(_clip_cache) > CLIP_CACHE_SIZE:
+            _clip_cache.popitem(last=False)
+    return vector
+
+
+def encode_query(text):
+    """Embed one query through the shared micro-batching encoder thread
+
+    Returns a list of floats: pymilvus 2.3 packs search vectors with
+    struct.pack(*vector), which unpacks a list faster than an ndarray.
+    """
+    request_slot = {'text': text, 'done': threading.Event()}
+    _encode_queue.put(request_slot)
+    request_slot['done'].wait()
+    if 'error' in request_slot:
+        raise request_slot['error']
+    return request_slot['vector']
+
+
+def _encoder_loop():
+    """Background thread that encodes queued queries in micro-batches"""
+    while True:
+        batch = [_encode_queue.get()]
+        deadline = time.monotonic() + ENCODE_BATCH_WINDOW
+        while len(batch) < ENCODE_MAX_BATCH:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(_encode_queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+
+        try:
+            vectors = load_model().encode([slot['text'] for slot in batch], batch_size=ENCODE_MAX_BATCH, show_progress_bar=False)
+            for slot, vector in zip(batch, vectors):
+                slot['vector'] = vector.tolist()
+        except Exception as e:
+            for slot in batch:
+                slot['error'] = e
+        for slot in batch:
+            slot['done'].set()
+
+
+threading.Thread(target=_encoder_loop, name="query-encoder", daemon=True).start()
+
+
+def get_analyzer():
+    """Return the shared CodebaseAnalyzer, keeping its embedding model and connection warm"""
+    global _analyzer
+    with _analyzer_lock:
+        if _analyzer is None:
+            _analyzer = CodebaseAnalyzer()
+        return _analyzer
+
+
+def semantic_query_vector(text):
+    """Unit-length query embedding used as the semantic cache key"""
+    vector = np.asarray(encode_query(text), dtype=np.float32)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+def semantic_cache_get(scope, vector):
+    """Return the cached value for the closest fresh query in scope, or None"""
+    now = time.time()
+    with _semantic_cache_lock:
+        keys, vectors = [], []
+        for key, (entry_scope, entry_vector, _, created) in list(_semantic_cache.items()):
+            if now - created >= SEMANTIC_CACHE_TTL:
+                del _semantic_cache[key]
+            elif entry_scope == scope:
+                keys.append(key)
+                vectors.append(entry_vector)
+        if not vectors:
+            return None
+
+        similarities = np.stack(vectors) @ vector
+        best = int(np.argmax(similarities))
+        if similarities[best] < SEMANTIC_CACHE_THRESHOLD:
+            return None
+        _semantic_cache.move_to_end(keys[best])
+        return _semantic_cache[keys[best]][2]
+
+
+def semantic_cache_put(scope, vector, value):
+    """Cache a value for a query embedding, evicting the least recently used entries"""
+    with _semantic_cache_lock:
+        key = (scope, vector.tobytes())
+        _semantic_cache[key] = (scope, vector, value, time.time())
+        _semantic_cache.move_to_end(key)
+        while len(_semantic_cache) > SEMANTIC_CACHE_SIZE:
+            _semantic_cache.popitem(last=False)
+
+
+def clear_semantic_cache():
+    """Drop cached codebase answers, e.g. after the codebase is re-analyzed"""
+    with _semantic_cache_lock:
+        _semantic_cache.clear()
+
+
+def store_documents_bulk(collection_name, docs):
+    """Store many documents in Milvus with one encode() and one insert()
+
+    docs: list of dicts holding store_document's arguments (source_type,
+    source_id, title, content, metadata and optional url / structured).
+    """
+    if not docs:
+        return True, "No documents to store"
+
     try:
         model = load_model()
-        collection = ensure_collection(collection_name)
+        json_fields = next((list(doc['structured']) for doc in docs if doc.get('structured')), None)
+        collection = ensure_collection(collection_name, json_fields=json_fields)
 
         if collection is None:
             return False, "Failed to connect to Milvus"
 
-        # Generate embedding
-        text_for_embedding = f"{title} {content[:5000]}"
-        embedding = model.encode([text_for_embedding])[0].tolist()
-
-        # Prepare data with proper truncation
-        metadata_json = json.dumps(metadata)
-        if len(metadata_json) > 4900:
-            metadata_json = metadata_json[:4900]
+        # One batched forward pass instead of one encode() per document. encode()
+        # already length-sorts each batch, so the remaining padding waste is text
+        # past MiniLM's 256 word-piece limit that is tokenized and then dropped
+        texts = [f"{doc['title']} {doc['content'][:EMBED_TEXT_CHARS]}"[:EMBED_TEXT_CHARS] for doc in docs]
+        embeddings = encode_documents(model, texts)
 
+        created_at = datetime.now().isoformat()
         data = [
-            [source_type],
-            [source_id],
-            [title[:1000]],
-            [content[:10000]],
-            [metadata_json],
-            [url[:500]],
-            [datetime.now().isoformat()],
-            [embedding]
+            [doc['source_type'] for doc in docs],
+            [doc['source_id'] for doc in docs],
+            [doc['title'][:1000] for doc in docs],
+            [doc['content'][:10000] for doc in docs],
+            [json_text(doc['metadata'], 4900) for doc in docs],
+            [(doc.get('url') or '')[:500] for doc in docs],
+            [created_at] * len(docs),
+            embeddings.tolist()
         ]
 
-        # Insert
+        # JSON columns follow the embedding in schema order
+        for field in collection.schema.fields:
+            if field.dtype == DataType.JSON:
+                data.append([(doc.get('structured') or {}).get(field.name, []) for doc in docs])
+
+        # Insert; the background flusher seals the segment
         collection.insert(data)
-        collection.flush()
+        schedule_flush(collection, len(docs))
 
-        return True, "Document stored successfully"
+        return True, f"Stored {len(docs)} documents successfully"
     except Exception as e:
-        return False, f"Error storing document: {str(e)}"
+        return False, f"Error storing documents: {str(e)}"
 
 
 def store_document_with_vector(collection_name, source_type, source_id, title, content, vector, metadata, url=""):
@@ -395,26 +982,17 @@ def store_document_with_vector(collection_name, source_type, source_id, title, c
         if collection is None:
             return False, "Failed to connect to Milvus"
 
-        # Convert numpy vector to list if needed
-        if hasattr(vector, 'tolist'):
-            embedding = vector.tolist()
-        else:
-            embedding = list(vector)
-
         # Pad or truncate vector to match collection dimension (384 for all-MiniLM-L6-v2)
-        # CLIP outputs 512-dim, need to handle this
+        # CLIP outputs 512-dim, need to handle this. Simple truncation (or could use
+        # PCA/projection) into a zeroed float32 buffer, which pymilvus takes as-is
         target_dim = 384
-        if len(embedding) > target_dim:
-            # Simple truncation (or could use PCA/projection)
-            embedding = embedding[:target_dim]
-        elif len(embedding) < target_dim:
-            # Pad with zeros
-            embedding = embedding + [0.0] * (target_dim - len(embedding))
+        vector = np.asarray(vector, dtype=np.float32).ravel()
+        embedding = np.zeros(target_dim, dtype=np.float32)
+        size = min(len(vector), target_dim)
+        embedding[:size] = vector[:size]
 
         # Prepare data with proper truncation
-        metadata_json = json.dumps(metadata)
-        if len(metadata_json) > 4900:
-            metadata_json = metadata_json[:4900]
+        metadata_json = json_text(metadata, 4900)
 
         data = [
             [source_type],
@@ -427,15 +1005,31 @@ def store_document_with_vector(collection_name, source_type, source_id, title, c
             [embedding]
         ]
 
-        # Insert
+        # JSON columns follow the embedding in schema order
+        for field in collection.schema.fields:
+            if field.dtype == DataType.JSON:
+                data.append([[]])
+
+        # Insert; the background flusher seals the segment
         collection.insert(data)
-        collection.flush()
+        schedule_flush(collection)
 
         return True, f"Image stored successfully with {len(vector)}-dim vector (adapted to {target_dim}-dim)"
     except Exception as e:
         return False, f"Error storing image: {str(e)}"
 
 
+def extract_text_from_html(html_text):
+    """Extract plain text from HTML if renderedFields contains HTML"""
+    # Plain-text fields are the common case and never need a parser
+    if not html_text or not isinstance(html_text, str) or '<' not in html_text:
+        return html_text
+    try:
+        return BeautifulSoup(html_text, 'lxml').get_text(' ', strip=True)
+    except Exception:
+        return html_text
+
+
 def fetch_jira_tickets(jira_keys):
     """Fetch Jira tickets by keys with ALL available data"""
     jira_url = os.getenv("JIRA_URL")
@@ -445,66 +1039,69 @@ def fetch_jira_tickets(jira_keys):
     if not all([jira_url, jira_email, jira_token]):
         return None, "Jira credentials not configured"
 
-    auth = HTTPBasicAuth(jira_email, jira_token)
-    headers = {"Accept": "application/json"}
+    # Fetch with ALL fields and expanded data (changelog, comments, attachments, etc.)
+    params = {
+        'fields': 'summary,description,status,priority,issuetype,assignee,reporter,creator,created,updated,labels,components,attachment,project,parent,fixVersions,duedate,resolution,resolutiondate',
+        'expand': 'changelog,renderedFields,names,schema,transitions,operations,editmeta,versionedRepresentations'
+    }
+
+    # Issue, comments and watchers for every key, requested concurrently
+    keys = [key.strip() for key in jira_keys]
+    requests_to_send = []
+    for key in keys:
+        url = f"{jira_url}/rest/api/3/issue/{key}"
+        logger.info("[Jira] Fetching %s from %s", key, url)
+        requests_to_send += [(url, params), (f"{url}/comment", None), (f"{url}/watchers", None)]
+
+    with _http_session() as session:
+        session.auth = HTTPBasicAuth(jira_email, jira_token)
+        session.headers.update({"Accept": "application/json"})
 
+        def get(request_args):
+            url, request_params = request_args
+            try:
+                return session.get(url, params=request_params)
+            except requests.exceptions.RequestException as e:
+                return e
+
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            responses = list(executor.map(get, requests_to_send))
+
+    debug_dump = bool(os.getenv("JIRA_DEBUG_DUMP"))
     tickets = []
     errors = []
-    for key in jira_keys:
+    for i, key in enumerate(keys):
+        response, comments_response, watchers_response = responses[3 * i:3 * i + 3]
         try:
-            # Fetch with ALL fields and expanded data (changelog, comments, attachments, etc.)
-            url = f"{jira_url}/rest/api/3/issue/{key.strip()}"
-            params = {
-                'fields': 'summary,description,status,priority,issuetype,assignee,reporter,creator,created,updated,labels,components,attachment,project,parent,fixVersions,duedate,resolution,resolutiondate',
-                'expand': 'changelog,renderedFields,names,schema,transitions,operations,editmeta,versionedRepresentations'
-            }
-            print(f"[Jira] Fetching {key} from {url}")
-            response = requests.get(url, auth=auth, headers=headers, params=params)
+            if isinstance(response, Exception):
+                raise response
             response.raise_for_status()
             ticket_data = response.json()
 
-            # Also fetch comments separately for better formatting
-            comments_url = f"{jira_url}/rest/api/3/issue/{key.strip()}/comment"
-            comments_response = requests.get(comments_url, auth=auth, headers=headers)
-            if comments_response.status_code == 200:
+            # Comments are fetched separately for better formatting
+            if not isinstance(comments_response, Exception) and comments_response.status_code == 200:
                 ticket_data['all_comments'] = comments_response.json()
 
-            # Fetch watchers
-            try:
-                watchers_url = f"{jira_url}/rest/api/3/issue/{key.strip()}/watchers"
-                watchers_response = requests.get(watchers_url, auth=auth, headers=headers)
-                if watchers_response.status_code == 200:
-                    ticket_data['all_watchers'] = watchers_response.json()
-            except:
-                pass  # Watchers may not be accessible
+            # Watchers may not be accessible
+            if not isinstance(watchers_response, Exception) and watchers_response.status_code == 200:
+                ticket_data['all_watchers'] = watchers_response.json()
 
             tickets.append(ticket_data)
-            fields = ticket_data.get('fields', {})
-            rendered_fields = ticket_data.get('renderedFields', {})
-            names = ticket_data.get('names', {})
-            print(f"[Jira] ✓ Fetched {key} with full details (fields: {len(fields)})")
-            print(f"[Jira] DEBUG - Available field keys: {list(fields.keys())}")
-            print(f"[Jira] DEBUG - Rendered fields keys: {list(rendered_fields.keys())}")
-
-            # Debug: Print actual content of rendered fields
-            for field_name in ['summary', 'description', 'status', 'priority']:
-                if field_name in rendered_fields:
-                    val = rendered_fields.get(field_name)
-                    print(f"[Jira] DEBUG - renderedFields['{field_name}'] = {str(val)[:200] if val else 'None'}")
-
-            # Save raw ticket data for inspection
-            import json
-            debug_file = f"jira_ticket_debug_{key}.json"
-            with open(debug_file, 'w') as f:
-                json.dump(ticket_data, f, indent=2, default=str)
-            print(f"[Jira] DEBUG - Full ticket data saved to {debug_file}")
+            logger.info("[Jira] ✓ Fetched %s with full details (fields: %d)", key, len(ticket_data.get('fields', {})))
+
+            # Save raw ticket data for inspection (opt-in, payloads can be large)
+            if debug_dump:
+                debug_file = f"jira_ticket_debug_{key}.json"
+                with open(debug_file, 'wb') as f:
+                    f.write(orjson.dumps(ticket_data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS, default=str))
+                logger.debug("[Jira] Full ticket data saved to %s", debug_file)
         except requests.exceptions.HTTPError as e:
             error_msg = f"HTTP {e.response.status_code} for {key}: {e.response.text[:200]}"
-            print(f"[Jira] ✗ {error_msg}")
+            logger.error("[Jira] ✗ %s", error_msg)
             errors.append(error_msg)
         except Exception as e:
             error_msg = f"Error fetching {key}: {str(e)}"
-            print(f"[Jira] ✗ {error_msg}")
+            logger.error("[Jira] ✗ %s", error_msg)
             errors.append(error_msg)
 
     if not tickets and errors:
@@ -526,7 +1123,7 @@ def fetch_confluence_page(page_url):
     # Format: https://your-instance.atlassian.net/wiki/spaces/SPACE/pages/PAGEID/Page+Title
     try:
         # Extract page ID from URL
-        match = re.search(r'/pages/(\d+)', page_url)
+        match = _CONFLUENCE_PAGE_RE.search(page_url)
         if not match:
             return None, "Invalid Confluence page URL format. Expected format: .../pages/PAGEID/..."
 
@@ -572,8 +1169,12 @@ def fetch_confluence_page(page_url):
         return None, f"Error fetching Confluence page: {str(e)}"
 
 
-def fetch_github_pr(pr_url):
-    """Fetch GitHub PR data with ALL available details"""
+def fetch_github_pr(pr_url, include_timeline=True):
+    """Fetch GitHub PR data with ALL available details
+
+    include_timeline: also fetch issue timeline events (only the single-PR
+    route reads them)
+    """
     github_token = os.getenv("GITHUB_TOKEN")
 
     # Parse PR URL: https://github.com/owner/repo/pull/number
@@ -592,61 +1193,50 @@ def fetch_github_pr(pr_url):
 
     try:
         base_url = f"https://api.github.com/repos/{owner}/{repo}/pulls/{pr_number}"
+        issue_url = f"https://api.github.com/repos/{owner}/{repo}/issues/{pr_number}"
+        timeline_headers = headers.copy()
+        timeline_headers["Accept"] = "application/vnd.github.mockingbird-preview+json"
+
+        # PR, file changes, issue comments (general PR comments), review comments
+        # (inline code comments), reviews, commits, timeline and issue details
+        requests_to_send = {
+            'pr': (base_url, headers),
+            'files': (f"{base_url}/files", headers),
+            'issue_comments': (f"{issue_url}/comments", headers),
+            'review_comments': (f"{base_url}/comments", headers),
+            'reviews': (f"{base_url}/reviews", headers),
+            'commits': (f"{base_url}/commits", headers),
+            'timeline': (f"{issue_url}/timeline", timeline_headers),
+            'issue': (issue_url, headers),
+        }
+        if not include_timeline:
+            del requests_to_send['timeline']
 
-        # Fetch PR data
         print(f"[GitHub] Fetching PR #{pr_number} from {owner}/{repo}...")
-        response = requests.get(base_url, headers=headers)
+        with ThreadPoolExecutor(max_workers=len(requests_to_send)) as executor:
+            futures = {
+                name: executor.submit(github_session.get, url, headers=request_headers)
+                for name, (url, request_headers) in requests_to_send.items()
+            }
+            responses = {name: future.result() for name, future in futures.items()}
+
+        # Each response body is parsed, trimmed to the fields PR documents use and
+        # dropped, so only the trimmed sections outlive this block
+        response = responses.pop('pr')
         response.raise_for_status()
-        pr_data = response.json()
+        pr_data = orjson.loads(response.content)
 
-        # Fetch PR files with changes
-        print(f"[GitHub] Fetching file changes...")
-        files_url = f"{base_url}/files"
-        files_response = requests.get(files_url, headers=headers)
+        files_response = responses.pop('files')
         files_response.raise_for_status()
-        pr_data['files'] = files_response.json()
+        pr_data['files'] = slim_pr_section('files', orjson.loads(files_response.content))
 
-        # Fetch all issue comments (general PR comments)
-        print(f"[GitHub] Fetching issue comments...")
-        issue_url = f"https://api.github.com/repos/{owner}/{repo}/issues/{pr_number}"
-        comments_url = f"{issue_url}/comments"
-        comments_response = requests.get(comments_url, headers=headers)
-        if comments_response.status_code == 200:
-            pr_data['issue_comments'] = comments_response.json()
-
-        # Fetch all review comments (inline code comments)
-        print(f"[GitHub] Fetching review comments...")
-        review_comments_url = f"{base_url}/comments"
-        review_comments_response = requests.get(review_comments_url, headers=headers)
-        if review_comments_response.status_code == 200:
-            pr_data['review_comments'] = review_comments_response.json()
-
-        # Fetch all reviews (approvals, changes requested, etc.)
-        print(f"[GitHub] Fetching reviews...")
-        reviews_url = f"{base_url}/reviews"
-        reviews_response = requests.get(reviews_url, headers=headers)
-        if reviews_response.status_code == 200:
-            pr_data['reviews'] = reviews_response.json()
-
-        # Fetch all commits in the PR
-        print(f"[GitHub] Fetching commits...")
-        commits_url = f"{base_url}/commits"
-        commits_response = requests.get(commits_url, headers=headers)
-        if commits_response.status_code == 200:
-            pr_data['commits'] = commits_response.json()
-
-        # Fetch timeline/events
-        print(f"[GitHub] Fetching timeline...")
-        timeline_headers = headers.copy()
-        timeline_headers["Accept"] = "application/vnd.github.mockingbird-preview+json"
-        timeline_url = f"{issue_url}/timeline"
-        timeline_response = requests.get(timeline_url, headers=timeline_headers)
-        if timeline_response.status_code == 200:
-            pr_data['timeline'] = timeline_response.json()
-
-        # Fetch linked issues (if any)
-        print(f"[GitHub] Fetching issue details...")
-        issue_response = requests.get(issue_url, headers=headers)
+        for name in ('issue_comments', 'review_comments', 'reviews', 'commits', 'timeline'):
+            section_response = responses.pop(name, None)
+            if section_response is not None and section_response.status_code == 200:
+                pr_data[name] = slim_pr_section(name, orjson.loads(section_response.content))
+
+        # Linked issue details (if any)
+        issue_response = responses.pop('issue')
         if issue_response.status_code == 200:
             issue_data = issue_response.json()
             pr_data['labels'] = issue_data.get('labels', [])
@@ -666,6 +1256,41 @@ def fetch_github_pr(pr_url):
         return None, f"Error fetching GitHub PR: {str(e)}"
 
 
+def slim_pr_section(name, items):
+    """Keep only the PR_SECTION_FIELDS of a GitHub sub-resource listing"""
+    keep = PR_SECTION_FIELDS[name]
+    slim = []
+    for item in items[:PR_SECTION_LIMITS.get(name)]:
+        entry = {key: item[key] for key in keep if key in item}
+        for key in ('user', 'actor'):
+            if isinstance(entry.get(key), dict):
+                entry[key] = {field: entry[key][field] for field in ('login', 'name') if field in entry[key]}
+        if isinstance(entry.get('commit'), dict):
+            entry['commit'] = {field: entry['commit'][field] for field in ('author', 'message') if field in entry['commit']}
+        if isinstance(entry.get('patch'), str):
+            entry['patch'] = entry['patch'][:500]
+        slim.append(entry)
+    return slim
+
+
+def build_pr_activity(reviews, issue_comments, review_comments):
+    """Build the structured JSON columns (PR_ACTIVITY_FIELDS, in order) stored alongside a PR document"""
+    return dict(zip(PR_ACTIVITY_FIELDS, (
+        [
+            {'reviewer': r['author'], 'state': r['state'], 'body': (r['body'] or '')[:300]}
+            for r in reviews[:100]
+        ],
+        [
+            {'author': c['author'], 'body': (c['body'] or '')[:500]}
+            for c in issue_comments[:100]
+        ],
+        [
+            {'author': c['author'], 'path': c['path'], 'line': c.get('line'), 'body': (c['body'] or '')[:300]}
+            for c in review_comments[:100]
+        ]
+    )))
+
+
 ##############################################################################
 # HEALTH & STATUS ENDPOINTS
 ##############################################################################
@@ -747,11 +1372,11 @@ def analyze_codebase():
         if not os.path.exists(directory):
             return jsonify({'success': False, 'message': 'Directory does not exist'})
 
-        print(f"[API] Starting codebase analysis with progress tracking: {directory}")
+        logger.info("[API] Starting codebase analysis with progress tracking: %s", directory)
         if github_url:
-            print(f"[API] GitHub URL: {github_url}")
-        print(f"[API] Pull latest: {pull_latest}")
-        print(f"[API] Privacy: {'Private' if is_private else 'Public'}")
+            logger.info("[API] GitHub URL: %s", github_url)
+        logger.info("[API] Pull latest: %s", pull_latest)
+        logger.info("[API] Privacy: %s", 'Private' if is_private else 'Public')
 
         # Generate unique progress file for this analysis
         progress_file = f"analysis_progress_{hashlib.md5(directory.encode()).hexdigest()[:8]}.json"
@@ -766,18 +1391,18 @@ def analyze_codebase():
                     progress_file=progress_file,
                     skip_duplicates=True
                 )
-                print(f"[API] ✅ Analysis completed: {result.get('files_analyzed', 0)} files")
+                logger.info("[API] ✅ Analysis completed: %s files", result.get('files_analyzed', 0))
+                clear_semantic_cache()
+                _stats_cache.clear()
             except Exception as e:
-                print(f"[API] ❌ Background analysis error: {e}")
-                import traceback
+                logger.error("[API] ❌ Background analysis error: %s", e)
                 traceback.print_exc()
 
         # Start analysis in background thread
-        import threading
         thread = threading.Thread(target=run_analysis, daemon=True)
         thread.start()
 
-        print(f"[API] Analysis started in background. Progress file: {progress_file}")
+        logger.info("[API] Analysis started in background. Progress file: %s", progress_file)
 
         # Return immediately with progress file
         return jsonify({
@@ -788,10 +1413,9 @@ def analyze_codebase():
         })
 
     except Exception as e:
-        import traceback
         error_trace = traceback.format_exc()
-        print(f"[API] ❌ Error starting codebase analysis: {e}")
-        print(f"[API] Full traceback:\n{error_trace}")
+        logger.error("[API] ❌ Error starting codebase analysis: %s", e)
+        logger.error("[API] Full traceback:\n%s", error_trace)
         return jsonify({
             'success': False,
             'message': str(e),
@@ -810,16 +1434,15 @@ def get_analysis_progress():
     try:
         progress_file = request.args.get('progress_file', 'analysis_progress.json')
 
-        if not os.path.exists(progress_file):
+        try:
+            progress_data = read_progress(progress_file)
+        except FileNotFoundError:
             return jsonify({'status': 'not_started', 'message': 'No analysis in progress'}), 404
 
-        with open(progress_file, 'r') as f:
-            progress_data = json.load(f)
-
         return jsonify(progress_data)
 
     except Exception as e:
-        print(f"[API] Error reading progress: {e}")
+        logger.error("[API] Error reading progress: %s", e)
         return jsonify({'error': str(e)}), 500
 
 
@@ -844,12 +1467,20 @@ def search_codebase():
         if not query:
             return jsonify({'success': False, 'message': 'Query required'})
 
-        print(f"[API] Searching codebase: {query}")
+        logger.info("[API] Searching codebase: %s", query)
         if privacy_password:
-            print(f"[API] Privacy mode: Enabled")
-
-        analyzer = CodebaseAnalyzer()
-        results = analyzer.search_code(query, top_k, privacy_password)
+            logger.info("[API] Privacy mode: Enabled")
+
+        cache_vector = semantic_query_vector(query)
+        cache_scope = ('search_codebase', top_k, privacy_password)
+        results = semantic_cache_get(cache_scope, cache_vector)
+        if results is None:
+            analyzer = get_analyzer()
+            results = analyzer.search_code(query, top_k, privacy_password)
+            if results:
+                semantic_cache_put(cache_scope, cache_vector, results)
+        else:
+            logger.info("[API] Semantic cache hit for codebase search")
 
         return jsonify({
             'success': True,
@@ -858,7 +1489,7 @@ def search_codebase():
         })
 
     except Exception as e:
-        print(f"[API] Error searching codebase: {e}")
+        logger.error("[API] Error searching codebase: %s", e)
         return jsonify({'success': False, 'message': str(e)})
 
 
@@ -883,10 +1514,17 @@ def query_code_with_ai():
         if not question:
             return jsonify({'success': False, 'message': 'Question required'})
 
-        print(f"[API] Code query with {ai_model}: {question}")
+        logger.info("[API] Code query with %s: %s", ai_model, question)
+
+        cache_vector = semantic_query_vector(question)
+        cache_scope = ('query_code_with_ai', ai_model, top_k)
+        cached = semantic_cache_get(cache_scope, cache_vector)
+        if cached is not None:
+            logger.info("[API] Semantic cache hit for code query")
+            return jsonify(cached)
 
         # Search codebase
-        analyzer = CodebaseAnalyzer()
+        analyzer = get_analyzer()
         code_results = analyzer.search_code(question, top_k)
 
         if not code_results:
@@ -900,20 +1538,23 @@ def query_code_with_ai():
         # Build context for AI
         context_docs = []
         for result in code_results:
+            # Only non-empty header lines; ask_claude trims each document, so
+            # header space is taken from the code that follows
+            parts = ["File: ", result['file_path'], "\nLanguage: ", result['language']]
+            if result['summary']:
+                parts += ["\nSummary: ", result['summary']]
+            classes = result.get('classes')
+            if classes:
+                parts += ["\nClasses: ", ', '.join(classes[:5])]
+            functions = result.get('functions')
+            if functions:
+                parts += ["\nFunctions: ", ', '.join(functions[:5])]
+            content = result['content']
+            parts += ["\n\nCode:\n", content if len(content) <= 1500 else content[:1500]]
+
             context_docs.append({
                 'title': f"{result['file_path']} ({result['language']})",
-                'content': f"""
-File: {result['file_path']}
-Language: {result['language']}
-Summary: {result['summary']}
-Classes: {', '.join(result.get('classes', [])[:5])}
-Functions: {', '.join(result.get('functions', [])[:5])}
-LOC: {result['lines_of_code']}
-Complexity: {result['complexity']}
-
-Code:
-{result['content'][:1500]}
-                """.strip(),
+                'content': ''.join(parts).strip(),
                 'score': result['score'],
                 'collection': 'codebase_analysis',
                 'source_type': 'code',
@@ -924,7 +1565,7 @@ Code:
         # Query AI
         if ai_model == 'claude':
             rag = ClaudeRAG()
-            answer = rag.ask_claude(question, context_docs)
+            answer = rag.ask_claude(question, context_docs, cache_context=True)
 
             # Get token usage
             usage_info = getattr(rag, '_last_usage', None)
@@ -957,26 +1598,34 @@ Code:
                 confidence = source_confidence
                 confidence['type'] = 'source_only'
 
-            return jsonify({
+            response = {
                 'success': True,
                 'answer': answer,
                 'sources': context_docs,
                 'model': 'claude-sonnet-4-5',
                 'confidence_score': confidence,
                 'token_usage': usage_info
-            })
+            }
+            # ask_claude returns failures as answer text and only records usage on success
+            answered = usage_info is not None
         else:
             rag = OllamaRAG()
             result = rag.query_with_context(question, collection_name="codebase_analysis", top_k=0)
             # Override with our code results
             result['sources'] = context_docs
-            return jsonify({
+            response = {
                 'success': True,
                 **result
-            })
+            }
+            answered = not result.get('answer', '').startswith('Error:')
+
+        # Never replay an error for the TTL, nor the first caller's token usage
+        if answered:
+            semantic_cache_put(cache_scope, cache_vector, {**response, 'token_usage': None})
+        return jsonify(response)
 
     except Exception as e:
-        print(f"[API] Error querying code: {e}")
+        logger.error("[API] Error querying code: %s", e)
         return jsonify({'success': False, 'message': str(e)})
 
 
@@ -984,35 +1633,37 @@ Code:
 def codebase_stats():
     """Get statistics about analyzed codebase"""
     try:
-        analyzer = CodebaseAnalyzer()
+        cached = _stats_cache.get('codebase_analysis')
+        if cached and time.time() - cached[0] < STATS_CACHE_TTL:
+            return jsonify(cached[1])
+
+        analyzer = get_analyzer()
 
         if not analyzer.connect_milvus():
             return jsonify({'success': False, 'message': 'Failed to connect to Milvus'})
 
         if not utility.has_collection('codebase_analysis'):
-            return jsonify({
+            stats = {
                 'success': True,
                 'analyzed': False,
                 'message': 'No codebase analyzed yet'
-            })
-
-        collection = Collection(name='codebase_analysis')
-        collection.load()
+            }
+        else:
+            collection = Collection(name='codebase_analysis')
 
-        # Get total count
-        total_entries = collection.num_entities
+            # Get total count (num_entities does not need the collection loaded)
+            stats = {
+                'success': True,
+                'analyzed': True,
+                'total_entries': collection.num_entities,
+                'collection': 'codebase_analysis'
+            }
 
-        collection.release()
-
-        return jsonify({
-            'success': True,
-            'analyzed': True,
-            'total_entries': total_entries,
-            'collection': 'codebase_analysis'
-        })
+        _stats_cache['codebase_analysis'] = (time.time(), stats)
+        return jsonify(stats)
 
     except Exception as e:
-        print(f"[API] Error getting stats: {e}")
+        logger.error("[API] Error getting stats: %s", e)
         return jsonify({'success': False, 'message': str(e)})
 
 
@@ -1025,9 +1676,6 @@ def index():
 @app.route('/upload_file', methods=['POST'])
 def upload_file():
     """Handle file upload with automatic chunking for large CSV files"""
-    import time
-    import pandas as pd
-
     start_time = time.time()  # Track response time
 
     if 'file' not in request.files:
@@ -1045,11 +1693,11 @@ def upload_file():
         filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
         file.save(filepath)
 
-        file_size_mb = os.path.getsize(filepath) / (1024 * 1024)
-        file_ext = filename.rsplit('.', 1)[1].lower()
+        file_size = os.stat(filepath).st_size
+        file_size_mb = file_size / (1024 * 1024)
 
         # Check if it's an image
-        file_ext = filename.rsplit('.', 1)[1].lower()
+        file_ext = filename.rsplit('.', 1)[1].lower() if '.' in filename else ''
         is_image = file_ext in {'png', 'jpg', 'jpeg', 'gif', 'bmp', 'webp'}
 
         if is_image:
@@ -1062,7 +1710,7 @@ def upload_file():
 
             # Extract vector from image
             try:
-                vector = image_vectorizer.extract_vector(filepath)
+                vector = extract_image_vector(filepath)
 
                 # Use image description as content
                 content = f"Image: {filename} (Vector extracted using CLIP)"
@@ -1070,7 +1718,7 @@ def upload_file():
 
                 metadata = {
                     'filename': filename,
-                    'size': os.path.getsize(filepath),
+                    'size': file_size,
                     'upload_time': datetime.now().isoformat(),
                     'type': 'image',
                     'vector_model': 'CLIP'
@@ -1105,47 +1753,91 @@ def upload_file():
         elif file_ext == 'csv':
             # Handle CSV files with automatic chunking
             try:
-                df = pd.read_csv(filepath)
-                total_rows = len(df)
-
                 # Define chunk size (1000 rows per chunk for optimal performance)
                 CHUNK_SIZE = 1000
                 chunks_processed = 0
+                chunks_skipped = 0
                 rows_stored = 0
 
-                # Process in chunks
-                for i in range(0, total_rows, CHUNK_SIZE):
-                    chunk_df = df.iloc[i:i+CHUNK_SIZE]
-                    chunk_json = chunk_df.to_json(orient='records')
-
-                    # Create hash for this chunk
-                    chunk_hash = hashlib.md5(f"{filename}_{i}".encode()).hexdigest()
-
-                    metadata = {
-                        'filename': filename,
-                        'chunk_index': chunks_processed + 1,
-                        'chunk_start_row': i,
-                        'chunk_end_row': min(i + CHUNK_SIZE, total_rows),
-                        'total_rows': total_rows,
-                        'file_size_mb': file_size_mb,
-                        'upload_time': datetime.now().isoformat(),
-                        'type': 'csv_chunk'
-                    }
-
-                    # Store chunk
-                    success, message = store_document(
-                        collection_name=collection_name,
-                        source_type='csv',
-                        source_id=chunk_hash,
-                        title=f"{filename} (Chunk {chunks_processed + 1})",
-                        content=chunk_json,
-                        metadata=metadata,
-                        url=filepath
-                    )
+                # Count rows with a single-column pass so the full frame is never materialised
+                total_rows = sum(len(c) for c in pd.read_csv(filepath, usecols=[0], chunksize=CSV_COUNT_CHUNK_SIZE))
+
+                # Stream the file one chunk at a time; the Milvus stores are I/O-bound,
+                # so they overlap on a thread pool while the next chunk is parsed
+                reader = pd.read_csv(filepath, chunksize=CHUNK_SIZE)
+                pending = {}
+
+                def collect(done):
+                    nonlocal chunks_processed, rows_stored
+                    for future in done:
+                        chunk_rows = pending.pop(future)
+                        success, message = future.result()
+                        if success:
+                            chunks_processed += 1
+                            rows_stored += chunk_rows
+
+                # Chunks are keyed by a hash of their content; a batch's hashes are checked
+                # against Milvus in one query so unchanged chunks skip embed + insert
+                batch = []
+                seen_hashes = set()
+
+                def submit_batch(executor):
+                    nonlocal chunks_processed, chunks_skipped
+                    existing = existing_source_ids(collection_name, [item['source_id'] for item in batch])
+                    for item in batch:
+                        chunk_rows = item.pop('rows')
+                        if item['source_id'] in existing:
+                            chunks_processed += 1
+                            chunks_skipped += 1
+                            continue
+                        pending[executor.submit(store_document, **item)] = chunk_rows
+
+                        # Bound the chunks held in memory while stores are in flight
+                        if len(pending) >= CSV_STORE_WORKERS * 2:
+                            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                            collect(done)
+                    batch.clear()
+
+                with ThreadPoolExecutor(max_workers=CSV_STORE_WORKERS) as executor:
+                    for chunk_idx, chunk_df in enumerate(reader):
+                        i = chunk_idx * CHUNK_SIZE
+                        chunk_json = csv_chunk_json(chunk_df)
+
+                        # Hash the file name with the content so dedup only skips re-uploads of
+                        # the same file, not identical chunks that appear in different files
+                        chunk_hash = hashlib.md5((filename + chunk_json).encode()).hexdigest()
+                        if chunk_hash in seen_hashes:
+                            chunks_processed += 1
+                            chunks_skipped += 1
+                            continue
+                        seen_hashes.add(chunk_hash)
+
+                        metadata = {
+                            'filename': filename,
+                            'chunk_index': chunk_idx + 1,
+                            'chunk_start_row': i,
+                            'chunk_end_row': min(i + CHUNK_SIZE, total_rows),
+                            'total_rows': total_rows,
+                            'file_size_mb': file_size_mb,
+                            'upload_time': datetime.now().isoformat(),
+                            'type': 'csv_chunk'
+                        }
+
+                        batch.append({
+                            'collection_name': collection_name,
+                            'source_type': 'csv',
+                            'source_id': chunk_hash,
+                            'title': f"{filename} (Chunk {chunk_idx + 1})",
+                            'content': chunk_json,
+                            'metadata': metadata,
+                            'url': filepath,
+                            'rows': len(chunk_df)
+                        })
+                        if len(batch) >= CSV_STORE_WORKERS:
+                            submit_batch(executor)
 
-                    if success:
-                        chunks_processed += 1
-                        rows_stored += len(chunk_df)
+                    submit_batch(executor)
+                    collect(as_completed(list(pending)))
 
                 # Clean up
                 os.remove(filepath)
@@ -1159,6 +1851,7 @@ def upload_file():
                     'file_size_mb': round(file_size_mb, 2),
                     'total_rows': total_rows,
                     'chunks_processed': chunks_processed,
+                    'chunks_skipped': chunks_skipped,
                     'rows_stored': rows_stored,
                     'processing_mode': 'chunked' if chunks_processed > 1 else 'single',
                     'response_time_seconds': round(response_time, 3)
@@ -1175,13 +1868,14 @@ def upload_file():
 
         else:
             # Handle other text-based files
+            # Hash the bytes on disk so the content is not copied just to hash it
+            file_hash = file_md5(filepath)
             content = read_file_content(filepath, filename)
 
             # Store in Milvus
-            file_hash = hashlib.md5(content.encode()).hexdigest()
             metadata = {
                 'filename': filename,
-                'size': os.path.getsize(filepath),
+                'size': file_size,
                 'upload_time': datetime.now().isoformat()
             }
 
@@ -1212,9 +1906,6 @@ def upload_file():
 @app.route('/fetch_jira', methods=['POST'])
 def fetch_jira():
     """Fetch and store Jira tickets"""
-    import time
-    import hashlib
-    import threading
     start_time = time.time()
 
     jira_input = request.json.get('jira_input', '')
@@ -1227,14 +1918,14 @@ def fetch_jira():
         if not item:
             continue
         # Check if it's a URL and extract the key
-        url_match = re.search(r'/browse/([A-Z]+-\d+)', item)
+        url_match = _JIRA_BROWSE_RE.search(item)
         if url_match:
             parsed_keys.append(url_match.group(1))
         # Check if it's just a ticket key (e.g., NEXUS-12345)
-        elif re.match(r'^[A-Z]+-\d+$', item):
+        elif _JIRA_KEY_RE.match(item):
             parsed_keys.append(item)
     keys = parsed_keys
-    print(f"[Jira] Parsed keys from input '{jira_input}': {keys}")
+    logger.info("[Jira] Parsed keys from input '%s': %s", jira_input, keys)
 
     if not keys:
         duration_ms = (time.time() - start_time) * 1000
@@ -1266,7 +1957,7 @@ def fetch_jira():
             tracker.set_phase('fetching', 'processing')
 
             tickets, error = fetch_jira_tickets(keys)
-            print(f"[Jira] Fetched {len(tickets) if tickets else 0} tickets, error: {error}")
+            logger.info("[Jira] Fetched %s tickets, error: %s", len(tickets) if tickets else 0, error)
 
             if error:
                 tracker.error(error)
@@ -1283,18 +1974,38 @@ def fetch_jira():
 
             tracker.set_phase('processing', 'processing')
 
-            # Store each ticket with ALL details
+            # Build each ticket with ALL details, then embed and store them together
+            jira_url = os.getenv("JIRA_URL", "")
+            docs = []
+            progress_items = []
             stored_count = 0
+
+            def store_pending():
+                """Embed and insert the buffered tickets in one batch, then report each"""
+                nonlocal stored_count
+                if not docs:
+                    return
+                success, message = store_documents_bulk(collection_name, docs)
+                if success:
+                    stored_count += len(docs)
+                else:
+                    logger.error("[Jira] ✗ %s", message)
+
+                for key, summary_text, comments_count, history_count in progress_items:
+                    if success:
+                        tracker.increment(current_item=f"{key}: {summary_text}...", successful=True)
+                        logger.info("[Jira] Stored %s with %s comments, %s history items", key, comments_count, history_count)
+                    else:
+                        tracker.increment(current_item=f"{key}", successful=False)
+                docs.clear()
+                progress_items.clear()
+
             for ticket in tickets:
                 key = ticket.get('key', 'Unknown')
                 fields = ticket.get('fields', {})
                 rendered_fields = ticket.get('renderedFields', {})
                 changelog = ticket.get('changelog', {})
 
-                print(f"[Jira] DEBUG - Processing ticket {key}")
-                print(f"[Jira] DEBUG - Fields keys: {list(fields.keys())}")
-                print(f"[Jira] DEBUG - Rendered fields keys: {list(rendered_fields.keys())}")
-
                 # Special handling for subtasks - extract from parent if direct fields unavailable
                 parent_issue = fields.get('parent', {})
                 parent_fields = parent_issue.get('fields', {})
@@ -1317,7 +2028,7 @@ def fetch_jira():
                         parent_value = parent_fields.get(field_name)
                         if parent_value is not None and parent_value != '':
                             # Add note that this came from parent
-                            print(f"[Jira] DEBUG - Using parent's {field_name} for subtask")
+                            logger.debug("[Jira] Using parent's %s for subtask", field_name)
                             return parent_value
 
                     return default
@@ -1328,7 +2039,7 @@ def fetch_jira():
                     parent_summary = parent_fields.get('summary', '')
                     if parent_summary:
                         summary = f"[Subtask of {parent_issue.get('key')}] {parent_summary}"
-                        print(f"[Jira] DEBUG - Created summary from parent: {summary[:100]}")
+                        logger.debug("[Jira] Created summary from parent: %s", summary[:100])
                 if not summary:
                     summary = f"{key} (Details restricted)"
 
@@ -1342,50 +2053,29 @@ def fetch_jira():
                 creator = fields.get('creator', {})
 
                 # Extract changelog/history
-                history_items = []
-                for history in changelog.get('histories', []):
-                    history_items.append({
-                        'created': history.get('created'),
-                        'author': history.get('author', {}).get('displayName'),
-                        'items': history.get('items', [])
-                    })
+                history_items = [{
+                    'created': history.get('created'),
+                    'author': (history.get('author') or {}).get('displayName'),
+                    'items': history.get('items', [])
+                } for history in (changelog or {}).get('histories') or ()]
 
                 # Extract comments
-                comments = []
-                all_comments = ticket.get('all_comments', {})
-                for comment in all_comments.get('comments', []):
-                    comments.append({
-                        'author': comment.get('author', {}).get('displayName'),
-                        'created': comment.get('created'),
-                        'body': comment.get('body')
-                    })
+                comments = [{
+                    'author': (comment.get('author') or {}).get('displayName'),
+                    'created': comment.get('created'),
+                    'body': comment.get('body')
+                } for comment in (ticket.get('all_comments') or {}).get('comments') or ()]
 
                 # Extract attachments
-                attachments = []
-                for attachment in fields.get('attachment', []):
-                    attachments.append({
-                        'filename': attachment.get('filename'),
-                        'created': attachment.get('created'),
-                        'size': attachment.get('size'),
-                        'mimeType': attachment.get('mimeType')
-                    })
+                attachments = [{
+                    'filename': attachment.get('filename'),
+                    'created': attachment.get('created'),
+                    'size': attachment.get('size'),
+                    'mimeType': attachment.get('mimeType')
+                } for attachment in fields.get('attachment') or ()]
 
                 # Extract watchers
-                watchers = []
-                all_watchers = ticket.get('all_watchers', {})
-                for watcher in all_watchers.get('watchers', []):
-                    watchers.append(watcher.get('displayName'))
-
-                # Build comprehensive metadata - use rendered fields for text fields if needed
-                def extract_text_from_html(html_text):
-                    """Extract plain text from HTML if renderedFields contains HTML"""
-                    if not html_text or not isinstance(html_text, str):
-                        return html_text
-                    from bs4 import BeautifulSoup
-                    try:
-                        return BeautifulSoup(html_text, 'html.parser').get_text()
-                    except:
-                        return html_text
+                watchers = [watcher.get('displayName') for watcher in (ticket.get('all_watchers') or {}).get('watchers') or ()]
 
                 # Extract complex fields with parent fallback
                 status_obj = get_field('status', {})
@@ -1433,8 +2123,6 @@ def fetch_jira():
                     **parent_info  # Add parent fields if exists
                 }
 
-                print(f"[Jira] DEBUG - Final metadata: status={metadata['status']}, priority={metadata['priority']}, type={metadata['issue_type']}")
-
                 # Build comprehensive content with all details
                 content_parts = [
                     f"Summary: {summary}",
@@ -1469,23 +2157,20 @@ def fetch_jira():
 
                 content = '\n'.join(content_parts)
 
-                success, _ = store_document(
-                    collection_name=collection_name,
-                    source_type='jira',
-                    source_id=key,
-                    title=f"{key}: {summary}",
-                    content=content,
-                    metadata=metadata,
-                    url=f"{jira_url}/browse/{key}"
-                )
+                docs.append({
+                    'source_type': 'jira',
+                    'source_id': key,
+                    'title': f"{key}: {summary}",
+                    'content': content,
+                    'metadata': metadata,
+                    'url': f"{jira_url}/browse/{key}"
+                })
+                summary_text = str(summary)[:50] if summary else "No summary"
+                progress_items.append((key, summary_text, len(comments), len(history_items)))
+                if len(docs) >= JIRA_STORE_BATCH_SIZE:
+                    store_pending()
 
-                if success:
-                    stored_count += 1
-                    summary_text = str(summary)[:50] if summary else "No summary"
-                    tracker.increment(current_item=f"{key}: {summary_text}...", successful=True)
-                    print(f"[Jira] Stored {key} with {len(comments)} comments, {len(history_items)} history items")
-                else:
-                    tracker.increment(current_item=f"{key}", successful=False)
+            store_pending()
 
             tracker.complete(f'Successfully stored {stored_count}/{len(tickets)} tickets')
 
@@ -1501,11 +2186,10 @@ def fetch_jira():
             )
 
         except Exception as e:
-            import traceback
             error_details = traceback.format_exc()
             tracker.error(str(e))
-            print(f"[Jira] Error: {e}")
-            print(f"[Jira] Traceback:\n{error_details}")
+            logger.error("[Jira] Error: %s", e)
+            logger.error("[Jira] Traceback:\n%s", error_details)
 
     # Start background thread
     thread = threading.Thread(target=run_jira_fetch, daemon=True)
@@ -1525,8 +2209,7 @@ def get_jira_progress():
     """Get Jira fetch progress"""
     progress_file = request.args.get('progress_file', 'jira_progress.json')
     try:
-        with open(progress_file, 'r') as f:
-            return jsonify(json.load(f))
+        return jsonify(read_progress(progress_file))
     except FileNotFoundError:
         return jsonify({'status': 'not_found', 'message': 'Progress file not found'}), 404
     except Exception as e:
@@ -1535,130 +2218,167 @@ def get_jira_progress():
 
 @app.route('/fetch_confluence', methods=['POST'])
 def fetch_confluence():
-    """Fetch and store Confluence page"""
+    """Fetch and store Confluence page in a background thread, reporting through a progress file"""
     page_url = request.json.get('page_url', '')
     collection_name = request.json.get('collection', 'confluence_pages')
 
     if not page_url:
         return jsonify({'success': False, 'message': 'No Confluence page URL provided'})
 
-    page_data, error = fetch_confluence_page(page_url)
-
-    if error:
-        return jsonify({'success': False, 'message': error})
-
-    # Extract page details
-    page_id = page_data.get('id', 'unknown')
-    title = page_data.get('title', 'No title')
-    page_type = page_data.get('type', 'page')
-
-    # Extract space information
-    space = page_data.get('space', {})
-    space_key = space.get('key', 'Unknown')
-    space_name = space.get('name', 'Unknown')
-
-    # Extract version information
-    version_info = page_data.get('version', {})
-    version_number = version_info.get('number', 1)
-    last_modified_by = version_info.get('by', {}).get('displayName', 'Unknown')
-    last_modified = version_info.get('when', '')
-
-    # Extract creation information from history
-    history = page_data.get('history', {})
-    created_by = history.get('createdBy', {}).get('displayName', 'Unknown')
-    created_date = history.get('createdDate', '')
-
-    # Extract body content (HTML)
-    body_storage = page_data.get('body', {}).get('storage', {}).get('value', '')
-    body_view = page_data.get('body', {}).get('view', {}).get('value', '')
-
-    # Convert HTML to plain text using BeautifulSoup
-    soup = BeautifulSoup(body_storage or body_view, 'html.parser')
-
-    # Remove script and style elements
-    for script in soup(["script", "style"]):
-        script.decompose()
-
-    # Get text and clean it up
-    text = soup.get_text()
-    lines = (line.strip() for line in text.splitlines())
-    chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-    body_text = '\n'.join(chunk for chunk in chunks if chunk)
-
-    # Extract ancestors (parent pages) for breadcrumb
-    ancestors = []
-    for ancestor in page_data.get('ancestors', []):
-        ancestors.append({
-            'id': ancestor.get('id'),
-            'title': ancestor.get('title')
-        })
+    # Create unique progress file
+    progress_file = f"confluence_progress_{hashlib.md5(page_url.encode()).hexdigest()[:8]}.json"
 
-    # Build comprehensive metadata
-    metadata = {
-        'page_id': page_id,
-        'page_type': page_type,
-        'space_key': space_key,
-        'space_name': space_name,
-        'version': version_number,
-        'created_by': created_by,
-        'created_date': created_date,
-        'last_modified_by': last_modified_by,
-        'last_modified': last_modified,
-        'ancestors': ancestors,
-        'ancestor_titles': [a['title'] for a in ancestors],
-        'has_children': len(page_data.get('children', {}).get('page', {}).get('results', [])) > 0,
-    }
+    def run_confluence_fetch():
+        """Background thread for fetching a Confluence page"""
+        from universal_progress_tracker import UniversalProgressTracker
 
-    # Build comprehensive content
-    content_parts = [
-        f"Title: {title}",
-        f"\nSpace: {space_name} ({space_key})",
-        f"\nCreated by: {created_by} on {created_date[:10] if created_date else 'Unknown'}",
-        f"\nLast modified by: {last_modified_by} on {last_modified[:10] if last_modified else 'Unknown'}",
-        f"\nVersion: {version_number}",
-    ]
+        tracker = UniversalProgressTracker(
+            progress_file=progress_file,
+            task_type="confluence",
+            task_name="Fetching Confluence Page"
+        )
 
-    # Add breadcrumb (ancestor path)
-    if ancestors:
-        breadcrumb = ' > '.join([a['title'] for a in ancestors])
-        content_parts.append(f"\nBreadcrumb: {breadcrumb} > {title}")
+        try:
+            tracker.set_total(1)
+            tracker.set_phase('fetching', 'processing')
 
-    # Add main content
-    content_parts.append(f"\n\n--- CONTENT ---\n{body_text}")
+            page_data, error = fetch_confluence_page(page_url)
 
-    content = '\n'.join(content_parts)
+            if error:
+                tracker.error(error)
+                return
 
-    # Store in Optus
-    success, message = store_document(
-        collection_name=collection_name,
-        source_type='confluence',
-        source_id=f"PAGE#{page_id}",
-        title=title,
-        content=content,
-        metadata=metadata,
-        url=page_url
-    )
+            # Extract page details
+            page_id = page_data.get('id', 'unknown')
+            title = page_data.get('title', 'No title')
+            page_type = page_data.get('type', 'page')
+
+            # Extract space information
+            space = page_data.get('space', {})
+            space_key = space.get('key', 'Unknown')
+            space_name = space.get('name', 'Unknown')
+
+            # Extract version information
+            version_info = page_data.get('version', {})
+            version_number = version_info.get('number', 1)
+            last_modified_by = version_info.get('by', {}).get('displayName', 'Unknown')
+            last_modified = version_info.get('when', '')
+
+            # Extract creation information from history
+            history = page_data.get('history', {})
+            created_by = history.get('createdBy', {}).get('displayName', 'Unknown')
+            created_date = history.get('createdDate', '')
+
+            # Extract body content (HTML)
+            body_storage = page_data.get('body', {}).get('storage', {}).get('value', '')
+            body_view = page_data.get('body', {}).get('view', {}).get('value', '')
+
+            # Convert HTML to plain text using BeautifulSoup
+            soup = BeautifulSoup(body_storage or body_view, 'lxml')
+
+            # Remove script and style elements
+            for script in soup(["script", "style"]):
+                script.decompose()
+
+            # Get text and clean it up
+            text = soup.get_text()
+            lines = (line.strip() for line in text.splitlines())
+            chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
+            body_text = '\n'.join(chunk for chunk in chunks if chunk)
+
+            # Extract ancestors (parent pages) for breadcrumb
+            ancestors = []
+            for ancestor in page_data.get('ancestors', []):
+                ancestors.append({
+                    'id': ancestor.get('id'),
+                    'title': ancestor.get('title')
+                })
 
-    if success:
-        summary = (
-            f"Stored Confluence page: {title} (ID: {page_id}) from {space_name} space. "
-            f"Version {version_number}, last modified by {last_modified_by}"
-        )
-        print(f"[Confluence] {summary}")
-        return jsonify({
-            'success': True,
-            'message': summary,
-            'page_info': {
-                'title': title,
+            # Build comprehensive metadata
+            metadata = {
                 'page_id': page_id,
-                'space': space_name,
+                'page_type': page_type,
+                'space_key': space_key,
+                'space_name': space_name,
                 'version': version_number,
                 'created_by': created_by,
-                'last_modified_by': last_modified_by
+                'created_date': created_date,
+                'last_modified_by': last_modified_by,
+                'last_modified': last_modified,
+                'ancestors': ancestors,
+                'ancestor_titles': [a['title'] for a in ancestors],
+                'has_children': len(page_data.get('children', {}).get('page', {}).get('results', [])) > 0,
             }
-        })
-    else:
-        return jsonify({'success': False, 'message': message})
+
+            # Build comprehensive content
+            content_parts = [
+                f"Title: {title}",
+                f"\nSpace: {space_name} ({space_key})",
+                f"\nCreated by: {created_by} on {created_date[:10] if created_date else 'Unknown'}",
+                f"\nLast modified by: {last_modified_by} on {last_modified[:10] if last_modified else 'Unknown'}",
+                f"\nVersion: {version_number}",
+            ]
+
+            # Add breadcrumb (ancestor path)
+            if ancestors:
+                breadcrumb = ' > '.join([a['title'] for a in ancestors])
+                content_parts.append(f"\nBreadcrumb: {breadcrumb} > {title}")
+
+            # Add main content
+            content_parts.append(f"\n\n--- CONTENT ---\n{body_text}")
+
+            content = '\n'.join(content_parts)
+
+            # Store in Optus
+            tracker.set_phase('processing', 'processing')
+            success, message = store_document(
+                collection_name=collection_name,
+                source_type='confluence',
+                source_id=f"PAGE#{page_id}",
+                title=title,
+                content=content,
+                metadata=metadata,
+                url=page_url
+            )
+
+            if success:
+                summary = (
+                    f"Stored Confluence page: {title} (ID: {page_id}) from {space_name} space. "
+                    f"Version {version_number}, last modified by {last_modified_by}"
+                )
+                print(f"[Confluence] {summary}")
+                tracker.increment(current_item=title, successful=True)
+                tracker.complete(summary)
+            else:
+                print(f"[Confluence] ✗ {message}")
+                tracker.error(message)
+
+        except Exception as e:
+            tracker.error(str(e))
+            print(f"[Confluence] Error: {e}")
+
+    # Start background thread
+    threading.Thread(target=run_confluence_fetch, daemon=True).start()
+
+    # Return immediately with progress file
+    return jsonify({
+        'success': True,
+        'progress_file': progress_file,
+        'status': 'started',
+        'message': 'Started fetching Confluence page'
+    })
+
+
+@app.route('/confluence_progress', methods=['GET'])
+def get_confluence_progress():
+    """Get Confluence fetch progress"""
+    progress_file = request.args.get('progress_file', 'confluence_progress.json')
+    try:
+        return jsonify(read_progress(progress_file))
+    except FileNotFoundError:
+        return jsonify({'status': 'not_found', 'message': 'Progress file not found'}), 404
+    except Exception as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 500
 
 
 @app.route('/fetch_github_pr', methods=['POST'])
@@ -1888,7 +2608,8 @@ def fetch_github_pr_route():
         title=f"PR #{pr_number}: {title}",
         content=content,
         metadata=metadata,
-        url=pr_data.get('html_url', '')
+        url=pr_data.get('html_url', ''),
+        structured=build_pr_activity(reviews, issue_comments, review_comments)
     )
 
     if success:
@@ -1928,7 +2649,6 @@ def github_rate_limit():
         search = data['resources'].get('search', {})
 
         # Calculate reset time
-        from datetime import datetime
         reset_time = datetime.fromtimestamp(core['reset']).strftime('%Y-%m-%d %H:%M:%S')
         minutes_until_reset = (core['reset'] - datetime.now().timestamp()) / 60
 
@@ -1965,7 +2685,6 @@ def github_rate_limit():
 @app.route('/fetch_repo_prs', methods=['POST'])
 def fetch_repo_prs():
     """Fetch all PRs (or latest 100) from a GitHub repository"""
-    import time
     start_time = time.time()
 
     repo_url = request.json.get('repo_url', '').strip()
@@ -2087,10 +2806,6 @@ def fetch_repo_prs():
                 }
             })
 
-        # Parallel PR processing function
-        from concurrent.futures import ThreadPoolExecutor, as_completed
-        import threading
-
         # Thread-safe counters
         stored_count = 0
         failed_count = 0
@@ -2115,7 +2830,7 @@ def fetch_repo_prs():
                 print(f"[Repo Fetch] ({i}/{total_prs}) Fetching PR #{pr_number}...")
 
                 pr_url = f"https://github.com/{owner}/{repo}/pull/{pr_number}"
-                pr_data, error = fetch_github_pr(pr_url)
+                pr_data, error = fetch_github_pr(pr_url, include_timeline=False)
 
                 if error:
                     print(f"[Repo Fetch] ✗ Failed PR #{pr_number}: {error}")
@@ -2305,31 +3020,17 @@ def fetch_repo_prs():
                 if len(content) > 9900:
                     content = content[:9900] + "\n\n[Content truncated due to length...]"
 
-                # Store in Optus
-                success, msg = store_document(
-                    collection_name=collection_name,
-                    source_type='github_pr',
-                    source_id=f"PR#{pr_number_data}",
-                    title=f"PR #{pr_number_data}: {title}",
-                    content=content,
-                    metadata=metadata,
-                    url=pr_data.get('html_url', '')
-                )
-
-                if success:
-                    with counter_lock:
-                        stored_count += 1
-                    print(f"[Repo Fetch] ✓ Stored PR #{pr_number_data}")
-                    # Track successful fetch
-                    track_pr_fetch(repository_full, pr_number_data, title, "success", "", collection_name)
-                    return {"status": "success", "pr_number": pr_number_data}
-                else:
-                    with counter_lock:
-                        failed_count += 1
-                    print(f"[Repo Fetch] ✗ Failed to store PR #{pr_number_data}: {msg}")
-                    # Track failed storage
-                    track_pr_fetch(repository_full, pr_number_data, title, "failed", msg, collection_name)
-                    return {"status": "failed", "pr_number": pr_number_data, "error": msg}
+                # Stored in batches by the caller so embeddings are encoded together
+                doc = {
+                    'source_type': 'github_pr',
+                    'source_id': f"PR#{pr_number_data}",
+                    'title': f"PR #{pr_number_data}: {title}",
+                    'content': content,
+                    'metadata': metadata,
+                    'url': pr_data.get('html_url', ''),
+                    'structured': build_pr_activity(reviews, issue_comments, review_comments)
+                }
+                return {"status": "fetched", "pr_number": pr_number_data, "title": title, "doc": doc}
 
             except Exception as e:
                 print(f"[Repo Fetch] ✗ Error processing PR #{pr_number}: {e}")
@@ -2342,24 +3043,54 @@ def fetch_repo_prs():
         max_workers = 5  # Process 5 PRs concurrently
         print(f"[Repo Fetch] Using {max_workers} parallel workers for fetching PRs")
 
+        pending = []
+
+        def store_pending():
+            """Embed and insert the fetched PRs in one batch, then track each"""
+            nonlocal stored_count, failed_count
+            if not pending:
+                return
+            success, msg = store_documents_bulk(collection_name, [item['doc'] for item in pending])
+            with counter_lock:
+                if success:
+                    stored_count += len(pending)
+                else:
+                    failed_count += len(pending)
+            for item in pending:
+                if success:
+                    print(f"[Repo Fetch] ✓ Stored PR #{item['pr_number']}")
+                    track_pr_fetch(repository_full, item['pr_number'], item['title'], "success", "", collection_name)
+                else:
+                    print(f"[Repo Fetch] ✗ Failed to store PR #{item['pr_number']}: {msg}")
+                    track_pr_fetch(repository_full, item['pr_number'], item['title'], "failed", msg, collection_name)
+            pending.clear()
+
         with ThreadPoolExecutor(max_workers=max_workers) as executor:
             # Submit all PR processing tasks
             pr_tasks = [(i, pr_num) for i, pr_num in enumerate(all_pr_numbers, 1)]
             future_to_pr = {executor.submit(process_single_pr, pr_info): pr_info for pr_info in pr_tasks}
 
-            # Process results as they complete
+            # Process results as they complete; fetched PRs are stored in batches
             for future in as_completed(future_to_pr):
                 pr_info = future_to_pr[future]
                 try:
                     result = future.result()
-                    # Result already logged by process_single_pr
+                    if result["status"] == "fetched":
+                        pending.append(result)
+                        if len(pending) >= PR_STORE_BATCH_SIZE:
+                            store_pending()
                 except Exception as e:
                     print(f"[Repo Fetch] Unexpected error in parallel task for PR {pr_info[1]}: {e}")
                     with counter_lock:
                         failed_count += 1
 
+        store_pending()
+
         print(f"\n[Repo Fetch] Complete! Stored: {stored_count}, Failed: {failed_count}, Skipped: {skipped_count}")
 
+        # Seal the new PRs before the persona analyzer reads them back
+        flush_collections()
+
         # Auto-trigger persona analysis
         print(f"[Repo Fetch] Starting persona analysis...")
         analyzer = GitHubPersonaAnalyzer(collection_name=collection_name)
@@ -2427,8 +3158,7 @@ def search():
         if not utility.has_collection(collection_name):
             return jsonify({'success': False, 'message': f'Collection {collection_name} does not exist'})
 
-        collection = Collection(name=collection_name)
-        collection.load()
+        collection = get_loaded_collection(collection_name)
 
         formatted_results = []
         search_method = 'semantic'
@@ -2455,7 +3185,7 @@ def search():
                             'source_id': result.get('source_id'),
                             'title': result.get('title'),
                             'content': result.get('content'),
-                            'metadata': json.loads(result.get('metadata', '{}')),
+                            'metadata': orjson.loads(result.get('metadata', '{}')),
                             'url': result.get('url'),
                             'created_at': result.get('created_at'),
                             'similarity_score': 1.0,  # Perfect match
@@ -2467,13 +3197,12 @@ def search():
         # Step 2: If no exact match or no ticket ID, do semantic search
         if not formatted_results:
             print(f"[Search] Using semantic search for: {query}")
-            model = load_model()
 
             # Generate query embedding
-            query_embedding = model.encode([query]).tolist()
+            query_embedding = [encode_query(query)]
 
             # Search
-            search_params = {"metric_type": "L2", "params": {"nprobe": 10}}
+            metric_type, search_params = embedding_search_params(collection, top_k)
             results = collection.search(
                 data=query_embedding,
                 anns_field="embedding",
@@ -2490,15 +3219,13 @@ def search():
                         'source_id': hit.entity.get('source_id'),
                         'title': hit.entity.get('title'),
                         'content': hit.entity.get('content')[:500] + '...',
-                        'metadata': json.loads(hit.entity.get('metadata', '{}')),
+                        'metadata': orjson.loads(hit.entity.get('metadata', '{}')),
                         'url': hit.entity.get('url'),
                         'created_at': hit.entity.get('created_at'),
-                        'similarity_score': round(1 / (1 + hit.distance), 4),
+                        'similarity_score': similarity_score(metric_type, hit.distance),
                         'match_type': 'semantic'
                     })
 
-        collection.release()
-
         return jsonify({
             'success': True,
             'results': formatted_results,
@@ -2613,7 +3340,6 @@ def index_text():
         }
 
         # Generate unique ID based on title and timestamp
-        import time
         text_id = hashlib.md5(f"{title}_{time.time()}".encode()).hexdigest()[:16]
 
         # Store in Optus
@@ -2778,7 +3504,6 @@ def claude_code_store():
         metadata.update(metadata_input)
 
         # Generate unique ID
-        import time
         item_id = hashlib.md5(f"{title}_{data_type}_{time.time()}".encode()).hexdigest()[:16]
 
         # Store in Optus
@@ -2895,7 +3620,6 @@ def claude_code_store_bulk():
                 metadata.update(metadata_input)
 
                 # Generate ID
-                import time
                 item_id = hashlib.md5(f"{title}_{data_type}_{time.time()}_{idx}".encode()).hexdigest()[:16]
 
                 # Store
@@ -2980,8 +3704,7 @@ def claude_code_query():
         print(f"[Claude Code API] Query: {query} in collection: {collection_name}")
 
         # Perform semantic search
-        model = load_model()
-        query_embedding = model.encode([query])[0].tolist()
+        query_embedding = encode_query(query)
 
         # Determine collections to search
         if collection_name == 'all':
@@ -2993,14 +3716,14 @@ def claude_code_query():
 
         for coll in collections:
             try:
-                collection = Collection(coll)
-                collection.load()
+                collection = get_loaded_collection(coll)
 
                 # Search
+                metric_type, search_params = embedding_search_params(collection, top_k)
                 search_results = collection.search(
                     data=[query_embedding],
                     anns_field="embedding",
-                    param={"metric_type": "IP", "params": {"nprobe": 10}},
+                    param=search_params,
                     limit=top_k,
                     output_fields=["source_type", "source_id", "title", "content", "metadata", "url"]
                 )
@@ -3008,7 +3731,7 @@ def claude_code_query():
                 for hits in search_results:
                     for hit in hits:
                         entity = hit.entity
-                        metadata = json.loads(entity.get('metadata', '{}'))
+                        metadata = orjson.loads(entity.get('metadata', '{}'))
 
                         # Apply filters
                         if data_type_filter and metadata.get('data_type') != data_type_filter:
@@ -3026,12 +3749,10 @@ def claude_code_query():
                             'source_id': entity.get('source_id'),
                             'url': entity.get('url'),
                             'metadata': metadata,
-                            'similarity_score': round(hit.score, 4),
+                            'similarity_score': similarity_score(metric_type, hit.distance),
                             'collection': coll
                         })
 
-                collection.release()
-
             except Exception as e:
                 print(f"[Claude Code API] Error searching {coll}: {e}")
 
@@ -3059,7 +3780,7 @@ def get_action_logs():
         if collection is None:
             return jsonify({'success': False, 'message': 'Failed to connect to Optus'})
 
-        collection.load()
+        load_collection_once(collection)
 
         # Get query parameters
         action_type = request.args.get('action_type')
@@ -3093,8 +3814,8 @@ def get_action_logs():
 
             # Parse JSON fields
             try:
-                result['parameters'] = json.loads(result.get('parameters', '{}'))
-                result['metadata'] = json.loads(result.get('metadata', '{}'))
+                result['parameters'] = orjson.loads(result.get('parameters', '{}'))
+                result['metadata'] = orjson.loads(result.get('metadata', '{}'))
             except:
                 pass
 
@@ -3103,8 +3824,6 @@ def get_action_logs():
         # Sort by timestamp descending (newest first)
         filtered_results.sort(key=lambda x: x.get('timestamp', ''), reverse=True)
 
-        collection.release()
-
         return jsonify({
             'success': True,
             'logs': filtered_results[:limit],
@@ -3124,7 +3843,7 @@ def get_action_logs_stats():
         if collection is None:
             return jsonify({'success': False, 'message': 'Failed to connect to Optus'})
 
-        collection.load()
+        load_collection_once(collection)
 
         # Query all logs
         results = collection.query(
@@ -3169,8 +3888,6 @@ def get_action_logs_stats():
         one_hour_ago = (datetime.now() - timedelta(hours=1)).isoformat()
         recent = sum(1 for r in results if r.get('timestamp', '') > one_hour_ago)
 
-        collection.release()
-
         return jsonify({
             'success': True,
             'stats': {
@@ -3281,8 +3998,7 @@ def merge_duplicate_personas():
         if not utility.has_collection(collection_name):
             return jsonify({'success': False, 'message': f'Collection {collection_name} does not exist'})
 
-        collection = Collection(name=collection_name)
-        collection.load()
+        collection = get_loaded_collection(collection_name)
 
         # Get all personas
         results = collection.query(
@@ -3405,15 +4121,14 @@ def merge_duplicate_personas():
             collection.delete(f"id == {record_id}")
 
         collection.flush()
-        collection.release()
+        persona_cache.clear()
 
-        # Verify results
-        collection.load()
+        # Verify results (strong consistency so the deletes above are visible)
         final_results = collection.query(
             expr="id >= 0",
-            output_fields=["username"]
+            output_fields=["username"],
+            consistency_level="Strong"
         )
-        collection.release()
 
         final_usernames = [r['username'] for r in final_results]
         unique_final = len(set(final_usernames))
@@ -3432,7 +4147,6 @@ def merge_duplicate_personas():
 
     except Exception as e:
         print(f"[Merge Personas] Error: {e}")
-        import traceback
         traceback.print_exc()
         return jsonify({'success': False, 'message': f'Error: {str(e)}'})
 
@@ -3453,7 +4167,6 @@ def export_persona_pdf(username):
         pdf_buffer = generator.generate_persona_report(persona)
 
         # Return PDF file
-        from flask import send_file
         return send_file(
             pdf_buffer,
             mimetype='application/pdf',
@@ -3482,7 +4195,6 @@ def export_all_personas_pdf():
         pdf_buffer = generator.generate_summary_report(personas)
 
         # Return PDF file
-        from flask import send_file
         return send_file(
             pdf_buffer,
             mimetype='application/pdf',
@@ -3507,8 +4219,7 @@ def get_pr_actions(owner, repo, pr_number):
         if not utility.has_collection(collection_name):
             return jsonify({'success': False, 'message': f'Collection {collection_name} does not exist'})
 
-        collection = Collection(name=collection_name)
-        collection.load()
+        collection = get_loaded_collection(collection_name)
 
         # Query for this specific PR
         results = collection.query(
@@ -3516,13 +4227,11 @@ def get_pr_actions(owner, repo, pr_number):
             output_fields=["title", "content", "metadata", "url"]
         )
 
-        collection.release()
-
         if not results:
             return jsonify({'success': False, 'message': f'PR #{pr_number} not found'})
 
         pr = results[0]
-        metadata = json.loads(pr.get('metadata', '{}'))
+        metadata = orjson.loads(pr.get('metadata', '{}'))
         content = pr.get('content', '')
 
         # Extract actions timeline
@@ -3537,7 +4246,6 @@ def get_pr_actions(owner, repo, pr_number):
         })
 
         # Extract reviews from content
-        import re
         review_pattern = r'\d+\. (APPROVED|CHANGES_REQUESTED|COMMENTED) by (\w+): (.+?)(?=\n\d+\.|---|\Z)'
         for match in re.finditer(review_pattern, content, re.DOTALL):
             state = match.group(1)
@@ -3659,7 +4367,6 @@ def get_approval_stats():
 @app.route('/ask_claude', methods=['POST'])
 def ask_claude_route():
     """Ask Claude with RAG + Website Scraping + All Collections + Response Time Tracking"""
-    import time
 
     start_time = time.time()  # Start timing
 
@@ -3914,11 +4621,6 @@ def save_image():
         if image_vectorizer is None:
             return jsonify({'success': False, 'message': 'Image vectorizer not available'})
 
-        # Decode base64 image
-        import base64
-        import io
-        from PIL import Image
-
         # Remove data:image prefix if present
         if ',' in image_data:
             image_data = image_data.split(',')[1]
@@ -3932,7 +4634,7 @@ def save_image():
         image.save(temp_path)
 
         # Extract vector
-        vector = image_vectorizer.extract_vector(temp_path)
+        vector = extract_image_vector(temp_path, image_bytes)
 
         # Create content with base64 data embedded
         content = f"Image: {image_name}\nDescription: {description}\nBase64 Data: {image_data[:100]}..."
@@ -3989,17 +4691,13 @@ def retrieve_image():
             return jsonify({'success': False, 'message': 'No query provided'})
 
         # Search in documents collection for images
-        collection = Collection('documents')
-        collection.load()
+        collection = get_loaded_collection('documents')
 
         # Generate query vector
-        if embedding_model is None:
-            load_model()
-
-        query_vector = embedding_model.encode(query).tolist()
+        query_vector = encode_query(query)
 
         # Search
-        search_params = {"metric_type": "L2", "params": {"nprobe": 10}}
+        metric_type, search_params = embedding_search_params(collection, top_k, field_name="vector")
         results = collection.search(
             data=[query_vector],
             anns_field="vector",
@@ -4013,7 +4711,7 @@ def retrieve_image():
         for hits in results:
             for hit in hits:
                 entity = hit.entity
-                metadata = json.loads(entity.get('metadata')) if isinstance(entity.get('metadata'), str) else entity.get('metadata')
+                metadata = orjson.loads(entity.get('metadata')) if isinstance(entity.get('metadata'), str) else entity.get('metadata')
 
                 # Extract base64 data from metadata
                 base64_data = metadata.get('base64_data', '')
@@ -4044,7 +4742,7 @@ def retrieve_image():
 def get_codebase_audit_history():
     """Get analysis history from audit logs"""
     try:
-        analyzer = CodebaseAnalyzer()
+        analyzer = get_analyzer()
         repo_name = request.args.get('repo_name')
         limit = int(request.args.get('limit', 20))
 
@@ -4063,7 +4761,7 @@ def get_codebase_audit_history():
 def get_codebase_audit_statistics():
     """Get overall statistics from audit logs"""
     try:
-        analyzer = CodebaseAnalyzer()
+        analyzer = get_analyzer()
         stats = analyzer.get_analysis_statistics()
 
         return jsonify({
@@ -4074,10 +4772,17 @@ def get_codebase_audit_statistics():
         return jsonify({'success': False, 'message': str(e)})
 
 
-if __name__ == '__main__':
+def main():
+    """Run the development server (see run_web_interface.py)"""
+    # Surface the Jira client and RAG logs on the console too; LOG_LEVEL=DEBUG shows debug lines
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO").upper(), format='%(message)s')
+
     # Create uploads directory
     os.makedirs('uploads', exist_ok=True)
 
+    # Load collections up front instead of on each request
+    preload_collections()
+
     # Start server
     print("="*70)
     print("MILVUS DATA MANAGEMENT WEB INTERFACE")
@@ -4087,3 +4792,7 @@ if __name__ == '__main__':
     print("\n" + "="*70)
 
     app.run(debug=True, host='0.0.0.0', port=5001)
+
+
+if __name__ == '__main__':
+    main()